@@ -1,21 +1,47 @@
 """Bot AI domain models, combat helpers, and pathfinding."""
 
 from src.ai.bot import Bot, BotAIState
-from src.ai.combat import vary_direction_with_accuracy
-from src.ai.navigation import WaypointPathfinder
-from src.ai.tactics import CoverPlan, TacticalAction, build_flank_route, choose_tactical_action, find_cover_plan
+from src.ai.combat import vary_direction_with_accuracy, vary_directions_with_accuracy
+from src.ai.firing import BotFireSystem, BotShot
+from src.ai.lod import AILodDecision, AILodPolicy, AILodScheduler, AILodTier
+from src.ai.navigation import PathStrategy, WaypointPathfinder
+from src.ai.swarm import BotSwarm, SwarmBot, SwarmWeaponView
+from src.ai.tactics import (
+    CoverPlan,
+    CoverService,
+    TacticalAction,
+    build_flank_route,
+    choose_tactical_action,
+    decide_tactical_action,
+    find_cover_plan,
+    flank_candidates,
+)
 from src.ai.waves import WaveDifficulty, WaveDirector
 
 __all__ = [
     "Bot",
     "BotAIState",
     "WaypointPathfinder",
+    "PathStrategy",
     "vary_direction_with_accuracy",
+    "vary_directions_with_accuracy",
+    "BotFireSystem",
+    "BotShot",
+    "BotSwarm",
+    "SwarmBot",
+    "SwarmWeaponView",
     "TacticalAction",
     "CoverPlan",
+    "CoverService",
     "choose_tactical_action",
+    "decide_tactical_action",
     "find_cover_plan",
     "build_flank_route",
+    "flank_candidates",
+    "AILodScheduler",
+    "AILodPolicy",
+    "AILodTier",
+    "AILodDecision",
     "WaveDirector",
     "WaveDifficulty",
 ]
@@ -9,7 +9,7 @@ from random import Random
 
 from src.ai.combat import vary_direction_with_accuracy
 from src.economy.money import MoneyPickup, MoneyPickupSystem
-from src.weapons.assault_rifle import AssaultRifle
+from src.weapons.specs import get_weapon_spec
 from src.weapons.weapon import Weapon
 
 
@@ -42,6 +42,10 @@ def _normalize(direction: Vector3) -> Vector3:
     )
 
 
+def _default_bot_weapon() -> Weapon:
+    return Weapon.from_spec(get_weapon_spec("AssaultRifle"))
+
+
 @dataclass
 class Bot:
     """Basic tactical bot state with shooting and money-drop support."""
@@ -51,7 +55,7 @@ class Bot:
     health: int
     position: Vector3
     ai_state: BotAIState = BotAIState.IDLE
-    weapon: Weapon = field(default_factory=AssaultRifle)
+    weapon: Weapon = field(default_factory=_default_bot_weapon)
 
     @classmethod
     def create_default(cls, bot_id: str, position: Vector3) -> "Bot":
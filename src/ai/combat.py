@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from math import radians, sqrt, tan
+from collections.abc import Sequence
+from math import copysign, cos, pi, radians, sin, sqrt, tan
 from random import Random
 
 
@@ -64,3 +65,60 @@ def vary_direction_with_accuracy(
         forward[2] + (right[2] * offset_x) + (up[2] * offset_y),
     )
     return _normalize(varied)
+
+
+def vary_directions_with_accuracy(
+    *,
+    directions: Sequence[Vector3],
+    accuracy_degrees: float | Sequence[float],
+    rng: Random | Sequence[Random],
+) -> list[Vector3]:
+    """Return unit directions sampled uniformly inside per-row accuracy cones.
+
+    `accuracy_degrees` is either one cone half-angle for every row or one value
+    per row. Each row uses a branchless orthonormal basis (no cross products) and
+    uniform spherical-cap sampling, so the results are already unit length. Works
+    for bot volleys (one row per shooter) and shotgun pellets (one row per pellet).
+    `rng` is one generator for all rows or one generator per row (e.g. per-bot
+    streams from `rng.RngService`), which makes each row independent of row order.
+    """
+    count = len(directions)
+    if isinstance(accuracy_degrees, (int, float)):
+        if accuracy_degrees < 0.0:
+            raise ValueError("accuracy_degrees must be non-negative.")
+        cone_cosines = [cos(radians(accuracy_degrees))] * count
+    else:
+        if len(accuracy_degrees) != count:
+            raise ValueError("accuracy_degrees must match directions length.")
+        if any(value < 0.0 for value in accuracy_degrees):
+            raise ValueError("accuracy_degrees must be non-negative.")
+        cone_cosines = [cos(radians(value)) for value in accuracy_degrees]
+
+    if isinstance(rng, Random):
+        row_uniforms = [rng.random] * count
+    else:
+        if len(rng) != count:
+            raise ValueError("rng must be one generator or one generator per direction.")
+        row_uniforms = [row_rng.random for row_rng in rng]
+
+    varied: list[Vector3] = []
+    for direction, cone_cos, uniform in zip(directions, cone_cosines, row_uniforms):
+        fx, fy, fz = _normalize(direction)
+        # Uniform over the spherical cap: cos(theta) is uniform in [cos(max), 1].
+        cos_theta = 1.0 - (uniform() * (1.0 - cone_cos))
+        sin_theta = sqrt(max(0.0, 1.0 - (cos_theta * cos_theta)))
+        phi = 2.0 * pi * uniform()
+        offset_x = sin_theta * cos(phi)
+        offset_y = sin_theta * sin(phi)
+
+        sign = copysign(1.0, fz)
+        a = -1.0 / (sign + fz)
+        b = fx * fy * a
+        varied.append(
+            (
+                (offset_x * (1.0 + (sign * fx * fx * a))) + (offset_y * b) + (cos_theta * fx),
+                (offset_x * sign * b) + (offset_y * (sign + (fy * fy * a))) + (cos_theta * fy),
+                (offset_x * (-sign * fx)) + (offset_y * (-fy)) + (cos_theta * fz),
+            )
+        )
+    return varied
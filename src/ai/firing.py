@@ -0,0 +1,211 @@
+"""Batched bot weapon cooldown and fire resolution."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from random import Random
+
+from src.ai.bot import Bot
+from src.ai.combat import vary_directions_with_accuracy
+from src.rng.streams import RngService
+
+
+Vector3 = tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class BotShot:
+    """Single resolved bot shot ready for projectile/raycast handling."""
+
+    bot_id: str
+    fired_at: float
+    origin: Vector3
+    direction: Vector3
+
+
+class BotFireSystem:
+    """Resolves firing for every registered bot in one pass per frame.
+
+    Ammo, cooldown-ready timestamps, and accuracy live in flat arrays indexed by
+    slot. Bots with a held trigger sit in a min-heap keyed on their ready time, so
+    each `resolve(...)` only touches bots whose cooldown elapsed this frame.
+    Slots freed by `unregister(...)` are reused by later registrations, so the
+    arrays stay as large as the most bots registered at once.
+
+    With an `rng_service`, each bot draws aim noise from its own stream, so shot
+    directions do not depend on which other bots fired in the same frame.
+    """
+
+    def __init__(self, *, rng_service: RngService | None = None) -> None:
+        self.rng_service = rng_service
+        self._bots: list[Bot | None] = []
+        self._slot_by_id: dict[str, int] = {}
+        self.ready_at = array("d")
+        self.cooldowns = array("d")
+        self.ammo = array("l")
+        self.accuracy_degrees = array("d")
+        self._trigger_held = bytearray()
+        self._queued = bytearray()
+        self._schedule: list[tuple[float, int]] = []
+        self._free_slots: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    def slot_for(self, bot_id: str) -> int:
+        if bot_id not in self._slot_by_id:
+            raise ValueError(f"Bot '{bot_id}' is not registered.")
+        return self._slot_by_id[bot_id]
+
+    def register(self, bot: Bot, *, accuracy_degrees: float = 3.0) -> int:
+        """Copy a bot's weapon state into the arrays and return its slot."""
+        if bot.bot_id in self._slot_by_id:
+            raise ValueError(f"Bot '{bot.bot_id}' is already registered.")
+        if accuracy_degrees < 0.0:
+            raise ValueError("accuracy_degrees must be non-negative.")
+        weapon = bot.weapon
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._bots[slot] = bot
+            self.cooldowns[slot] = weapon.cooldown_seconds
+            self.ready_at[slot] = weapon.last_fired_at + weapon.cooldown_seconds
+            self.ammo[slot] = weapon.ammo_in_magazine
+            self.accuracy_degrees[slot] = accuracy_degrees
+        else:
+            slot = len(self._bots)
+            self._bots.append(bot)
+            self.cooldowns.append(weapon.cooldown_seconds)
+            self.ready_at.append(weapon.last_fired_at + weapon.cooldown_seconds)
+            self.ammo.append(weapon.ammo_in_magazine)
+            self.accuracy_degrees.append(accuracy_degrees)
+            self._trigger_held.append(0)
+            self._queued.append(0)
+        self._slot_by_id[bot.bot_id] = slot
+        return slot
+
+    def refresh(self, bot_id: str) -> None:
+        """Re-copy a bot's weapon state after something else fired or reloaded it."""
+        slot = self.slot_for(bot_id)
+        weapon = self._bots[slot].weapon
+        self.cooldowns[slot] = weapon.cooldown_seconds
+        self.ready_at[slot] = weapon.last_fired_at + weapon.cooldown_seconds
+        self.ammo[slot] = weapon.ammo_in_magazine
+        if self._trigger_held[slot]:
+            self._enqueue(slot)
+
+    def unregister(self, bot_id: str) -> None:
+        """Stop resolving fire for a bot and free its slot for the next registration."""
+        slot = self.slot_for(bot_id)
+        self._bots[slot] = None
+        self._trigger_held[slot] = 0
+        if self._queued[slot]:
+            self._schedule = [entry for entry in self._schedule if entry[1] != slot]
+            heapify(self._schedule)
+            self._queued[slot] = 0
+        del self._slot_by_id[bot_id]
+        self._free_slots.append(slot)
+
+    def set_trigger(self, bot_id: str, held: bool) -> None:
+        """Mark whether a bot wants to fire on upcoming frames."""
+        slot = self.slot_for(bot_id)
+        self._trigger_held[slot] = 1 if held else 0
+        if held:
+            self._enqueue(slot)
+
+    def reload(self, bot_id: str) -> int:
+        """Reload a bot weapon and re-arm it when its trigger is held."""
+        slot = self.slot_for(bot_id)
+        bot = self._bots[slot]
+        loaded = bot.weapon.reload()
+        self.ammo[slot] = bot.weapon.ammo_in_magazine
+        if self._trigger_held[slot]:
+            self._enqueue(slot)
+        return loaded
+
+    def resolve(
+        self,
+        *,
+        now: float,
+        target_position: Vector3,
+        rng: Random | None = None,
+        frame_start: float | None = None,
+    ) -> list[BotShot]:
+        """Fire every armed bot whose cooldown has elapsed and return its shots.
+
+        When `frame_start` is given, every shot due inside `[frame_start, now]` is
+        emitted with its sub-frame timestamp, so a bot may fire several times in
+        one long frame. Without it, each bot fires at most once at `now`. Pass
+        `rng` to share one generator for the volley; omit it to draw from per-bot
+        streams of the system's `rng_service`.
+        """
+        if rng is None and self.rng_service is None:
+            raise ValueError("resolve() needs an rng or a system rng_service.")
+        window_start = now if frame_start is None else frame_start
+        if window_start > now:
+            raise ValueError("frame_start must not be after now.")
+
+        due: list[tuple[int, float]] = []
+        schedule = self._schedule
+        while schedule and schedule[0][0] <= now:
+            ready_at, slot = heappop(schedule)
+            self._queued[slot] = 0
+            bot = self._bots[slot]
+            if bot is None or not self._trigger_held[slot]:
+                continue
+            if not bot.is_alive:
+                self._trigger_held[slot] = 0
+                continue
+            if ready_at != self.ready_at[slot] or self.ammo[slot] <= 0:
+                # Queued before a `refresh(...)` changed the slot's cooldown or ammo.
+                self._enqueue(slot)
+                continue
+            fired_at = max(ready_at, window_start)
+            self.ammo[slot] -= 1
+            self.ready_at[slot] = fired_at + self.cooldowns[slot]
+            due.append((slot, fired_at))
+            self._enqueue(slot)
+
+        base_directions: list[Vector3] = []
+        accuracies: list[float] = []
+        for slot, _ in due:
+            position = self._bots[slot].position
+            base_directions.append(
+                (
+                    target_position[0] - position[0],
+                    target_position[1] - position[1],
+                    target_position[2] - position[2],
+                )
+            )
+            accuracies.append(self.accuracy_degrees[slot])
+        if rng is not None:
+            shot_rng: Random | list[Random] = rng
+        else:
+            shot_rng = [self.rng_service.bot_stream(self._bots[slot].bot_id) for slot, _ in due]
+        directions = vary_directions_with_accuracy(
+            directions=base_directions,
+            accuracy_degrees=accuracies,
+            rng=shot_rng,
+        )
+
+        shots: list[BotShot] = []
+        for (slot, fired_at), direction in zip(due, directions):
+            bot = self._bots[slot]
+            bot.weapon.ammo_in_magazine = self.ammo[slot]
+            bot.weapon.last_fired_at = self.ready_at[slot] - self.cooldowns[slot]
+            shots.append(
+                BotShot(
+                    bot_id=bot.bot_id,
+                    fired_at=fired_at,
+                    origin=bot.position,
+                    direction=direction,
+                )
+            )
+        return shots
+
+    def _enqueue(self, slot: int) -> None:
+        if self._queued[slot] or self.ammo[slot] <= 0:
+            return
+        self._queued[slot] = 1
+        heappush(self._schedule, (self.ready_at[slot], slot))
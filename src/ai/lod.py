@@ -0,0 +1,209 @@
+"""Distance/visibility-based AI level-of-detail with a per-frame time budget."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from math import sqrt
+from time import perf_counter
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.tactics import CoverService, TacticalAction, choose_tactical_action
+from src.environment.facility import CoverObject, FacilityLayout
+
+
+Vector3 = tuple[float, float, float]
+
+_STATE_FOR_ACTION: dict[TacticalAction, BotAIState] = {
+    TacticalAction.ATTACK: BotAIState.ATTACKING,
+    TacticalAction.TAKE_COVER: BotAIState.SEEKING_COVER,
+    TacticalAction.FLANK: BotAIState.FLANKING,
+}
+
+
+class AILodTier(str, Enum):
+    """Decision fidelity tiers, from every-frame tactics to cheap chasing."""
+
+    NEAR = "near"
+    MID = "mid"
+    FAR = "far"
+
+
+@dataclass(frozen=True)
+class AILodPolicy:
+    """Distance thresholds, update intervals, and frame budget for AI LOD."""
+
+    near_distance: float = 12.0
+    mid_distance: float = 24.0
+    near_interval_seconds: float = 0.0
+    mid_interval_seconds: float = 0.25
+    far_interval_seconds: float = 1.0
+    frame_budget_us: float = 1_500.0
+
+    def __post_init__(self) -> None:
+        if self.near_distance <= 0.0 or self.mid_distance < self.near_distance:
+            raise ValueError("LOD distances must be positive and ordered near <= mid.")
+        if min(self.near_interval_seconds, self.mid_interval_seconds, self.far_interval_seconds) < 0.0:
+            raise ValueError("LOD update intervals must be non-negative.")
+        if self.frame_budget_us <= 0.0:
+            raise ValueError("frame_budget_us must be positive.")
+
+    def interval_for(self, tier: AILodTier) -> float:
+        if tier == AILodTier.NEAR:
+            return self.near_interval_seconds
+        if tier == AILodTier.MID:
+            return self.mid_interval_seconds
+        return self.far_interval_seconds
+
+
+@dataclass(frozen=True)
+class AILodDecision:
+    """Outcome of one scheduled bot update."""
+
+    bot_id: str
+    tier: AILodTier
+    state: BotAIState
+    action: TacticalAction | None
+
+
+class AILodScheduler:
+    """Round-robins bot AI updates under a per-frame microsecond budget.
+
+    Each bot gets a tier from its distance to the player and whether its room is
+    visible from the player's room (same room or one doorway away). Near and mid
+    bots run the full `choose_tactical_action(...)` (including cover search); far
+    or hidden bots get a cheap chase state. Tiers also set how long a bot sleeps
+    before its next update. A cursor carries over between frames, so when the
+    budget runs out the next frame resumes with the bots that were skipped.
+    An optional shared `cover_service` lets all near/mid bots reuse one
+    memoized cover search per frame.
+    """
+
+    def __init__(
+        self,
+        *,
+        layout: FacilityLayout,
+        policy: AILodPolicy | None = None,
+        clock: Callable[[], float] = perf_counter,
+        cover_service: CoverService | None = None,
+    ) -> None:
+        self.layout = layout
+        self.cover_service = cover_service
+        self.policy = policy or AILodPolicy()
+        self._clock = clock
+        self._room_graph = layout.doorway_graph()
+        self._next_update_at: dict[str, float] = {}
+        self._cursor = 0
+        self.last_frame_updates = 0
+        self.last_frame_deferred = 0
+        self.last_frame_elapsed_us = 0.0
+
+    def visible_rooms(self, player_position: Vector3) -> set[str]:
+        """Rooms treated as visible from the player: own room plus doorway neighbours."""
+        player_room = self.layout.find_room_for_position(player_position)
+        if player_room is None:
+            return set()
+        return {player_room} | self._room_graph.get(player_room, set())
+
+    def tier_for(
+        self,
+        *,
+        bot_position: Vector3,
+        player_position: Vector3,
+        visible_rooms: set[str],
+    ) -> AILodTier:
+        dx = bot_position[0] - player_position[0]
+        dz = bot_position[2] - player_position[2]
+        distance = sqrt((dx * dx) + (dz * dz))
+        bot_room = self.layout.find_room_for_position(bot_position)
+        is_visible = bot_room is not None and bot_room in visible_rooms
+        if is_visible and distance <= self.policy.near_distance:
+            return AILodTier.NEAR
+        if is_visible and distance <= self.policy.mid_distance:
+            return AILodTier.MID
+        return AILodTier.FAR
+
+    def forget(self, bot_id: str) -> None:
+        """Drop scheduling data for a removed bot."""
+        self._next_update_at.pop(bot_id, None)
+
+    def update(
+        self,
+        *,
+        bots: Sequence[Bot],
+        now: float,
+        player_position: Vector3,
+        cover_objects: list[CoverObject],
+    ) -> list[AILodDecision]:
+        """Run due bot updates until every bot was visited or the budget is spent."""
+        started = self._clock()
+        budget_seconds = self.policy.frame_budget_us / 1_000_000.0
+        visible_rooms = self.visible_rooms(player_position)
+        living_count = sum(1 for bot in bots if bot.is_alive)
+        ally_count = max(0, living_count - 1)
+
+        decisions: list[AILodDecision] = []
+        deferred = 0
+        total = len(bots)
+        if total:
+            self._cursor %= total
+        visited = 0
+        while visited < total:
+            if decisions and (self._clock() - started) >= budget_seconds:
+                deferred = total - visited
+                break
+            bot = bots[self._cursor]
+            self._cursor = (self._cursor + 1) % total
+            visited += 1
+            if not bot.is_alive:
+                self.forget(bot.bot_id)
+                continue
+            if self._next_update_at.get(bot.bot_id, now) > now:
+                continue
+            decisions.append(
+                self._update_bot(
+                    bot=bot,
+                    now=now,
+                    player_position=player_position,
+                    visible_rooms=visible_rooms,
+                    cover_objects=cover_objects,
+                    ally_count=ally_count,
+                )
+            )
+
+        self.last_frame_updates = len(decisions)
+        self.last_frame_deferred = deferred
+        self.last_frame_elapsed_us = (self._clock() - started) * 1_000_000.0
+        return decisions
+
+    def _update_bot(
+        self,
+        *,
+        bot: Bot,
+        now: float,
+        player_position: Vector3,
+        visible_rooms: set[str],
+        cover_objects: list[CoverObject],
+        ally_count: int,
+    ) -> AILodDecision:
+        tier = self.tier_for(
+            bot_position=bot.position,
+            player_position=player_position,
+            visible_rooms=visible_rooms,
+        )
+        action: TacticalAction | None = None
+        if tier == AILodTier.FAR:
+            state = BotAIState.CHASING
+        else:
+            action = choose_tactical_action(
+                bot=bot,
+                player_position=player_position,
+                cover_objects=cover_objects,
+                ally_count=ally_count,
+                cover_service=self.cover_service,
+            )
+            state = _STATE_FOR_ACTION[action]
+        bot.set_state(state)
+        self._next_update_at[bot.bot_id] = now + self.policy.interval_for(tier)
+        return AILodDecision(bot_id=bot.bot_id, tier=tier, state=state, action=action)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from heapq import heappop, heappush
 from math import sqrt
 
 
@@ -17,28 +20,292 @@ def _distance(a: Vector3, b: Vector3) -> float:
     return sqrt((dx * dx) + (dy * dy) + (dz * dz))
 
 
+class _WaypointKdTree:
+    """Static 3D KD-tree over waypoint positions for nearest-node queries.
+
+    Ties resolve to the waypoint inserted first, matching a linear `min()` scan.
+    """
+
+    __slots__ = ("_nodes", "_root")
+
+    def __init__(self, waypoints: dict[str, Vector3]) -> None:
+        # Node layout: (position, insertion order, waypoint id, split axis, left, right).
+        self._nodes: list[tuple[Vector3, int, str, int, int, int]] = []
+        entries = [(position, order, waypoint_id) for order, (waypoint_id, position) in enumerate(waypoints.items())]
+        self._root = self._build(entries)
+
+    def _build(self, entries: list[tuple[Vector3, int, str]]) -> int:
+        if not entries:
+            return -1
+        # Split on the widest axis so flat (single-floor) layouts do not waste levels on y.
+        spreads = [
+            max(entry[0][axis] for entry in entries) - min(entry[0][axis] for entry in entries)
+            for axis in range(3)
+        ]
+        axis = spreads.index(max(spreads))
+        entries.sort(key=lambda entry: entry[0][axis])
+        middle = len(entries) // 2
+        position, order, waypoint_id = entries[middle]
+        index = len(self._nodes)
+        self._nodes.append((position, order, waypoint_id, axis, -1, -1))
+        left = self._build(entries[:middle])
+        right = self._build(entries[middle + 1 :])
+        self._nodes[index] = (position, order, waypoint_id, axis, left, right)
+        return index
+
+    def nearest(self, position: Vector3) -> str:
+        nodes = self._nodes
+        px, py, pz = position
+        best_distance_sq = float("inf")
+        best_order = len(nodes)
+        best_id = ""
+
+        def visit(index: int) -> None:
+            nonlocal best_distance_sq, best_order, best_id
+            point, order, waypoint_id, axis, left, right = nodes[index]
+            dx = px - point[0]
+            dy = py - point[1]
+            dz = pz - point[2]
+            distance_sq = (dx * dx) + (dy * dy) + (dz * dz)
+            if distance_sq < best_distance_sq or (distance_sq == best_distance_sq and order < best_order):
+                best_distance_sq = distance_sq
+                best_order = order
+                best_id = waypoint_id
+            offset = position[axis] - point[axis]
+            near, far = (left, right) if offset < 0.0 else (right, left)
+            if near != -1:
+                visit(near)
+            if far != -1 and (offset * offset) <= best_distance_sq:
+                visit(far)
+
+        visit(self._root)
+        return best_id
+
+
+class PathStrategy(str, Enum):
+    """Search strategies supported by `WaypointPathfinder`."""
+
+    HOP_COUNT = "hop_count"
+    WEIGHTED_ASTAR = "weighted_astar"
+    NEXT_HOP_TABLE = "next_hop_table"
+
+
 @dataclass
 class WaypointPathfinder:
-    """Graph pathfinding over named waypoints using shortest hop count."""
+    """Graph pathfinding over named waypoints.
+
+    Nearest-waypoint lookups use a KD-tree built at construction; call
+    `rebuild_waypoint_index()` after editing `waypoints`.
+
+    `strategy` picks the default search: breadth-first by hop count, A* over
+    Euclidean link lengths, or a walk through a precomputed all-pairs next-hop
+    table (see `build_next_hop_table()`).
+
+    `find_path(...)` answers from a bounded LRU cache keyed on the start/goal
+    waypoints. Cached paths are shared tuples, so callers must not expect a
+    private copy. Change links through `add_link`/`remove_link` or
+    `block_link`/`unblock_link`, or call `mark_links_changed()` after editing
+    `links` directly, so the cache and the next-hop table are dropped.
+    """
 
     waypoints: dict[str, Vector3]
     links: dict[str, list[str]]
+    strategy: PathStrategy = PathStrategy.HOP_COUNT
+    path_cache_size: int = 256
+    links_version: int = field(default=0, init=False)
+    path_cache_hits: int = field(default=0, init=False)
+    path_cache_misses: int = field(default=0, init=False)
+    _next_hop: dict[str, dict[str, str]] | None = field(default=None, init=False, repr=False)
+    _path_cache: OrderedDict[tuple[str, str, PathStrategy], tuple[Vector3, ...]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _path_cache_version: int = field(default=0, init=False, repr=False)
+    _waypoint_index: _WaypointKdTree | None = field(default=None, init=False, repr=False)
+    blocked_links: set[tuple[str, str]] = field(default_factory=set, init=False)
+    _link_listeners: list[Callable[[str, str], None]] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.path_cache_size < 0:
+            raise ValueError("path_cache_size must be non-negative.")
+        self._waypoint_index = _WaypointKdTree(self.waypoints) if self.waypoints else None
+
+    def rebuild_waypoint_index(self) -> None:
+        """Rebuild the nearest-waypoint KD-tree and drop cached paths."""
+        self._waypoint_index = _WaypointKdTree(self.waypoints) if self.waypoints else None
+        self.mark_links_changed()
 
     def nearest_waypoint(self, position: Vector3) -> str:
-        if not self.waypoints:
+        if self._waypoint_index is None:
             raise ValueError("No waypoints configured.")
-        return min(
-            self.waypoints.keys(),
-            key=lambda waypoint_id: _distance(position, self.waypoints[waypoint_id]),
-        )
+        return self._waypoint_index.nearest(position)
+
+    def nearest_waypoints(self, positions: list[Vector3]) -> list[str]:
+        """Snap many positions (e.g. every bot) to their nearest waypoints in one call."""
+        if self._waypoint_index is None:
+            raise ValueError("No waypoints configured.")
+        nearest = self._waypoint_index.nearest
+        snapped: dict[Vector3, str] = {}
+        result: list[str] = []
+        for position in positions:
+            waypoint_id = snapped.get(position)
+            if waypoint_id is None:
+                waypoint_id = nearest(position)
+                snapped[position] = waypoint_id
+            result.append(waypoint_id)
+        return result
+
+    def link_length(self, from_id: str, to_id: str) -> float:
+        return _distance(self.waypoints[from_id], self.waypoints[to_id])
+
+    def open_neighbors(self, waypoint_id: str) -> list[str]:
+        """Return linked neighbours whose link is not blocked."""
+        blocked = self.blocked_links
+        neighbors = self.links.get(waypoint_id, [])
+        if not blocked:
+            return neighbors
+        return [neighbor for neighbor in neighbors if (waypoint_id, neighbor) not in blocked]
+
+    def link_cost(self, from_id: str, to_id: str) -> float:
+        """Return the traversal cost of a link, or inf when it is missing or blocked."""
+        if (from_id, to_id) in self.blocked_links or to_id not in self.links.get(from_id, []):
+            return float("inf")
+        return self.link_length(from_id, to_id)
+
+    def add_link_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call `listener(from_id, to_id)` whenever that link's cost changes."""
+        self._link_listeners.append(listener)
 
-    def find_path(self, start_position: Vector3, goal_position: Vector3) -> list[Vector3]:
-        """Find a path between nearest start/goal waypoints via BFS."""
+    def remove_link_listener(self, listener: Callable[[str, str], None]) -> None:
+        if listener in self._link_listeners:
+            self._link_listeners.remove(listener)
+
+    def add_link(self, from_id: str, to_id: str) -> None:
+        """Add a directed link and invalidate cached paths."""
+        for waypoint_id in (from_id, to_id):
+            if waypoint_id not in self.waypoints:
+                raise ValueError(f"Unknown waypoint '{waypoint_id}'.")
+        neighbors = self.links.setdefault(from_id, [])
+        if to_id not in neighbors:
+            neighbors.append(to_id)
+            self._link_changed(from_id, to_id)
+
+    def remove_link(self, from_id: str, to_id: str) -> None:
+        """Remove a directed link and invalidate cached paths."""
+        neighbors = self.links.get(from_id, [])
+        if to_id in neighbors:
+            neighbors.remove(to_id)
+            self._link_changed(from_id, to_id)
+
+    def block_link(self, from_id: str, to_id: str) -> None:
+        """Temporarily close a directed link (e.g. a shut doorway) without removing it."""
+        if to_id not in self.links.get(from_id, []):
+            raise ValueError(f"No link from '{from_id}' to '{to_id}'.")
+        if (from_id, to_id) not in self.blocked_links:
+            self.blocked_links.add((from_id, to_id))
+            self._link_changed(from_id, to_id)
+
+    def unblock_link(self, from_id: str, to_id: str) -> None:
+        """Reopen a link closed by `block_link(...)`."""
+        if (from_id, to_id) in self.blocked_links:
+            self.blocked_links.discard((from_id, to_id))
+            self._link_changed(from_id, to_id)
+
+    def mark_links_changed(self) -> None:
+        """Bump `links_version` so cached paths and next-hop data are rebuilt."""
+        self.links_version += 1
+
+    def _link_changed(self, from_id: str, to_id: str) -> None:
+        self.mark_links_changed()
+        for listener in list(self._link_listeners):
+            listener(from_id, to_id)
+
+    def clear_path_cache(self) -> None:
+        self._path_cache.clear()
+
+    def find_path(
+        self,
+        start_position: Vector3,
+        goal_position: Vector3,
+        *,
+        strategy: PathStrategy | None = None,
+    ) -> tuple[Vector3, ...]:
+        """Find a path between nearest start/goal waypoints (cached, shared tuple)."""
         start_id = self.nearest_waypoint(start_position)
         goal_id = self.nearest_waypoint(goal_position)
+        self._sync_links_version()
+        key = (start_id, goal_id, strategy or self.strategy)
+        cache = self._path_cache
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            self.path_cache_hits += 1
+            return cached
+        self.path_cache_misses += 1
+        waypoint_ids = self.find_waypoint_path(start_id, goal_id, strategy=strategy)
+        path = tuple(self.waypoints[waypoint_id] for waypoint_id in waypoint_ids)
+        if self.path_cache_size:
+            cache[key] = path
+            if len(cache) > self.path_cache_size:
+                cache.popitem(last=False)
+        return path
+
+    def find_waypoint_path(
+        self,
+        start_id: str,
+        goal_id: str,
+        *,
+        strategy: PathStrategy | None = None,
+    ) -> list[str]:
+        """Return waypoint ids from start to goal, or an empty list when unreachable."""
+        for waypoint_id in (start_id, goal_id):
+            if waypoint_id not in self.waypoints:
+                raise ValueError(f"Unknown waypoint '{waypoint_id}'.")
         if start_id == goal_id:
-            return [self.waypoints[start_id]]
+            return [start_id]
+        self._sync_links_version()
+        active_strategy = strategy or self.strategy
+        if active_strategy == PathStrategy.WEIGHTED_ASTAR:
+            return self._astar_path(start_id, goal_id)
+        if active_strategy == PathStrategy.NEXT_HOP_TABLE:
+            return self._table_path(start_id, goal_id)
+        return self._bfs_path(start_id, goal_id)
+
+    def build_next_hop_table(self) -> dict[str, dict[str, str]]:
+        """Precompute first hops of every shortest weighted path (repeated Dijkstra).
+
+        `table[source][target]` is the neighbour of `source` to step to next on
+        the way to `target`; unreachable targets are absent. Query cost after
+        this is O(path length).
+        """
+        table: dict[str, dict[str, str]] = {}
+        for source in self.waypoints:
+            first_hop: dict[str, str] = {}
+            best: dict[str, float] = {source: 0.0}
+            frontier: list[tuple[float, str]] = [(0.0, source)]
+            settled: set[str] = set()
+            while frontier:
+                cost, current = heappop(frontier)
+                if current in settled:
+                    continue
+                settled.add(current)
+                for neighbor in self.open_neighbors(current):
+                    next_cost = cost + self.link_length(current, neighbor)
+                    if next_cost < best.get(neighbor, float("inf")):
+                        best[neighbor] = next_cost
+                        first_hop[neighbor] = neighbor if current == source else first_hop[current]
+                        heappush(frontier, (next_cost, neighbor))
+            table[source] = first_hop
+        self._sync_links_version()
+        self._next_hop = table
+        return table
+
+    def _sync_links_version(self) -> None:
+        if self._path_cache_version != self.links_version:
+            self._path_cache_version = self.links_version
+            self._path_cache.clear()
+            self._next_hop = None
 
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str]:
         frontier: deque[str] = deque([start_id])
         came_from: dict[str, str | None] = {start_id: None}
 
@@ -46,7 +313,7 @@ class WaypointPathfinder:
             current = frontier.popleft()
             if current == goal_id:
                 break
-            for neighbor in self.links.get(current, []):
+            for neighbor in self.open_neighbors(current):
                 if neighbor in came_from:
                     continue
                 came_from[neighbor] = current
@@ -54,11 +321,54 @@ class WaypointPathfinder:
 
         if goal_id not in came_from:
             return []
+        return self._reconstruct(came_from, goal_id)
+
+    def _astar_path(self, start_id: str, goal_id: str) -> list[str]:
+        goal_position = self.waypoints[goal_id]
+        came_from: dict[str, str | None] = {start_id: None}
+        best: dict[str, float] = {start_id: 0.0}
+        frontier: list[tuple[float, float, str]] = [
+            (_distance(self.waypoints[start_id], goal_position), 0.0, start_id)
+        ]
+        closed: set[str] = set()
+
+        while frontier:
+            _, cost, current = heappop(frontier)
+            if current == goal_id:
+                return self._reconstruct(came_from, goal_id)
+            if current in closed:
+                continue
+            closed.add(current)
+            for neighbor in self.open_neighbors(current):
+                next_cost = cost + self.link_length(current, neighbor)
+                if next_cost >= best.get(neighbor, float("inf")):
+                    continue
+                best[neighbor] = next_cost
+                came_from[neighbor] = current
+                # Straight-line distance never overestimates, so A* stays optimal.
+                estimate = next_cost + _distance(self.waypoints[neighbor], goal_position)
+                heappush(frontier, (estimate, next_cost, neighbor))
+        return []
+
+    def _table_path(self, start_id: str, goal_id: str) -> list[str]:
+        if self._next_hop is None:
+            self.build_next_hop_table()
+        table = self._next_hop
+        if goal_id not in table[start_id]:
+            return []
+        waypoint_ids = [start_id]
+        current = start_id
+        while current != goal_id:
+            current = table[current][goal_id]
+            waypoint_ids.append(current)
+        return waypoint_ids
 
+    @staticmethod
+    def _reconstruct(came_from: dict[str, str | None], goal_id: str) -> list[str]:
         waypoint_ids: list[str] = []
         crawl: str | None = goal_id
         while crawl is not None:
             waypoint_ids.append(crawl)
             crawl = came_from[crawl]
         waypoint_ids.reverse()
-        return [self.waypoints[waypoint_id] for waypoint_id in waypoint_ids]
+        return waypoint_ids
@@ -0,0 +1,344 @@
+"""Struct-of-arrays bot container for very large waves."""
+
+from __future__ import annotations
+
+from array import array
+from math import sqrt
+
+from src.ai.bot import Bot, BotAIState
+from src.weapons.specs import WeaponSpec, get_weapon_spec
+from src.weapons.weapon import Weapon
+
+
+Vector3 = tuple[float, float, float]
+
+STATE_CODES: tuple[BotAIState, ...] = tuple(BotAIState)
+_CODE_BY_STATE: dict[BotAIState, int] = {state: code for code, state in enumerate(STATE_CODES)}
+DEAD_CODE = _CODE_BY_STATE[BotAIState.DEAD]
+
+
+def state_code(state: BotAIState) -> int:
+    """Return the compact integer code stored for an AI state."""
+    return _CODE_BY_STATE[state]
+
+
+class SwarmWeaponView:
+    """`Weapon`-compatible view over one swarm row's weapon arrays."""
+
+    __slots__ = ("_swarm", "_bot_id")
+
+    def __init__(self, swarm: "BotSwarm", bot_id: str) -> None:
+        self._swarm = swarm
+        self._bot_id = bot_id
+
+    @property
+    def _index(self) -> int:
+        return self._swarm.index_of(self._bot_id)
+
+    @property
+    def spec(self) -> WeaponSpec:
+        return self._swarm.weapon_spec
+
+    @property
+    def ammo_in_magazine(self) -> int:
+        return self._swarm.ammo[self._index]
+
+    @ammo_in_magazine.setter
+    def ammo_in_magazine(self, value: int) -> None:
+        self._swarm.ammo[self._index] = value
+
+    @property
+    def reserve_ammo(self) -> int:
+        return self._swarm.reserve_ammo[self._index]
+
+    @reserve_ammo.setter
+    def reserve_ammo(self, value: int) -> None:
+        self._swarm.reserve_ammo[self._index] = value
+
+    @property
+    def last_fired_at(self) -> float:
+        return self._swarm.last_fired_at[self._index]
+
+    @last_fired_at.setter
+    def last_fired_at(self, value: float) -> None:
+        self._swarm.last_fired_at[self._index] = value
+
+    @property
+    def fire_rate_multiplier(self) -> float:
+        return self._swarm.fire_rate_multiplier[self._index]
+
+    # Firing rules are shared with `Weapon` so both paths stay identical.
+    name = Weapon.name
+    damage = Weapon.damage
+    magazine_size = Weapon.magazine_size
+    fire_rate = Weapon.fire_rate
+    cooldown_seconds = Weapon.cooldown_seconds
+    total_remaining_ammo = Weapon.total_remaining_ammo
+    is_magazine_full = Weapon.is_magazine_full
+    can_reload = Weapon.can_reload
+    can_fire = Weapon.can_fire
+    fire = Weapon.fire
+    fire_due = Weapon.fire_due
+    reload = Weapon.reload
+    create_projectile_payload = Weapon.create_projectile_payload
+    create_scheduled_projectile_payloads = Weapon.create_scheduled_projectile_payloads
+
+
+class SwarmBot:
+    """Thin `Bot`-compatible view over one swarm row.
+
+    Views look their row up by id, so they stay valid after `BotSwarm.compact()`
+    as long as the bot itself was not removed.
+    """
+
+    __slots__ = ("_swarm", "bot_id")
+
+    def __init__(self, swarm: "BotSwarm", bot_id: str) -> None:
+        self._swarm = swarm
+        self.bot_id = bot_id
+
+    @property
+    def _index(self) -> int:
+        return self._swarm.index_of(self.bot_id)
+
+    @property
+    def max_health(self) -> int:
+        return self._swarm.max_health[self._index]
+
+    @property
+    def health(self) -> float:
+        return self._swarm.health[self._index]
+
+    @health.setter
+    def health(self, value: float) -> None:
+        self._swarm.health[self._index] = value
+
+    @property
+    def position(self) -> Vector3:
+        return self._swarm.position_of(self._index)
+
+    @position.setter
+    def position(self, value: Vector3) -> None:
+        index = self._index
+        self._swarm.position_x[index] = value[0]
+        self._swarm.position_y[index] = value[1]
+        self._swarm.position_z[index] = value[2]
+
+    @property
+    def ai_state(self) -> BotAIState:
+        return STATE_CODES[self._swarm.state_codes[self._index]]
+
+    @ai_state.setter
+    def ai_state(self, value: BotAIState) -> None:
+        self._swarm.state_codes[self._index] = _CODE_BY_STATE[value]
+
+    @property
+    def weapon(self) -> SwarmWeaponView:
+        return SwarmWeaponView(self._swarm, self.bot_id)
+
+    is_alive = Bot.is_alive
+    set_state = Bot.set_state
+    apply_damage = Bot.apply_damage
+    shoot_at = Bot.shoot_at
+    spawn_money_drop = Bot.spawn_money_drop
+
+
+class BotSwarm:
+    """Stores bot ids, transforms, health, AI state codes, and weapon state in flat arrays.
+
+    All bots in one swarm share a single `WeaponSpec`; only ammo, reserve ammo,
+    last-fired timestamps, and fire-rate multipliers are stored per row. Health
+    is stored as floats because weapon damage is fractional. Bulk operations
+    work on index lists and touch only the arrays they need.
+    """
+
+    def __init__(self, *, weapon_spec: WeaponSpec | None = None) -> None:
+        self.weapon_spec = weapon_spec or get_weapon_spec("AssaultRifle")
+        self.bot_ids: list[str] = []
+        self.position_x = array("d")
+        self.position_y = array("d")
+        self.position_z = array("d")
+        self.max_health = array("l")
+        self.health = array("d")
+        self.state_codes = array("b")
+        self.ammo = array("l")
+        self.reserve_ammo = array("l")
+        self.last_fired_at = array("d")
+        self.fire_rate_multiplier = array("d")
+        self._index_by_id: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.bot_ids)
+
+    @classmethod
+    def from_bots(cls, bots: list[Bot], *, weapon_spec: WeaponSpec | None = None) -> "BotSwarm":
+        """Copy per-instance bots into a swarm; every bot must carry the swarm's weapon spec."""
+        swarm = cls(weapon_spec=weapon_spec or (bots[0].weapon.spec if bots else None))
+        for bot in bots:
+            if bot.weapon.spec != swarm.weapon_spec:
+                raise ValueError(
+                    f"Bot '{bot.bot_id}' uses weapon '{bot.weapon.spec.name}', "
+                    f"but the swarm shares '{swarm.weapon_spec.name}'."
+                )
+        for bot in bots:
+            index = swarm.add(
+                bot_id=bot.bot_id,
+                position=bot.position,
+                max_health=bot.max_health,
+                health=bot.health,
+                ai_state=bot.ai_state,
+                fire_rate_multiplier=bot.weapon.fire_rate_multiplier,
+            )
+            swarm.ammo[index] = bot.weapon.ammo_in_magazine
+            swarm.reserve_ammo[index] = bot.weapon.reserve_ammo
+            swarm.last_fired_at[index] = bot.weapon.last_fired_at
+        return swarm
+
+    def add(
+        self,
+        *,
+        bot_id: str,
+        position: Vector3,
+        max_health: int,
+        health: float | None = None,
+        ai_state: BotAIState = BotAIState.IDLE,
+        fire_rate_multiplier: float = 1.0,
+    ) -> int:
+        """Append one bot row and return its index."""
+        if bot_id in self._index_by_id:
+            raise ValueError(f"Bot '{bot_id}' already exists in swarm.")
+        if max_health <= 0:
+            raise ValueError("max_health must be positive.")
+        if fire_rate_multiplier <= 0:
+            raise ValueError(f"fire_rate_multiplier must be positive, got {fire_rate_multiplier}")
+        start_health = max_health if health is None else health
+        index = len(self.bot_ids)
+        self.bot_ids.append(bot_id)
+        self._index_by_id[bot_id] = index
+        self.position_x.append(position[0])
+        self.position_y.append(position[1])
+        self.position_z.append(position[2])
+        self.max_health.append(max_health)
+        self.health.append(start_health)
+        self.state_codes.append(DEAD_CODE if start_health <= 0 else _CODE_BY_STATE[ai_state])
+        self.ammo.append(self.weapon_spec.magazine_size)
+        self.reserve_ammo.append(self.weapon_spec.reserve_ammo)
+        self.last_fired_at.append(-1_000_000.0)
+        self.fire_rate_multiplier.append(fire_rate_multiplier)
+        return index
+
+    def index_of(self, bot_id: str) -> int:
+        if bot_id not in self._index_by_id:
+            raise ValueError(f"Bot '{bot_id}' is not in swarm.")
+        return self._index_by_id[bot_id]
+
+    def view(self, bot_id: str) -> SwarmBot:
+        self.index_of(bot_id)
+        return SwarmBot(self, bot_id)
+
+    def views(self) -> list[SwarmBot]:
+        return [SwarmBot(self, bot_id) for bot_id in self.bot_ids]
+
+    def position_of(self, index: int) -> Vector3:
+        return (self.position_x[index], self.position_y[index], self.position_z[index])
+
+    def alive_indices(self) -> list[int]:
+        return [index for index, health in enumerate(self.health) if health > 0]
+
+    def indices_in_state(self, state: BotAIState) -> list[int]:
+        code = _CODE_BY_STATE[state]
+        return [index for index, value in enumerate(self.state_codes) if value == code]
+
+    def count_in_state(self, state: BotAIState) -> int:
+        return self.state_codes.count(_CODE_BY_STATE[state])
+
+    def set_states(self, indices: list[int], state: BotAIState) -> int:
+        """Set an AI state on every listed living bot and return how many changed."""
+        code = _CODE_BY_STATE[state]
+        health = self.health
+        state_codes = self.state_codes
+        changed = 0
+        for index in indices:
+            if health[index] > 0 and state_codes[index] != code:
+                state_codes[index] = code
+                changed += 1
+        return changed
+
+    def apply_damage(self, indices: list[int], amounts: list[float] | float) -> list[int]:
+        """Apply damage to many bots at once and return indices killed by this call."""
+        if isinstance(amounts, (int, float)):
+            amounts = [amounts] * len(indices)
+        if len(amounts) != len(indices):
+            raise ValueError("amounts must match indices length.")
+        health = self.health
+        state_codes = self.state_codes
+        killed: list[int] = []
+        for index, amount in zip(indices, amounts):
+            if amount < 0:
+                raise ValueError("Damage must be non-negative.")
+            current = health[index]
+            if current <= 0:
+                continue
+            remaining = current - amount
+            if remaining <= 0:
+                health[index] = 0
+                state_codes[index] = DEAD_CODE
+                killed.append(index)
+            else:
+                health[index] = remaining
+        return killed
+
+    def indices_within(self, center: Vector3, radius: float) -> list[int]:
+        """Return living bot indices whose 2D distance to `center` is within `radius`."""
+        if radius < 0.0:
+            raise ValueError("radius must be non-negative.")
+        cx = center[0]
+        cz = center[2]
+        radius_sq = radius * radius
+        xs = self.position_x
+        zs = self.position_z
+        health = self.health
+        return [
+            index
+            for index in range(len(self.bot_ids))
+            if health[index] > 0
+            and ((xs[index] - cx) * (xs[index] - cx)) + ((zs[index] - cz) * (zs[index] - cz)) <= radius_sq
+        ]
+
+    def apply_area_damage(self, center: Vector3, radius: float, amount: float) -> list[int]:
+        """Damage every living bot inside a radius (e.g. rocket splash)."""
+        return self.apply_damage(self.indices_within(center, radius), amount)
+
+    def distances_to(self, point: Vector3) -> list[float]:
+        """Return 2D distance from every row to `point`."""
+        px = point[0]
+        pz = point[2]
+        return [
+            sqrt(((x - px) * (x - px)) + ((z - pz) * (z - pz)))
+            for x, z in zip(self.position_x, self.position_z)
+        ]
+
+    def compact(self) -> list[str]:
+        """Drop dead rows, keeping survivor order, and return removed bot ids."""
+        keep = self.alive_indices()
+        if len(keep) == len(self.bot_ids):
+            return []
+        keep_set = set(keep)
+        removed = [bot_id for index, bot_id in enumerate(self.bot_ids) if index not in keep_set]
+        self.bot_ids = [self.bot_ids[index] for index in keep]
+        for name in (
+            "position_x",
+            "position_y",
+            "position_z",
+            "max_health",
+            "health",
+            "state_codes",
+            "ammo",
+            "reserve_ammo",
+            "last_fired_at",
+            "fire_rate_multiplier",
+        ):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[index] for index in keep]))
+        self._index_by_id = {bot_id: index for index, bot_id in enumerate(self.bot_ids)}
+        return removed
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from math import sqrt
+from math import floor, sqrt
 
 from src.ai.bot import Bot
+from src.environment.cover_points import CoverDatabase
 from src.environment.facility import CoverObject
 
 
@@ -64,7 +65,10 @@ def _cover_blocks_line_of_fire(
     return _segment_point_distance_2d(from_position, to_position, center) <= (radius + 0.35)
 
 
-def _cover_anchor(cover: CoverObject, player_position: Vector3, stand_off: float = 0.9) -> Vector3:
+_COVER_STAND_OFF = 0.9
+
+
+def _cover_anchor(cover: CoverObject, player_position: Vector3, stand_off: float = _COVER_STAND_OFF) -> Vector3:
     center = cover.center
     dir_x = center[0] - player_position[0]
     dir_z = center[2] - player_position[2]
@@ -82,8 +86,26 @@ def find_cover_plan(
     player_position: Vector3,
     cover_objects: list[CoverObject],
     max_cover_distance: float = 12.0,
+    cover_database: CoverDatabase | None = None,
 ) -> CoverPlan | None:
-    """Pick the nearest useful cover that can break line-of-fire to player."""
+    """Pick the nearest useful cover that can break line-of-fire to player.
+
+    With a baked `cover_database`, the pick is a bitset lookup of ray-tested
+    cover spots instead of the geometric approximation.
+    """
+    if cover_database is not None:
+        spot = cover_database.nearest_hidden_spot(
+            bot_position=bot_position,
+            threat_positions=(player_position,),
+            max_distance=max_cover_distance,
+        )
+        if spot is None:
+            return None
+        return CoverPlan(
+            cover_id=spot.cover_id,
+            anchor_position=spot.position,
+            distance_from_bot=_distance_2d(bot_position, spot.position),
+        )
     chosen: CoverPlan | None = None
     for cover in cover_objects:
         anchor = _cover_anchor(cover, player_position)
@@ -101,6 +123,107 @@ def find_cover_plan(
     return chosen
 
 
+class CoverService:
+    """Shared, spatially indexed cover search for every bot in a frame.
+
+    Cover objects are bucketed by center on a uniform grid, so a query visits
+    only cover within reach of the bot. Anchors and line-of-fire verdicts are
+    memoized per quantized player position: the first query after the player
+    moves to a new quantum cell recomputes them lazily, and every later bot
+    query in that cell reuses them. Results match `find_cover_plan(...)`
+    evaluated at the quantized player position.
+    """
+
+    def __init__(
+        self,
+        cover_objects: list[CoverObject],
+        *,
+        max_cover_distance: float = 12.0,
+        cell_size: float = 4.0,
+        quantum: float = 0.5,
+    ) -> None:
+        if cell_size <= 0.0 or quantum <= 0.0:
+            raise ValueError("cell_size and quantum must be positive.")
+        self.cover_objects = list(cover_objects)
+        self.max_cover_distance = max_cover_distance
+        self.cell_size = cell_size
+        self.quantum = quantum
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        for index, cover in enumerate(self.cover_objects):
+            center = cover.center
+            self._buckets.setdefault(self._cell(center[0], center[2]), []).append(index)
+        self._player_key: tuple[int, int] | None = None
+        self._player_position: Vector3 = (0.0, 0.0, 0.0)
+        self._verdicts: dict[int, tuple[Vector3, bool]] = {}
+        self.queries = 0
+        self.anchor_computations = 0
+        self.candidates_checked = 0
+
+    def quantize(self, player_position: Vector3) -> Vector3:
+        """Snap a player position to the memoization grid."""
+        return (
+            round(player_position[0] / self.quantum) * self.quantum,
+            player_position[1],
+            round(player_position[2] / self.quantum) * self.quantum,
+        )
+
+    def find_cover(self, *, bot_position: Vector3, player_position: Vector3) -> CoverPlan | None:
+        """Return the nearest cover anchor that breaks line of fire, or None."""
+        self.queries += 1
+        self._sync_player(player_position)
+        reach = self.max_cover_distance + _COVER_STAND_OFF
+        min_cell = self._cell(bot_position[0] - reach, bot_position[2] - reach)
+        max_cell = self._cell(bot_position[0] + reach, bot_position[2] + reach)
+        candidates: list[int] = []
+        for cell_x in range(min_cell[0], max_cell[0] + 1):
+            for cell_z in range(min_cell[1], max_cell[1] + 1):
+                candidates.extend(self._buckets.get((cell_x, cell_z), ()))
+        candidates.sort()
+
+        chosen: CoverPlan | None = None
+        for index in candidates:
+            self.candidates_checked += 1
+            anchor, blocks = self._verdict(index)
+            if not blocks:
+                continue
+            distance = _distance_2d(bot_position, anchor)
+            if distance > self.max_cover_distance:
+                continue
+            if chosen is None or distance < chosen.distance_from_bot:
+                chosen = CoverPlan(
+                    cover_id=self.cover_objects[index].cover_id,
+                    anchor_position=anchor,
+                    distance_from_bot=distance,
+                )
+        return chosen
+
+    def _cell(self, x: float, z: float) -> tuple[int, int]:
+        return (int(floor(x / self.cell_size)), int(floor(z / self.cell_size)))
+
+    def _sync_player(self, player_position: Vector3) -> None:
+        quantized = self.quantize(player_position)
+        key = (round(quantized[0] / self.quantum), round(quantized[2] / self.quantum))
+        if key != self._player_key:
+            self._player_key = key
+            self._player_position = quantized
+            self._verdicts.clear()
+
+    def _verdict(self, index: int) -> tuple[Vector3, bool]:
+        verdict = self._verdicts.get(index)
+        if verdict is None:
+            self.anchor_computations += 1
+            cover = self.cover_objects[index]
+            anchor = _cover_anchor(cover, self._player_position)
+            blocks = _cover_blocks_line_of_fire(
+                cover=cover,
+                from_position=anchor,
+                to_position=self._player_position,
+            )
+            verdict = (anchor, blocks)
+            self._verdicts[index] = verdict
+        return verdict
+
+
 def choose_tactical_action(
     *,
     bot: Bot,
@@ -109,24 +232,54 @@ def choose_tactical_action(
     ally_count: int,
     low_health_threshold: int = 35,
     attack_range: float = 14.0,
+    cover_service: CoverService | None = None,
+    cover_database: CoverDatabase | None = None,
 ) -> TacticalAction:
-    """Choose attack/cover/flank based on bot state, health, and surroundings."""
+    """Choose attack/cover/flank based on bot state, health, and surroundings.
+
+    Pass a shared `cover_service` to reuse indexed, memoized cover search across
+    bots, or a baked `cover_database` to pick ray-tested cover spots.
+    """
     if not bot.is_alive:
         raise ValueError(f"Cannot choose tactical action for dead bot {bot.bot_id}. Callers must filter dead bots.")
 
     distance_to_player = _distance_2d(bot.position, player_position)
-    cover = find_cover_plan(
-        bot_position=bot.position,
-        player_position=player_position,
-        cover_objects=cover_objects,
+    if cover_service is not None:
+        cover = cover_service.find_cover(bot_position=bot.position, player_position=player_position)
+    else:
+        cover = find_cover_plan(
+            bot_position=bot.position,
+            player_position=player_position,
+            cover_objects=cover_objects,
+            cover_database=cover_database,
+        )
+    return decide_tactical_action(
+        health=bot.health,
+        distance_to_player=distance_to_player,
+        has_cover=cover is not None,
+        ally_count=ally_count,
+        low_health_threshold=low_health_threshold,
+        attack_range=attack_range,
     )
-    if bot.health <= low_health_threshold and cover is not None:
+
+
+def decide_tactical_action(
+    *,
+    health: int,
+    distance_to_player: float,
+    has_cover: bool,
+    ally_count: int,
+    low_health_threshold: int = 35,
+    attack_range: float = 14.0,
+) -> TacticalAction:
+    """Apply the attack/cover/flank rules to precomputed bot inputs."""
+    if health <= low_health_threshold and has_cover:
         return TacticalAction.TAKE_COVER
     if ally_count >= 1 and distance_to_player <= (attack_range * 1.5):
         return TacticalAction.FLANK
     if distance_to_player <= attack_range:
         return TacticalAction.ATTACK
-    if cover is not None:
+    if has_cover:
         return TacticalAction.TAKE_COVER
     return TacticalAction.ATTACK
 
@@ -138,11 +291,28 @@ def build_flank_route(
     flank_radius: float = 5.0,
 ) -> list[Vector3]:
     """Create a two-point flank path that approaches the player from a side angle."""
+    candidates = flank_candidates(
+        bot_position=bot_position,
+        player_position=player_position,
+        flank_radius=flank_radius,
+    )
+    if not candidates:
+        return [bot_position, player_position]
+    return [candidates[0], player_position]
+
+
+def flank_candidates(
+    *,
+    bot_position: Vector3,
+    player_position: Vector3,
+    flank_radius: float = 5.0,
+) -> list[Vector3]:
+    """Return both side flank points, the one nearer the bot first (empty when stacked)."""
     dir_x = player_position[0] - bot_position[0]
     dir_z = player_position[2] - bot_position[2]
     length = sqrt((dir_x * dir_x) + (dir_z * dir_z))
     if length <= 1e-9:
-        return [bot_position, player_position]
+        return []
 
     nx = dir_x / length
     nz = dir_z / length
@@ -159,5 +329,5 @@ def build_flank_route(
         player_position[2] + (right[1] * flank_radius),
     )
     if _distance_2d(bot_position, left_candidate) <= _distance_2d(bot_position, right_candidate):
-        return [left_candidate, player_position]
-    return [right_candidate, player_position]
+        return [left_candidate, right_candidate]
+    return [right_candidate, left_candidate]
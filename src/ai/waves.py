@@ -6,7 +6,9 @@ from dataclasses import dataclass
 from random import Random
 
 from src.ai.bot import Bot
-from src.weapons.assault_rifle import AssaultRifle
+from src.ai.swarm import BotSwarm
+from src.weapons.specs import get_weapon_spec
+from src.weapons.weapon import Weapon
 
 
 Vector3 = tuple[float, float, float]
@@ -20,6 +22,7 @@ class WaveDifficulty:
     bot_health: int
     accuracy_degrees: float
     fire_rate_multiplier: float
+    attack_tokens: int
 
 
 class WaveDirector:
@@ -30,9 +33,15 @@ class WaveDirector:
         *,
         base_bot_count: int = 3,
         max_extra_bots: int = 10,
+        base_attack_tokens: int = 2,
+        max_attack_tokens: int = 6,
     ) -> None:
+        if base_attack_tokens <= 0 or max_attack_tokens < base_attack_tokens:
+            raise ValueError("Attack tokens must be positive and ordered base <= max.")
         self.base_bot_count = base_bot_count
         self.max_extra_bots = max_extra_bots
+        self.base_attack_tokens = base_attack_tokens
+        self.max_attack_tokens = max_attack_tokens
 
     def bot_count_for_wave(self, wave_number: int) -> int:
         if wave_number <= 0:
@@ -46,11 +55,14 @@ class WaveDirector:
         health = 100 + ((wave_number - 1) * 12)
         accuracy = max(0.8, 4.5 - ((wave_number - 1) * 0.35))
         fire_rate_multiplier = 1.0 + ((wave_number - 1) * 0.06)
+        # One more concurrent shooter every other wave, capped for readability and frame cost.
+        attack_tokens = min(self.max_attack_tokens, self.base_attack_tokens + ((wave_number - 1) // 2))
         return WaveDifficulty(
             wave_number=wave_number,
             bot_health=health,
             accuracy_degrees=accuracy,
             fire_rate_multiplier=fire_rate_multiplier,
+            attack_tokens=attack_tokens,
         )
 
     def spawn_wave(
@@ -65,11 +77,14 @@ class WaveDirector:
             raise ValueError("spawn_positions must not be empty.")
         difficulty = self.difficulty_for_wave(wave_number)
         count = self.bot_count_for_wave(wave_number)
+        weapon_spec = get_weapon_spec("AssaultRifle")
         bots: list[Bot] = []
         for index in range(count):
             position = spawn_positions[rng.randrange(0, len(spawn_positions))]
-            weapon = AssaultRifle()
-            weapon.fire_rate *= difficulty.fire_rate_multiplier
+            weapon = Weapon.from_spec(
+                weapon_spec,
+                fire_rate_multiplier=difficulty.fire_rate_multiplier,
+            )
             bot = Bot(
                 bot_id=f"wave-{wave_number}-bot-{index + 1}",
                 max_health=difficulty.bot_health,
@@ -79,3 +94,33 @@ class WaveDirector:
             )
             bots.append(bot)
         return bots
+
+    def spawn_swarm(
+        self,
+        *,
+        wave_number: int,
+        spawn_positions: list[Vector3],
+        rng: Random,
+        bot_count: int | None = None,
+    ) -> BotSwarm:
+        """Spawn a wave directly into a struct-of-arrays `BotSwarm`.
+
+        Uses the same position draws and ids as `spawn_wave(...)`. `bot_count`
+        overrides the wave size so stress tests can exceed the normal ceiling.
+        """
+        if not spawn_positions:
+            raise ValueError("spawn_positions must not be empty.")
+        difficulty = self.difficulty_for_wave(wave_number)
+        count = self.bot_count_for_wave(wave_number) if bot_count is None else bot_count
+        if count < 0:
+            raise ValueError("bot_count must be non-negative.")
+        swarm = BotSwarm(weapon_spec=get_weapon_spec("AssaultRifle"))
+        for index in range(count):
+            position = spawn_positions[rng.randrange(0, len(spawn_positions))]
+            swarm.add(
+                bot_id=f"wave-{wave_number}-bot-{index + 1}",
+                position=position,
+                max_health=difficulty.bot_health,
+                fire_rate_multiplier=difficulty.fire_rate_multiplier,
+            )
+        return swarm
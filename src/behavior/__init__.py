@@ -0,0 +1,33 @@
+"""Event-driven behavior trees shared by many bots."""
+
+from src.behavior.bot_tree import build_bot_combat_tree
+from src.behavior.runtime import DAMAGE_TAKEN, PATH_DONE, PLAYER_LOST, PLAYER_SEEN, BehaviorRuntime
+from src.behavior.tree import (
+    Action,
+    BehaviorStatus,
+    CompiledTree,
+    Condition,
+    NodeKind,
+    Selector,
+    Sequence,
+    Wait,
+    compile_tree,
+)
+
+__all__ = [
+    "BehaviorStatus",
+    "NodeKind",
+    "Selector",
+    "Sequence",
+    "Condition",
+    "Action",
+    "Wait",
+    "CompiledTree",
+    "compile_tree",
+    "BehaviorRuntime",
+    "DAMAGE_TAKEN",
+    "PLAYER_SEEN",
+    "PLAYER_LOST",
+    "PATH_DONE",
+    "build_bot_combat_tree",
+]
@@ -0,0 +1,67 @@
+"""Default event-driven combat tree for bots."""
+
+from __future__ import annotations
+
+from src.ai.bot import BotAIState
+from src.behavior.runtime import DAMAGE_TAKEN, PATH_DONE, PLAYER_LOST, PLAYER_SEEN
+from src.behavior.tree import (
+    Action,
+    BehaviorStatus,
+    Blackboard,
+    CompiledTree,
+    Condition,
+    Selector,
+    Sequence,
+    compile_tree,
+)
+
+
+def build_bot_combat_tree(
+    *,
+    low_health_threshold: int = 35,
+    attack_recheck_seconds: float = 0.5,
+) -> CompiledTree:
+    """Compile the cover > attack > chase tree shared by every bot.
+
+    Blackboards need a `bot` (a `Bot` or `SwarmBot`). Game code sets
+    `player_visible` before posting `PLAYER_SEEN` / `PLAYER_LOST`, posts
+    `DAMAGE_TAKEN` after damage, and `PATH_DONE` when a bot reaches its goal.
+    Actions write the bot's `ai_state` through `set_state(...)`.
+    """
+
+    def is_hurt(board: Blackboard) -> bool:
+        return board["bot"].health <= low_health_threshold
+
+    def sees_player(board: Blackboard) -> bool:
+        return bool(board.get("player_visible", False))
+
+    def seek_cover(board: Blackboard) -> BehaviorStatus:
+        if board["event"] == PATH_DONE:
+            return BehaviorStatus.SUCCESS
+        board["bot"].set_state(BotAIState.SEEKING_COVER)
+        return BehaviorStatus.RUNNING
+
+    def attack(board: Blackboard) -> BehaviorStatus:
+        board["bot"].set_state(BotAIState.ATTACKING)
+        return BehaviorStatus.RUNNING
+
+    def chase(board: Blackboard) -> BehaviorStatus:
+        if board["event"] == PATH_DONE:
+            board["bot"].set_state(BotAIState.IDLE)
+            return BehaviorStatus.SUCCESS
+        board["bot"].set_state(BotAIState.CHASING)
+        return BehaviorStatus.RUNNING
+
+    return compile_tree(
+        Selector(
+            Sequence(
+                Condition(is_hurt, watch=(DAMAGE_TAKEN,)),
+                Action(seek_cover, wake_on=(PATH_DONE,)),
+            ),
+            Sequence(
+                Condition(sees_player, watch=(PLAYER_SEEN, PLAYER_LOST)),
+                Action(attack, retry_seconds=attack_recheck_seconds),
+            ),
+            Action(chase, wake_on=(PATH_DONE,)),
+        )
+    )
@@ -0,0 +1,200 @@
+"""Event-driven behavior tree runtime where idle bots cost nothing."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from typing import Any
+
+from src.behavior.tree import Blackboard, BehaviorStatus, CompiledTree, NodeKind
+
+
+DAMAGE_TAKEN = "damage_taken"
+PLAYER_SEEN = "player_seen"
+PLAYER_LOST = "player_lost"
+PATH_DONE = "path_done"
+
+
+class BehaviorRuntime:
+    """Ticks one shared `CompiledTree` for many bots, only when they are awake.
+
+    Each bot owns a blackboard dict. A tick evaluates the tree from the root.
+    When it ends `RUNNING` at a leaf, the bot sleeps subscribed to that leaf's
+    `wake_on` events plus the tree's `watched_events`, with a timer for waits
+    and action retries. When it ends `SUCCESS` or `FAILURE`, the bot sleeps
+    until a watched event. `update(now)` only touches bots that were woken by
+    an event or whose timer expired.
+
+    The runtime writes `bot_id`, `now`, `event`, and `event_payload` into each
+    blackboard before a tick.
+    """
+
+    def __init__(self, tree: CompiledTree) -> None:
+        self.tree = tree
+        self._blackboards: dict[str, Blackboard] = {}
+        self._ready: dict[str, None] = {}
+        self._subscriptions: dict[str, frozenset[str]] = {}
+        self._subscribers: dict[str, set[str]] = {}
+        self._wake_at: dict[str, float] = {}
+        self._timers: list[tuple[float, int, str]] = []
+        self._timer_sequence = 0
+        self._running_node: dict[str, int | None] = {}
+        self._wait_until: dict[tuple[str, int], float] = {}
+        self.last_ticked = 0
+        self.total_ticks = 0
+
+    @property
+    def bot_count(self) -> int:
+        return len(self._blackboards)
+
+    @property
+    def sleeping_count(self) -> int:
+        return len(self._blackboards) - len(self._ready)
+
+    def add_bot(self, bot_id: str, blackboard: Blackboard | None = None) -> Blackboard:
+        """Register a bot (awake, so it ticks on the next update) and return its blackboard."""
+        if bot_id in self._blackboards:
+            raise ValueError(f"Bot '{bot_id}' is already registered.")
+        board = {} if blackboard is None else blackboard
+        board["bot_id"] = bot_id
+        board["event"] = None
+        board["event_payload"] = None
+        self._blackboards[bot_id] = board
+        self._running_node[bot_id] = None
+        self._ready[bot_id] = None
+        return board
+
+    def remove_bot(self, bot_id: str) -> None:
+        if bot_id not in self._blackboards:
+            return
+        self._unsubscribe(bot_id)
+        self._clear_running(bot_id)
+        del self._blackboards[bot_id]
+        del self._running_node[bot_id]
+        self._ready.pop(bot_id, None)
+        self._wake_at.pop(bot_id, None)
+
+    def blackboard(self, bot_id: str) -> Blackboard:
+        return self._blackboards[bot_id]
+
+    def is_awake(self, bot_id: str) -> bool:
+        return bot_id in self._ready
+
+    def running_node(self, bot_id: str) -> int | None:
+        """Return the leaf a sleeping bot is waiting in, or None when its last tick finished."""
+        return self._running_node[bot_id]
+
+    def post_event(self, bot_id: str, event: str, payload: Any = None) -> bool:
+        """Deliver an event to one bot if it listens for it (or is already awake)."""
+        if bot_id not in self._ready and event not in self._subscriptions.get(bot_id, ()):
+            return False
+        self._deliver(bot_id, event, payload)
+        return True
+
+    def broadcast(self, event: str, payload: Any = None) -> int:
+        """Deliver an event to every subscribed bot and return how many woke."""
+        subscribers = sorted(self._subscribers.get(event, ()))
+        for bot_id in subscribers:
+            self._deliver(bot_id, event, payload)
+        return len(subscribers)
+
+    def wake(self, bot_id: str) -> None:
+        """Force a bot to tick on the next update."""
+        if bot_id not in self._blackboards:
+            raise ValueError(f"Unknown bot '{bot_id}'.")
+        self._deliver(bot_id, None, None)
+
+    def update(self, now: float) -> int:
+        """Tick every awake bot and every bot whose timer expired; return the count."""
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            wake_at, _, bot_id = heappop(timers)
+            if self._wake_at.get(bot_id) == wake_at:
+                del self._wake_at[bot_id]
+                self._ready.setdefault(bot_id, None)
+
+        ready = list(self._ready)
+        self._ready.clear()
+        for bot_id in ready:
+            self._tick(bot_id, now)
+        self.last_ticked = len(ready)
+        self.total_ticks += len(ready)
+        return len(ready)
+
+    def _deliver(self, bot_id: str, event: str | None, payload: Any) -> None:
+        board = self._blackboards[bot_id]
+        board["event"] = event
+        board["event_payload"] = payload
+        self._unsubscribe(bot_id)
+        self._wake_at.pop(bot_id, None)
+        self._ready.setdefault(bot_id, None)
+
+    def _tick(self, bot_id: str, now: float) -> None:
+        board = self._blackboards[bot_id]
+        board["now"] = now
+        status, leaf, timeout = self._evaluate(bot_id, 0, board, now)
+        previous = self._running_node[bot_id]
+        new_running = leaf if status == BehaviorStatus.RUNNING else None
+        if previous is not None and previous != new_running:
+            self._wait_until.pop((bot_id, previous), None)
+        self._running_node[bot_id] = new_running
+        board["event"] = None
+        board["event_payload"] = None
+
+        events = set(self.tree.watched_events)
+        if new_running is not None:
+            events.update(self.tree.wake_on[new_running])
+        self._subscribe(bot_id, frozenset(events))
+        if new_running is not None and timeout is not None:
+            wake_at = now + timeout
+            self._wake_at[bot_id] = wake_at
+            self._timer_sequence += 1
+            heappush(self._timers, (wake_at, self._timer_sequence, bot_id))
+
+    def _evaluate(
+        self,
+        bot_id: str,
+        index: int,
+        board: Blackboard,
+        now: float,
+    ) -> tuple[BehaviorStatus, int, float | None]:
+        tree = self.tree
+        kind = tree.kinds[index]
+        if kind == NodeKind.SELECTOR or kind == NodeKind.SEQUENCE:
+            keep_going = BehaviorStatus.FAILURE if kind == NodeKind.SELECTOR else BehaviorStatus.SUCCESS
+            result: tuple[BehaviorStatus, int, float | None] = (keep_going, index, None)
+            for child in tree.children(index):
+                result = self._evaluate(bot_id, child, board, now)
+                if result[0] != keep_going:
+                    return result
+            return result
+        if kind == NodeKind.CONDITION:
+            passed = tree.payloads[index](board)
+            return (BehaviorStatus.SUCCESS if passed else BehaviorStatus.FAILURE, index, None)
+        if kind == NodeKind.ACTION:
+            status = tree.payloads[index](board)
+            return (status, index, tree.timeouts[index])
+        key = (bot_id, index)
+        until = self._wait_until.get(key)
+        if until is None:
+            until = now + tree.payloads[index]
+            self._wait_until[key] = until
+        if now >= until:
+            del self._wait_until[key]
+            return (BehaviorStatus.SUCCESS, index, None)
+        return (BehaviorStatus.RUNNING, index, until - now)
+
+    def _subscribe(self, bot_id: str, events: frozenset[str]) -> None:
+        self._subscriptions[bot_id] = events
+        for event in events:
+            self._subscribers.setdefault(event, set()).add(bot_id)
+
+    def _unsubscribe(self, bot_id: str) -> None:
+        for event in self._subscriptions.pop(bot_id, frozenset()):
+            subscribers = self._subscribers.get(event)
+            if subscribers is not None:
+                subscribers.discard(bot_id)
+
+    def _clear_running(self, bot_id: str) -> None:
+        running = self._running_node.get(bot_id)
+        if running is not None:
+            self._wait_until.pop((bot_id, running), None)
@@ -0,0 +1,156 @@
+"""Behavior tree node definitions compiled into flat, shareable node arrays."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+Blackboard = dict[str, Any]
+
+
+class BehaviorStatus(str, Enum):
+    """Result of ticking a node."""
+
+    SUCCESS = "success"
+    FAILURE = "failure"
+    RUNNING = "running"
+
+
+class NodeKind(str, Enum):
+    SELECTOR = "selector"
+    SEQUENCE = "sequence"
+    CONDITION = "condition"
+    ACTION = "action"
+    WAIT = "wait"
+
+
+@dataclass(frozen=True)
+class Selector:
+    """Runs children in order until one does not fail."""
+
+    children: tuple["Node", ...]
+
+    def __init__(self, *children: "Node") -> None:
+        object.__setattr__(self, "children", children)
+
+
+@dataclass(frozen=True)
+class Sequence:
+    """Runs children in order until one does not succeed."""
+
+    children: tuple["Node", ...]
+
+    def __init__(self, *children: "Node") -> None:
+        object.__setattr__(self, "children", children)
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Leaf that succeeds when `check(blackboard)` is true.
+
+    `watch` names the events that can change the answer. A sleeping bot wakes
+    on any watched event in its tree, so higher-priority branches can take over.
+    """
+
+    check: Callable[[Blackboard], bool]
+    watch: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Action:
+    """Leaf running `run(blackboard)`.
+
+    When it returns `RUNNING`, the bot sleeps until one of `wake_on` arrives or
+    `retry_seconds` pass (never, when `None`).
+    """
+
+    run: Callable[[Blackboard], BehaviorStatus]
+    wake_on: tuple[str, ...] = ()
+    retry_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class Wait:
+    """Leaf that keeps running for `seconds`, then succeeds."""
+
+    seconds: float
+
+
+Node = Selector | Sequence | Condition | Action | Wait
+
+
+class CompiledTree:
+    """Pre-order flat arrays for one tree, shared by every bot that runs it.
+
+    Node `i`'s children start at `i + 1` and follow `subtree_end` links until
+    `subtree_end[i]`. `watched_events` collects every condition's `watch`.
+    """
+
+    def __init__(self, root: Node) -> None:
+        self.kinds: list[NodeKind] = []
+        self.subtree_end: list[int] = []
+        self.payloads: list[Any] = []
+        self.wake_on: list[tuple[str, ...]] = []
+        self.timeouts: list[float | None] = []
+        watched: set[str] = set()
+        self._append(root, watched)
+        self.watched_events = frozenset(watched)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def children(self, index: int) -> list[int]:
+        child = index + 1
+        end = self.subtree_end[index]
+        found: list[int] = []
+        while child < end:
+            found.append(child)
+            child = self.subtree_end[child]
+        return found
+
+    def _append(self, node: Node, watched: set[str]) -> None:
+        index = len(self.kinds)
+        self.kinds.append(_kind_of(node))
+        self.subtree_end.append(index + 1)
+        self.payloads.append(None)
+        self.wake_on.append(())
+        self.timeouts.append(None)
+        if isinstance(node, (Selector, Sequence)):
+            if not node.children:
+                raise ValueError("Composite nodes need at least one child.")
+            for child in node.children:
+                self._append(child, watched)
+        elif isinstance(node, Condition):
+            self.payloads[index] = node.check
+            watched.update(node.watch)
+        elif isinstance(node, Action):
+            self.payloads[index] = node.run
+            self.wake_on[index] = tuple(node.wake_on)
+            self.timeouts[index] = node.retry_seconds
+        else:
+            if node.seconds < 0.0:
+                raise ValueError("Wait seconds must be non-negative.")
+            self.payloads[index] = node.seconds
+        self.subtree_end[index] = len(self.kinds)
+
+
+def _kind_of(node: Node) -> NodeKind:
+    if isinstance(node, Selector):
+        return NodeKind.SELECTOR
+    if isinstance(node, Sequence):
+        return NodeKind.SEQUENCE
+    if isinstance(node, Condition):
+        return NodeKind.CONDITION
+    if isinstance(node, Action):
+        return NodeKind.ACTION
+    if isinstance(node, Wait):
+        return NodeKind.WAIT
+    raise ValueError(f"Unknown behavior node {node!r}.")
+
+
+def compile_tree(root: Node) -> CompiledTree:
+    """Flatten a node tree once so any number of bots can share it."""
+    return CompiledTree(root)
@@ -25,6 +25,38 @@ class AABB:
             and self.max_corner[2] >= other.min_corner[2]
         )
 
+    def ray_entry_distance(
+        self,
+        origin: Vector3,
+        direction: Vector3,
+        padding: float = 0.0,
+    ) -> float | None:
+        """Return the distance where a ray enters this box grown by `padding`.
+
+        Uses the slab method; returns `0.0` when the origin already overlaps the
+        box and `None` when the ray never reaches it.
+        """
+        enter = 0.0
+        exit_ = float("inf")
+        for axis in range(3):
+            box_min = self.min_corner[axis] - padding
+            box_max = self.max_corner[axis] + padding
+            start = origin[axis]
+            step = direction[axis]
+            if abs(step) <= 1e-12:
+                if start < box_min or start > box_max:
+                    return None
+                continue
+            near = (box_min - start) / step
+            far = (box_max - start) / step
+            if near > far:
+                near, far = far, near
+            enter = max(enter, near)
+            exit_ = min(exit_, far)
+            if enter > exit_:
+                return None
+        return enter
+
 
 @dataclass
 class CollisionWorld:
@@ -45,3 +77,47 @@ class CollisionWorld:
             and box.min_corner[2] >= self.world_bounds.min_corner[2]
             and box.max_corner[2] <= self.world_bounds.max_corner[2]
         )
+
+    def bounds_exit_distance(
+        self,
+        origin: Vector3,
+        direction: Vector3,
+        half_extent: float = 0.0,
+    ) -> float:
+        """Return how far a box of `half_extent` can travel before leaving bounds."""
+        exit_distance = float("inf")
+        for axis in range(3):
+            low = self.world_bounds.min_corner[axis] + half_extent
+            high = self.world_bounds.max_corner[axis] - half_extent
+            start = origin[axis]
+            if start < low or start > high:
+                return 0.0
+            step = direction[axis]
+            if step > 1e-12:
+                exit_distance = min(exit_distance, (high - start) / step)
+            elif step < -1e-12:
+                exit_distance = min(exit_distance, (low - start) / step)
+        return exit_distance
+
+    def static_impact_distance(
+        self,
+        *,
+        origin: Vector3,
+        direction: Vector3,
+        max_distance: float,
+        half_extent: float = 0.0,
+    ) -> float | None:
+        """Return the first wall/bounds contact along a unit-direction sweep.
+
+        The swept shape is a cube of `half_extent`, matching the boxes used by
+        discrete wall checks. Returns `None` when nothing is hit within
+        `max_distance`.
+        """
+        nearest = self.bounds_exit_distance(origin, direction, half_extent)
+        for wall in self.static_walls:
+            distance = wall.ray_entry_distance(origin, direction, padding=half_extent)
+            if distance is not None and distance < nearest:
+                nearest = distance
+        if nearest > max_distance:
+            return None
+        return nearest
@@ -0,0 +1,12 @@
+"""Crowd movement shared by every moving bot."""
+
+from src.crowd.locomotion import BotLocomotion
+from src.crowd.steering import CrowdSteering, SpatialHash
+from src.crowd.walls import WallGrid
+
+__all__ = [
+    "BotLocomotion",
+    "CrowdSteering",
+    "SpatialHash",
+    "WallGrid",
+]
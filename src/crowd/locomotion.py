@@ -0,0 +1,161 @@
+"""Batched bot locomotion along paths with collision and wall sliding."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import sqrt
+
+from src.ai.bot import Bot
+from src.core.collision import AABB, CollisionWorld
+from src.crowd.steering import CrowdSteering
+from src.crowd.walls import WallGrid
+
+
+Vector3 = tuple[float, float, float]
+
+
+class BotLocomotion:
+    """Advances every moving bot along its path in one batched step per tick.
+
+    A step runs in phases over all movers at once: waypoint advancement,
+    desired directions toward the current waypoint, optional crowd steering,
+    speed-limited proposals, then collision with x/z slide fallback (like
+    `PlayerMovementController`). Static walls are bucketed in a `WallGrid` when
+    the system is built, so each bot only tests the walls near its move
+    instead of every wall in the world.
+    """
+
+    def __init__(
+        self,
+        *,
+        collision_world: CollisionWorld,
+        speed: float = 3.5,
+        arrival_radius: float = 0.3,
+        collider_half_size: tuple[float, float, float] = (0.35, 0.9, 0.35),
+        steering: CrowdSteering | None = None,
+        wall_cell_size: float = 4.0,
+    ) -> None:
+        if speed <= 0.0 or arrival_radius <= 0.0 or wall_cell_size <= 0.0:
+            raise ValueError("speed, arrival_radius, and wall_cell_size must be positive.")
+        self.collision_world = collision_world
+        self.speed = speed
+        self.arrival_radius = arrival_radius
+        self.collider_half_size = collider_half_size
+        self.steering = steering
+        self.wall_grid = WallGrid(collision_world, cell_size=wall_cell_size)
+        self._paths: dict[str, list[Vector3]] = {}
+        self._next_index: dict[str, int] = {}
+        self.last_moved = 0
+        self.last_wall_tests = 0
+
+    def set_path(self, bot_id: str, path: Sequence[Vector3]) -> None:
+        """Give a bot a path to follow; an empty path stops it."""
+        if not path:
+            self.clear_path(bot_id)
+            return
+        self._paths[bot_id] = list(path)
+        self._next_index[bot_id] = 0
+
+    def clear_path(self, bot_id: str) -> None:
+        self._paths.pop(bot_id, None)
+        self._next_index.pop(bot_id, None)
+
+    def has_path(self, bot_id: str) -> bool:
+        return bot_id in self._paths
+
+    def remaining_path(self, bot_id: str) -> list[Vector3]:
+        path = self._paths.get(bot_id)
+        if path is None:
+            return []
+        return path[self._next_index[bot_id]:]
+
+    def step(self, bots: Sequence[Bot], dt: float) -> list[str]:
+        """Move every living bot that has a path; return ids that reached their goal."""
+        if dt < 0.0:
+            raise ValueError("dt must be non-negative.")
+        movers = [bot for bot in bots if bot.bot_id in self._paths and bot.is_alive]
+        arrived: list[str] = []
+        self.last_moved = 0
+        self.last_wall_tests = 0
+        if not movers:
+            return arrived
+
+        # Phase 1: waypoint advancement and desired directions for all movers.
+        positions: list[Vector3] = []
+        desired: list[Vector3] = []
+        remaining: list[float] = []
+        active: list[Bot] = []
+        reach_sq = self.arrival_radius * self.arrival_radius
+        for bot in movers:
+            path = self._paths[bot.bot_id]
+            index = self._next_index[bot.bot_id]
+            position = bot.position
+            while index < len(path):
+                dx = path[index][0] - position[0]
+                dz = path[index][2] - position[2]
+                if (dx * dx) + (dz * dz) > reach_sq:
+                    break
+                index += 1
+            if index >= len(path):
+                self.clear_path(bot.bot_id)
+                arrived.append(bot.bot_id)
+                continue
+            self._next_index[bot.bot_id] = index
+            target = path[index]
+            dx = target[0] - position[0]
+            dz = target[2] - position[2]
+            distance = sqrt((dx * dx) + (dz * dz))
+            positions.append(position)
+            desired.append((dx / distance, 0.0, dz / distance))
+            # Only the final waypoint limits the step, so bots do not overshoot their goal.
+            remaining.append(distance if index == len(path) - 1 else float("inf"))
+            active.append(bot)
+
+        # Phase 2: crowd steering over every mover at once.
+        directions = desired
+        if self.steering is not None and active:
+            directions = self.steering.steer(positions, desired)
+
+        # Phase 3: speed-limited proposals resolved against nearby walls with sliding.
+        max_step = self.speed * dt
+        for bot, position, direction, limit in zip(active, positions, directions, remaining):
+            step = min(max_step, limit)
+            proposed = (position[0] + (direction[0] * step), position[1], position[2] + (direction[2] * step))
+            walls = self._walls_near(position, proposed)
+            resolved = self._resolve(position, proposed, walls)
+            if resolved != position:
+                bot.position = resolved
+                self.last_moved += 1
+        return arrived
+
+    def _walls_near(self, start: Vector3, end: Vector3) -> list[AABB]:
+        half_x = self.collider_half_size[0]
+        half_z = self.collider_half_size[2]
+        return self.wall_grid.walls_in(
+            min(start[0], end[0]) - half_x,
+            min(start[2], end[2]) - half_z,
+            max(start[0], end[0]) + half_x,
+            max(start[2], end[2]) + half_z,
+        )
+
+    def _resolve(self, position: Vector3, proposed: Vector3, walls: list[AABB]) -> Vector3:
+        if self._is_free(proposed, walls):
+            return proposed
+        slide_x = (proposed[0], position[1], position[2])
+        if self._is_free(slide_x, walls):
+            return slide_x
+        slide_z = (position[0], position[1], proposed[2])
+        if self._is_free(slide_z, walls):
+            return slide_z
+        return position
+
+    def _is_free(self, position: Vector3, walls: list[AABB]) -> bool:
+        half_x, half_y, half_z = self.collider_half_size
+        box = AABB(
+            min_corner=(position[0] - half_x, position[1] - half_y, position[2] - half_z),
+            max_corner=(position[0] + half_x, position[1] + half_y, position[2] + half_z),
+        )
+        if self.collision_world.outside_world_bounds(box):
+            return False
+        self.last_wall_tests += len(walls)
+        return not any(wall.intersects(box) for wall in walls)
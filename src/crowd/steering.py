@@ -0,0 +1,186 @@
+"""Local crowd steering: separation, path alignment, and obstacle avoidance."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import cos, floor, pi, sin, sqrt
+
+from src.core.collision import CollisionWorld
+from src.crowd.walls import WallGrid
+
+
+Vector3 = tuple[float, float, float]
+
+_EPSILON = 1e-9
+# Golden-angle axes push apart bots that share the exact same position.
+_GOLDEN_ANGLE = pi * (3.0 - sqrt(5.0))
+_WHISKER_ANGLE = pi / 5.0
+
+
+class SpatialHash:
+    """Uniform grid of point indices on the XZ plane, rebuilt every tick."""
+
+    def __init__(self, cell_size: float) -> None:
+        if cell_size <= 0.0:
+            raise ValueError("cell_size must be positive.")
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    def rebuild(self, positions: Sequence[Vector3]) -> None:
+        cells: dict[tuple[int, int], list[int]] = {}
+        size = self.cell_size
+        for index, position in enumerate(positions):
+            key = (int(floor(position[0] / size)), int(floor(position[2] / size)))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [index]
+            else:
+                bucket.append(index)
+        self._cells = cells
+
+    def candidates(self, position: Vector3) -> list[int]:
+        """Return indices in the 3x3 cells around a position (a superset of neighbours within one cell)."""
+        size = self.cell_size
+        cell_x = int(floor(position[0] / size))
+        cell_z = int(floor(position[2] / size))
+        found: list[int] = []
+        for offset_x in (-1, 0, 1):
+            for offset_z in (-1, 0, 1):
+                bucket = self._cells.get((cell_x + offset_x, cell_z + offset_z))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+
+class CrowdSteering:
+    """Computes one steering direction per bot for a whole crowd each tick.
+
+    The result blends three terms: separation from neighbours within
+    `neighbor_radius` (found through a `SpatialHash` rebuilt per call, so cost
+    grows with local density rather than crowd size), alignment with each bot's
+    desired path direction, and obstacle avoidance from two whisker probes
+    against the `CollisionWorld` (through a `WallGrid`, so probes only test
+    nearby walls). Directions lie on the XZ plane and are
+    clamped to unit length.
+    """
+
+    def __init__(
+        self,
+        *,
+        collision_world: CollisionWorld | None = None,
+        neighbor_radius: float = 1.2,
+        separation_weight: float = 1.5,
+        alignment_weight: float = 1.0,
+        avoidance_weight: float = 2.0,
+        probe_distance: float = 1.5,
+        agent_radius: float = 0.35,
+    ) -> None:
+        if neighbor_radius <= 0.0 or probe_distance <= 0.0 or agent_radius < 0.0:
+            raise ValueError("neighbor_radius and probe_distance must be positive.")
+        self.collision_world = collision_world
+        self.wall_grid = None if collision_world is None else WallGrid(collision_world)
+        self.neighbor_radius = neighbor_radius
+        self.separation_weight = separation_weight
+        self.alignment_weight = alignment_weight
+        self.avoidance_weight = avoidance_weight
+        self.probe_distance = probe_distance
+        self.agent_radius = agent_radius
+        self.spatial_hash = SpatialHash(neighbor_radius)
+        self.last_neighbor_checks = 0
+
+    def steer(
+        self,
+        positions: Sequence[Vector3],
+        desired_directions: Sequence[Vector3] | None = None,
+    ) -> list[Vector3]:
+        """Return a steering direction per position (same order)."""
+        if desired_directions is not None and len(desired_directions) != len(positions):
+            raise ValueError("desired_directions must match positions.")
+        self.spatial_hash.rebuild(positions)
+        separations = self._separation(positions)
+        steering: list[Vector3] = []
+        for index, position in enumerate(positions):
+            sep_x, sep_z = separations[index]
+            x = sep_x * self.separation_weight
+            z = sep_z * self.separation_weight
+            if desired_directions is not None:
+                desired = desired_directions[index]
+                x += desired[0] * self.alignment_weight
+                z += desired[2] * self.alignment_weight
+            if self.collision_world is not None and (abs(x) > _EPSILON or abs(z) > _EPSILON):
+                avoid_x, avoid_z = self._avoidance(position, x, z)
+                x += avoid_x * self.avoidance_weight
+                z += avoid_z * self.avoidance_weight
+            length = sqrt((x * x) + (z * z))
+            if length > 1.0:
+                x /= length
+                z /= length
+            steering.append((x, 0.0, z))
+        return steering
+
+    def _separation(self, positions: Sequence[Vector3]) -> list[tuple[float, float]]:
+        radius = self.neighbor_radius
+        radius_sq = radius * radius
+        checks = 0
+        pushes: list[tuple[float, float]] = []
+        for index, position in enumerate(positions):
+            push_x = 0.0
+            push_z = 0.0
+            px = position[0]
+            pz = position[2]
+            for other in self.spatial_hash.candidates(position):
+                if other == index:
+                    continue
+                checks += 1
+                dx = px - positions[other][0]
+                dz = pz - positions[other][2]
+                distance_sq = (dx * dx) + (dz * dz)
+                if distance_sq >= radius_sq:
+                    continue
+                if distance_sq <= _EPSILON:
+                    # Stacked spawns: each pair splits along its own fixed axis, in opposite directions.
+                    angle = (min(index, other) + (max(index, other) * _GOLDEN_ANGLE)) * _GOLDEN_ANGLE
+                    if index > other:
+                        angle += pi
+                    push_x += cos(angle)
+                    push_z += sin(angle)
+                    continue
+                distance = sqrt(distance_sq)
+                strength = 1.0 - (distance / radius)
+                push_x += (dx / distance) * strength
+                push_z += (dz / distance) * strength
+            pushes.append((push_x, push_z))
+        self.last_neighbor_checks = checks
+        return pushes
+
+    def _avoidance(self, position: Vector3, heading_x: float, heading_z: float) -> tuple[float, float]:
+        length = sqrt((heading_x * heading_x) + (heading_z * heading_z))
+        forward_x = heading_x / length
+        forward_z = heading_z / length
+        origin = (position[0], position[1] + self.agent_radius + 0.05, position[2])
+        ahead = self._clearance(origin, forward_x, forward_z)
+        if ahead >= self.probe_distance:
+            return (0.0, 0.0)
+        # Turn toward the whisker with more room, harder the closer the wall.
+        left = self._rotated(forward_x, forward_z, _WHISKER_ANGLE)
+        right = self._rotated(forward_x, forward_z, -_WHISKER_ANGLE)
+        left_room = self._clearance(origin, *left)
+        right_room = self._clearance(origin, *right)
+        side = left if left_room >= right_room else right
+        urgency = 1.0 - (ahead / self.probe_distance)
+        return ((side[0] - forward_x) * urgency, (side[1] - forward_z) * urgency)
+
+    def _clearance(self, origin: Vector3, direction_x: float, direction_z: float) -> float:
+        hit = self.wall_grid.impact_distance(
+            origin=origin,
+            direction=(direction_x, 0.0, direction_z),
+            max_distance=self.probe_distance,
+            half_extent=self.agent_radius,
+        )
+        return self.probe_distance if hit is None else hit
+
+    @staticmethod
+    def _rotated(x: float, z: float, angle: float) -> tuple[float, float]:
+        c = cos(angle)
+        s = sin(angle)
+        return ((x * c) - (z * s), (x * s) + (z * c))
@@ -0,0 +1,61 @@
+"""XZ grid over static walls so crowd queries only touch nearby geometry."""
+
+from __future__ import annotations
+
+from math import floor
+
+from src.core.collision import AABB, CollisionWorld
+
+
+Vector3 = tuple[float, float, float]
+
+
+class WallGrid:
+    """Buckets a `CollisionWorld`'s static walls by the XZ cells they overlap."""
+
+    def __init__(self, collision_world: CollisionWorld, *, cell_size: float = 4.0) -> None:
+        if cell_size <= 0.0:
+            raise ValueError("cell_size must be positive.")
+        self.collision_world = collision_world
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for wall_index, wall in enumerate(collision_world.static_walls):
+            min_cell = self._cell(wall.min_corner[0], wall.min_corner[2])
+            max_cell = self._cell(wall.max_corner[0], wall.max_corner[2])
+            for cell_x in range(min_cell[0], max_cell[0] + 1):
+                for cell_z in range(min_cell[1], max_cell[1] + 1):
+                    self._cells.setdefault((cell_x, cell_z), []).append(wall_index)
+
+    def walls_in(self, min_x: float, min_z: float, max_x: float, max_z: float) -> list[AABB]:
+        """Return walls whose cells overlap an XZ rectangle, in world order."""
+        min_cell = self._cell(min_x, min_z)
+        max_cell = self._cell(max_x, max_z)
+        seen: set[int] = set()
+        for cell_x in range(min_cell[0], max_cell[0] + 1):
+            for cell_z in range(min_cell[1], max_cell[1] + 1):
+                seen.update(self._cells.get((cell_x, cell_z), ()))
+        walls = self.collision_world.static_walls
+        return [walls[index] for index in sorted(seen)]
+
+    def impact_distance(
+        self,
+        *,
+        origin: Vector3,
+        direction: Vector3,
+        max_distance: float,
+        half_extent: float = 0.0,
+    ) -> float | None:
+        """Same result as `CollisionWorld.static_impact_distance(...)`, testing only nearby walls."""
+        reach = max_distance + half_extent
+        walls = self.walls_in(origin[0] - reach, origin[2] - reach, origin[0] + reach, origin[2] + reach)
+        nearest = self.collision_world.bounds_exit_distance(origin, direction, half_extent)
+        for wall in walls:
+            distance = wall.ray_entry_distance(origin, direction, padding=half_extent)
+            if distance is not None and distance < nearest:
+                nearest = distance
+        if nearest > max_distance:
+            return None
+        return nearest
+
+    def _cell(self, x: float, z: float) -> tuple[int, int]:
+        return (int(floor(x / self.cell_size)), int(floor(z / self.cell_size)))
@@ -1,6 +1,7 @@
-"""Environment layout and collision exports."""
+"""Environment layout, collision, and navigation exports."""
 
 from src.environment.collision import build_collision_world
+from src.environment.cover_points import CoverDatabase, CoverSpot, bake_cover_database, build_cover_database
 from src.environment.facility import (
     CoverObject,
     Doorway,
@@ -11,6 +12,7 @@ from src.environment.facility import (
     create_default_facility_layout,
 )
 from src.environment.navigation import build_waypoint_pathfinder
+from src.environment.navmesh import NavMesh, NavPolygon, NavPortal, bake_navmesh, build_navmesh
 
 __all__ = [
     "Room",
@@ -22,4 +24,13 @@ __all__ = [
     "create_default_facility_layout",
     "build_collision_world",
     "build_waypoint_pathfinder",
+    "NavMesh",
+    "NavPolygon",
+    "NavPortal",
+    "bake_navmesh",
+    "build_navmesh",
+    "CoverDatabase",
+    "CoverSpot",
+    "bake_cover_database",
+    "build_cover_database",
 ]
@@ -0,0 +1,251 @@
+"""Cover spots baked offline with per-cell visibility bitsets."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from math import floor, inf, sqrt
+
+from src.core.collision import AABB, CollisionWorld
+from src.environment.collision import build_collision_world
+from src.environment.facility import CoverObject, FacilityLayout
+
+
+Vector3 = tuple[float, float, float]
+
+_EPSILON = 1e-6
+
+
+def _distance_2d(a: Vector3, b: Vector3) -> float:
+    dx = a[0] - b[0]
+    dz = a[2] - b[2]
+    return sqrt((dx * dx) + (dz * dz))
+
+
+@dataclass(frozen=True)
+class CoverSpot:
+    """Standing point next to a cover object.
+
+    Bit `i` of `hidden_from` is set when a ray from this spot to the center of
+    navigation cell `i` hits static geometry.
+    """
+
+    spot_id: int
+    cover_id: str
+    position: Vector3
+    hidden_from: int
+
+    def is_hidden_from(self, cell_mask: int) -> bool:
+        return (self.hidden_from & cell_mask) == cell_mask
+
+
+class CoverDatabase:
+    """Baked cover spots plus the navigation cell grid their bitsets index.
+
+    Runtime cover picking needs no geometry: look up the threat cells, AND
+    their bits against each spot's `hidden_from`, and take the nearest match.
+    """
+
+    def __init__(
+        self,
+        *,
+        spots: list[CoverSpot],
+        cell_size: float,
+        origin: tuple[float, float],
+        cell_bits: dict[tuple[int, int], int],
+        cell_centers: list[Vector3],
+    ) -> None:
+        self.spots = spots
+        self.cell_size = cell_size
+        self.origin = origin
+        self.cell_centers = cell_centers
+        self._cell_bits = cell_bits
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.cell_centers)
+
+    def cell_bit(self, position: Vector3) -> int:
+        """Return the bit index of the cell under a position (nearest cell when off-grid)."""
+        grid_cell = (
+            int(floor((position[0] - self.origin[0]) / self.cell_size)),
+            int(floor((position[2] - self.origin[1]) / self.cell_size)),
+        )
+        bit = self._cell_bits.get(grid_cell)
+        if bit is not None:
+            return bit
+        if not self.cell_centers:
+            raise ValueError("Cover database has no navigation cells.")
+        return min(range(len(self.cell_centers)), key=lambda index: _distance_2d(self.cell_centers[index], position))
+
+    def threat_mask(self, threat_positions: Iterable[Vector3]) -> int:
+        mask = 0
+        for position in threat_positions:
+            mask |= 1 << self.cell_bit(position)
+        return mask
+
+    def hidden_spots(self, threat_positions: Iterable[Vector3]) -> list[CoverSpot]:
+        """Return spots hidden from every threat position."""
+        mask = self.threat_mask(threat_positions)
+        return [spot for spot in self.spots if (spot.hidden_from & mask) == mask]
+
+    def nearest_hidden_spot(
+        self,
+        *,
+        bot_position: Vector3,
+        threat_positions: Iterable[Vector3],
+        max_distance: float = inf,
+    ) -> CoverSpot | None:
+        """Return the closest spot to the bot that is hidden from every threat."""
+        mask = self.threat_mask(threat_positions)
+        chosen: CoverSpot | None = None
+        best = inf
+        for spot in self.spots:
+            if (spot.hidden_from & mask) != mask:
+                continue
+            distance = _distance_2d(bot_position, spot.position)
+            if distance <= max_distance and distance < best:
+                chosen = spot
+                best = distance
+        return chosen
+
+
+def _spot_candidates(cover: CoverObject, stand_off: float, edge_spacing: float) -> list[tuple[float, float]]:
+    min_x, _, min_z = cover.min_corner
+    max_x, _, max_z = cover.max_corner
+    diagonal = stand_off / sqrt(2.0)
+    points = [
+        (min_x - diagonal, min_z - diagonal),
+        (max_x + diagonal, min_z - diagonal),
+        (max_x + diagonal, max_z + diagonal),
+        (min_x - diagonal, max_z + diagonal),
+    ]
+    # Spread edge spots so long barriers get more than one spot per side.
+    x_steps = max(1, int((max_x - min_x) // edge_spacing))
+    z_steps = max(1, int((max_z - min_z) // edge_spacing))
+    for step in range(x_steps):
+        x = min_x + ((max_x - min_x) * (step + 0.5) / x_steps)
+        points.append((x, min_z - stand_off))
+        points.append((x, max_z + stand_off))
+    for step in range(z_steps):
+        z = min_z + ((max_z - min_z) * (step + 0.5) / z_steps)
+        points.append((min_x - stand_off, z))
+        points.append((max_x + stand_off, z))
+    return points
+
+
+def _point_blocked(world: CollisionWorld, x: float, y: float, z: float, half_extent: float) -> bool:
+    box = AABB(
+        min_corner=(x - half_extent, y, z - half_extent),
+        max_corner=(x + half_extent, y + _EPSILON, z + half_extent),
+    )
+    return world.collides_with_wall(box)
+
+
+def _ray_hidden(world: CollisionWorld, origin: Vector3, target: Vector3) -> bool:
+    dx = target[0] - origin[0]
+    dy = target[1] - origin[1]
+    dz = target[2] - origin[2]
+    length = sqrt((dx * dx) + (dy * dy) + (dz * dz))
+    if length <= _EPSILON:
+        return False
+    hit = world.static_impact_distance(
+        origin=origin,
+        direction=(dx / length, dy / length, dz / length),
+        max_distance=length,
+    )
+    return hit is not None and hit < length - _EPSILON
+
+
+def bake_cover_database(
+    layout: FacilityLayout,
+    *,
+    collision_world: CollisionWorld | None = None,
+    cell_size: float = 2.0,
+    stand_off: float = 0.9,
+    edge_spacing: float = 1.5,
+    sight_height: float = 1.0,
+    agent_radius: float = 0.35,
+) -> CoverDatabase:
+    """Generate cover spots around every cover object and ray-test their visibility.
+
+    Navigation cells are `cell_size` squares whose centers lie inside a room and
+    outside static geometry. Spots sit at cover corners and along cover edges,
+    `stand_off` away, and are dropped when an agent of `agent_radius` would not
+    fit there. Visibility rays run between `sight_height` above the floor at
+    both ends.
+    """
+    if cell_size <= 0.0 or stand_off <= 0.0 or edge_spacing <= 0.0:
+        raise ValueError("cell_size, stand_off, and edge_spacing must be positive.")
+    world = collision_world or build_collision_world(layout)
+    if not layout.rooms:
+        return CoverDatabase(spots=[], cell_size=cell_size, origin=(0.0, 0.0), cell_bits={}, cell_centers=[])
+
+    origin = (
+        min(room.min_x for room in layout.rooms.values()),
+        min(room.min_z for room in layout.rooms.values()),
+    )
+    max_x = max(room.max_x for room in layout.rooms.values())
+    max_z = max(room.max_z for room in layout.rooms.values())
+    columns = int(floor((max_x - origin[0]) / cell_size)) + 1
+    rows = int(floor((max_z - origin[1]) / cell_size)) + 1
+
+    cell_bits: dict[tuple[int, int], int] = {}
+    cell_centers: list[Vector3] = []
+    for column in range(columns):
+        for row in range(rows):
+            x = origin[0] + ((column + 0.5) * cell_size)
+            z = origin[1] + ((row + 0.5) * cell_size)
+            room_id = layout.find_room_for_position((x, 0.0, z))
+            if room_id is None:
+                continue
+            floor_y = layout.rooms[room_id].floor_y
+            if _point_blocked(world, x, floor_y + sight_height, z, 0.0):
+                continue
+            cell_bits[(column, row)] = len(cell_centers)
+            cell_centers.append((x, floor_y + sight_height, z))
+
+    spots: list[CoverSpot] = []
+    for cover in layout.cover_objects:
+        for x, z in _spot_candidates(cover, stand_off, edge_spacing):
+            room_id = layout.find_room_for_position((x, 0.0, z))
+            if room_id is None:
+                continue
+            floor_y = layout.rooms[room_id].floor_y
+            if _point_blocked(world, x, floor_y, z, agent_radius):
+                continue
+            eye = (x, floor_y + sight_height, z)
+            hidden_from = 0
+            for bit, center in enumerate(cell_centers):
+                if _ray_hidden(world, eye, center):
+                    hidden_from |= 1 << bit
+            spots.append(
+                CoverSpot(
+                    spot_id=len(spots),
+                    cover_id=cover.cover_id,
+                    position=(x, floor_y, z),
+                    hidden_from=hidden_from,
+                )
+            )
+    return CoverDatabase(
+        spots=spots,
+        cell_size=cell_size,
+        origin=origin,
+        cell_bits=cell_bits,
+        cell_centers=cell_centers,
+    )
+
+
+def build_cover_database(
+    layout: FacilityLayout,
+    *,
+    cell_size: float = 2.0,
+    stand_off: float = 0.9,
+) -> CoverDatabase:
+    """Return the layout's baked cover database, baking it on first use per setting."""
+    key = (cell_size, stand_off)
+    cached = layout.cover_cache.get(key)
+    if cached is None:
+        cached = bake_cover_database(layout, cell_size=cell_size, stand_off=stand_off)
+        layout.cover_cache[key] = cached
+    return cached
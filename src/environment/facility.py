@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from math import sqrt
 from typing import Literal
 
@@ -102,6 +102,10 @@ class FacilityLayout:
     spawn_points: list[SpawnPoint]
     lighting: LightingSetup
     wall_height: float = 3.0
+    # Baked navmeshes keyed by (agent radius, wall thickness) (see `environment.navmesh.build_navmesh`).
+    navmesh_cache: dict = field(default_factory=dict, init=False, compare=False, repr=False)
+    # Baked cover point databases keyed by bake settings (see `environment.cover_points.build_cover_database`).
+    cover_cache: dict = field(default_factory=dict, init=False, compare=False, repr=False)
 
     def room_ids(self) -> set[str]:
         return set(self.rooms.keys())
@@ -2,19 +2,31 @@
 
 from __future__ import annotations
 
-from src.ai.navigation import WaypointPathfinder
+from src.ai.navigation import PathStrategy, WaypointPathfinder
 from src.environment.facility import FacilityLayout
 
 
-def build_waypoint_pathfinder(layout: FacilityLayout) -> WaypointPathfinder:
-    """Create a validated waypoint pathfinder from facility data."""
+def build_waypoint_pathfinder(
+    layout: FacilityLayout,
+    *,
+    precompute_next_hops: bool = True,
+) -> WaypointPathfinder:
+    """Create a validated waypoint pathfinder from facility data.
+
+    By default the all-pairs next-hop table is baked here, so runtime path
+    queries are table walks instead of searches.
+    """
     for node_id, neighbors in layout.waypoint_links.items():
         if node_id not in layout.waypoints:
             raise ValueError(f"Waypoint link source '{node_id}' is undefined.")
         for neighbor in neighbors:
             if neighbor not in layout.waypoints:
                 raise ValueError(f"Waypoint link target '{neighbor}' is undefined.")
-    return WaypointPathfinder(
+    pathfinder = WaypointPathfinder(
         waypoints=dict(layout.waypoints),
         links={node_id: list(neighbors) for node_id, neighbors in layout.waypoint_links.items()},
     )
+    if precompute_next_hops:
+        pathfinder.build_next_hop_table()
+        pathfinder.strategy = PathStrategy.NEXT_HOP_TABLE
+    return pathfinder
@@ -0,0 +1,392 @@
+"""Navigation mesh baked from facility rooms, doorways, and blocking cover."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from math import sqrt
+
+from src.environment.facility import FacilityLayout
+
+
+Vector3 = tuple[float, float, float]
+Point2 = tuple[float, float]
+
+_EPSILON = 1e-6
+
+
+def _distance_2d(a: Point2, b: Point2) -> float:
+    dx = a[0] - b[0]
+    dz = a[1] - b[1]
+    return sqrt((dx * dx) + (dz * dz))
+
+
+def _triarea2(a: Point2, b: Point2, c: Point2) -> float:
+    ax = b[0] - a[0]
+    az = b[1] - a[1]
+    bx = c[0] - a[0]
+    bz = c[1] - a[1]
+    return (bx * az) - (ax * bz)
+
+
+@dataclass(frozen=True)
+class NavPolygon:
+    """Convex walkable rectangle on the XZ plane.
+
+    `area_id` is the owning room id, or the doorway id for the small bridge
+    polygons that cross a doorway's wall.
+    """
+
+    polygon_id: int
+    area_id: str
+    min_x: float
+    max_x: float
+    min_z: float
+    max_z: float
+    floor_y: float = 0.0
+
+    @property
+    def center(self) -> Point2:
+        return ((self.min_x + self.max_x) * 0.5, (self.min_z + self.max_z) * 0.5)
+
+    def contains(self, point: Point2) -> bool:
+        return (
+            self.min_x - _EPSILON <= point[0] <= self.max_x + _EPSILON
+            and self.min_z - _EPSILON <= point[1] <= self.max_z + _EPSILON
+        )
+
+    def clamp(self, point: Point2) -> Point2:
+        return (
+            min(max(point[0], self.min_x), self.max_x),
+            min(max(point[1], self.min_z), self.max_z),
+        )
+
+
+@dataclass(frozen=True)
+class NavPortal:
+    """Shared edge between two neighbouring polygons."""
+
+    from_polygon: int
+    to_polygon: int
+    start: Point2
+    end: Point2
+
+    @property
+    def midpoint(self) -> Point2:
+        return ((self.start[0] + self.end[0]) * 0.5, (self.start[1] + self.end[1]) * 0.5)
+
+
+class NavMesh:
+    """Polygon graph with A* corridor search and funnel string pulling."""
+
+    def __init__(self, *, polygons: list[NavPolygon], agent_radius: float) -> None:
+        self.polygons = polygons
+        self.agent_radius = agent_radius
+        self.portals: dict[int, list[NavPortal]] = {polygon.polygon_id: [] for polygon in polygons}
+        self.last_search_expansions = 0
+        self._link_polygons()
+
+    def polygon_at(self, position: Vector3) -> int | None:
+        """Return the polygon containing a world position, if any."""
+        point = (position[0], position[2])
+        for polygon in self.polygons:
+            if polygon.contains(point):
+                return polygon.polygon_id
+        return None
+
+    def snap(self, position: Vector3, *, allowed_areas: set[str] | None = None) -> tuple[int, Point2]:
+        """Return the containing (or nearest) polygon and the position clamped onto it.
+
+        `allowed_areas` limits candidates to polygons whose `area_id` is listed.
+        """
+        point = (position[0], position[2])
+        best_id = -1
+        best_point = point
+        best_distance = float("inf")
+        for polygon in self.polygons:
+            if allowed_areas is not None and polygon.area_id not in allowed_areas:
+                continue
+            clamped = polygon.clamp(point)
+            distance = _distance_2d(point, clamped)
+            if distance < best_distance:
+                best_id = polygon.polygon_id
+                best_point = clamped
+                best_distance = distance
+                if distance <= _EPSILON:
+                    break
+        if best_id < 0:
+            raise ValueError("Navmesh has no walkable polygons in the requested areas.")
+        return best_id, best_point
+
+    def find_corridor(
+        self,
+        start: Point2,
+        start_id: int,
+        goal: Point2,
+        goal_id: int,
+        *,
+        allowed_areas: set[str] | None = None,
+    ) -> list[NavPortal]:
+        """Return the portals crossed on the A* polygon corridor, or `[]` when unreachable.
+
+        `allowed_areas` keeps the search inside polygons of the listed rooms/doorways.
+        `last_search_expansions` records how many polygons were expanded.
+        """
+        self.last_search_expansions = 0
+        if start_id == goal_id:
+            return []
+        came_from: dict[int, NavPortal] = {}
+        entry: dict[int, Point2] = {start_id: start}
+        best: dict[int, float] = {start_id: 0.0}
+        frontier: list[tuple[float, float, int]] = [(_distance_2d(start, goal), 0.0, start_id)]
+        closed: set[int] = set()
+        while frontier:
+            _, cost, current = heappop(frontier)
+            if current == goal_id:
+                corridor: list[NavPortal] = []
+                while current != start_id:
+                    portal = came_from[current]
+                    corridor.append(portal)
+                    current = portal.from_polygon
+                corridor.reverse()
+                return corridor
+            if current in closed:
+                continue
+            closed.add(current)
+            self.last_search_expansions += 1
+            for portal in self.portals[current]:
+                neighbor = portal.to_polygon
+                if allowed_areas is not None and self.polygons[neighbor].area_id not in allowed_areas:
+                    continue
+                crossing = portal.midpoint
+                next_cost = cost + _distance_2d(entry[current], crossing)
+                if next_cost >= best.get(neighbor, float("inf")):
+                    continue
+                best[neighbor] = next_cost
+                entry[neighbor] = crossing
+                came_from[neighbor] = portal
+                heappush(frontier, (next_cost + _distance_2d(crossing, goal), next_cost, neighbor))
+        return []
+
+    def find_path(
+        self,
+        start_position: Vector3,
+        goal_position: Vector3,
+        *,
+        allowed_areas: set[str] | None = None,
+    ) -> list[Vector3]:
+        """Return a string-pulled corner path, or `[]` when the goal is unreachable.
+
+        Positions off the mesh (or outside `allowed_areas`) are clamped to the
+        nearest allowed polygon.
+        """
+        start_id, start = self.snap(start_position, allowed_areas=allowed_areas)
+        goal_id, goal = self.snap(goal_position, allowed_areas=allowed_areas)
+        floor_y = self.polygons[start_id].floor_y
+        if start_id == goal_id:
+            self.last_search_expansions = 0
+            return [(start[0], floor_y, start[1]), (goal[0], floor_y, goal[1])]
+        corridor = self.find_corridor(start, start_id, goal, goal_id, allowed_areas=allowed_areas)
+        if not corridor:
+            return []
+        corners = self._string_pull(start, goal, corridor)
+        return [(corner[0], floor_y, corner[1]) for corner in corners]
+
+    def _string_pull(self, start: Point2, goal: Point2, corridor: list[NavPortal]) -> list[Point2]:
+        # Simple stupid funnel algorithm (Mononen) over (left, right) portal pairs.
+        portals: list[tuple[Point2, Point2]] = [(start, start)]
+        for portal in corridor:
+            portals.append(self._orient(portal))
+        portals.append((goal, goal))
+
+        apex = portal_left = portal_right = start
+        apex_index = left_index = right_index = 0
+        corners: list[Point2] = [start]
+        index = 1
+        while index < len(portals):
+            left, right = portals[index]
+            if _triarea2(apex, portal_right, right) <= 0.0:
+                if apex == portal_right or _triarea2(apex, portal_left, right) > 0.0:
+                    portal_right = right
+                    right_index = index
+                else:
+                    corners.append(portal_left)
+                    apex = portal_right = portal_left
+                    apex_index = right_index = left_index
+                    index = apex_index + 1
+                    continue
+            if _triarea2(apex, portal_left, left) >= 0.0:
+                if apex == portal_left or _triarea2(apex, portal_right, left) < 0.0:
+                    portal_left = left
+                    left_index = index
+                else:
+                    corners.append(portal_right)
+                    apex = portal_left = portal_right
+                    apex_index = left_index = right_index
+                    index = apex_index + 1
+                    continue
+            index += 1
+        if corners[-1] != goal:
+            corners.append(goal)
+        return corners
+
+    def _orient(self, portal: NavPortal) -> tuple[Point2, Point2]:
+        # Travel crosses the portal along its normal, out of the source polygon.
+        center = self.polygons[portal.from_polygon].center
+        middle = portal.midpoint
+        if abs(portal.start[0] - portal.end[0]) <= _EPSILON:
+            step = (1.0 if middle[0] > center[0] else -1.0, 0.0)
+        else:
+            step = (0.0, 1.0 if middle[1] > center[1] else -1.0)
+        origin = (middle[0] - step[0], middle[1] - step[1])
+        toward = (middle[0] + step[0], middle[1] + step[1])
+        # `_triarea2` is negative for points left of the travel direction (the funnel's convention).
+        if _triarea2(origin, toward, portal.start) < 0.0:
+            return portal.start, portal.end
+        return portal.end, portal.start
+
+    def _link_polygons(self) -> None:
+        polygons = self.polygons
+        for index, a in enumerate(polygons):
+            for b in polygons[index + 1 :]:
+                edge = _shared_edge(a, b)
+                if edge is None:
+                    continue
+                self.portals[a.polygon_id].append(NavPortal(a.polygon_id, b.polygon_id, edge[0], edge[1]))
+                self.portals[b.polygon_id].append(NavPortal(b.polygon_id, a.polygon_id, edge[0], edge[1]))
+
+
+def _shared_edge(a: NavPolygon, b: NavPolygon) -> tuple[Point2, Point2] | None:
+    for a_edge, b_edge in ((a.max_x, b.min_x), (a.min_x, b.max_x)):
+        if abs(a_edge - b_edge) <= _EPSILON:
+            low = max(a.min_z, b.min_z)
+            high = min(a.max_z, b.max_z)
+            if high - low > _EPSILON:
+                return (a_edge, low), (a_edge, high)
+    for a_edge, b_edge in ((a.max_z, b.min_z), (a.min_z, b.max_z)):
+        if abs(a_edge - b_edge) <= _EPSILON:
+            low = max(a.min_x, b.min_x)
+            high = min(a.max_x, b.max_x)
+            if high - low > _EPSILON:
+                return (low, a_edge), (high, a_edge)
+    return None
+
+
+def _free_rectangles(
+    bounds: tuple[float, float, float, float],
+    obstacles: list[tuple[float, float, float, float]],
+) -> list[tuple[float, float, float, float]]:
+    """Split `bounds` minus obstacle rectangles into merged free rectangles."""
+    min_x, max_x, min_z, max_z = bounds
+    clipped = [
+        (max(o[0], min_x), min(o[1], max_x), max(o[2], min_z), min(o[3], max_z))
+        for o in obstacles
+        if o[1] > min_x and o[0] < max_x and o[3] > min_z and o[2] < max_z
+    ]
+    xs = sorted({min_x, max_x, *(o[0] for o in clipped), *(o[1] for o in clipped)})
+    zs = sorted({min_z, max_z, *(o[2] for o in clipped), *(o[3] for o in clipped)})
+
+    def is_free(x: float, z: float) -> bool:
+        return not any(o[0] < x < o[1] and o[2] < z < o[3] for o in clipped)
+
+    # Merge free cells into horizontal runs per z strip, then stack identical runs.
+    rectangles: list[tuple[float, float, float, float]] = []
+    open_runs: dict[tuple[float, float], float] = {}
+    for row in range(len(zs) - 1):
+        z0, z1 = zs[row], zs[row + 1]
+        z_mid = (z0 + z1) * 0.5
+        runs: list[tuple[float, float]] = []
+        run_start: float | None = None
+        for column in range(len(xs) - 1):
+            x0, x1 = xs[column], xs[column + 1]
+            if is_free((x0 + x1) * 0.5, z_mid):
+                if run_start is None:
+                    run_start = x0
+            elif run_start is not None:
+                runs.append((run_start, x0))
+                run_start = None
+        if run_start is not None:
+            runs.append((run_start, xs[-1]))
+        next_open: dict[tuple[float, float], float] = {}
+        for run in runs:
+            next_open[run] = open_runs.pop(run, z0)
+        for run, started in open_runs.items():
+            rectangles.append((run[0], run[1], started, z0))
+        open_runs = next_open
+    for run, started in open_runs.items():
+        rectangles.append((run[0], run[1], started, zs[-1]))
+    return rectangles
+
+
+def bake_navmesh(
+    layout: FacilityLayout,
+    *,
+    agent_radius: float = 0.35,
+    wall_thickness: float = 0.4,
+) -> NavMesh:
+    """Build a navmesh from room rectangles, doorway openings, and blocking cover.
+
+    Rooms shrink by `agent_radius` plus half of `wall_thickness` (matching the
+    wall boxes of `build_collision_world(...)`) and cover grows by `agent_radius`,
+    so any point on the mesh is a valid agent center. Each doorway adds a bridge
+    rectangle across its wall joining the two room meshes.
+    """
+    if agent_radius <= 0.0:
+        # Rooms share wall lines, so a zero radius would join them along the whole wall.
+        raise ValueError("agent_radius must be positive.")
+    if wall_thickness < 0.0:
+        raise ValueError("wall_thickness must be non-negative.")
+    wall_inset = agent_radius + (wall_thickness * 0.5)
+    obstacles = [
+        (
+            cover.min_corner[0] - agent_radius,
+            cover.max_corner[0] + agent_radius,
+            cover.min_corner[2] - agent_radius,
+            cover.max_corner[2] + agent_radius,
+        )
+        for cover in layout.cover_objects
+        if cover.blocks_movement
+    ]
+    polygons: list[NavPolygon] = []
+    for room in layout.rooms.values():
+        bounds = (
+            room.min_x + wall_inset,
+            room.max_x - wall_inset,
+            room.min_z + wall_inset,
+            room.max_z - wall_inset,
+        )
+        if bounds[1] <= bounds[0] or bounds[3] <= bounds[2]:
+            continue
+        for min_x, max_x, min_z, max_z in _free_rectangles(bounds, obstacles):
+            polygons.append(
+                NavPolygon(len(polygons), room.room_id, min_x, max_x, min_z, max_z, room.floor_y)
+            )
+    for doorway in layout.doorways:
+        span_min = doorway.span_min + agent_radius
+        span_max = doorway.span_max - agent_radius
+        if span_max - span_min <= _EPSILON:
+            continue
+        floor_y = layout.rooms[doorway.room_a].floor_y
+        wall_min = doorway.wall_value - wall_inset
+        wall_max = doorway.wall_value + wall_inset
+        if doorway.wall_axis == "x":
+            bridge = (wall_min, wall_max, span_min, span_max)
+        else:
+            bridge = (span_min, span_max, wall_min, wall_max)
+        polygons.append(NavPolygon(len(polygons), doorway.doorway_id, *bridge, floor_y))
+    return NavMesh(polygons=polygons, agent_radius=agent_radius)
+
+
+def build_navmesh(
+    layout: FacilityLayout,
+    *,
+    agent_radius: float = 0.35,
+    wall_thickness: float = 0.4,
+) -> NavMesh:
+    """Return the layout's baked navmesh, baking it on first use per agent radius and wall thickness."""
+    key = (agent_radius, wall_thickness)
+    cached = layout.navmesh_cache.get(key)
+    if cached is None:
+        cached = bake_navmesh(layout, agent_radius=agent_radius, wall_thickness=wall_thickness)
+        layout.navmesh_cache[key] = cached
+    return cached
@@ -0,0 +1,16 @@
+"""Shared and scalable path planning built on the facility navigation data."""
+
+from src.pathfinding.flow_field import FlowField
+from src.pathfinding.incremental import DStarLitePlanner
+from src.pathfinding.hierarchical import HierarchicalPath, HierarchicalPlanner
+from src.pathfinding.requests import PathRequest, PathRequestService, PathRequestStatus
+
+__all__ = [
+    "FlowField",
+    "HierarchicalPlanner",
+    "HierarchicalPath",
+    "PathRequestService",
+    "PathRequest",
+    "PathRequestStatus",
+    "DStarLitePlanner",
+]
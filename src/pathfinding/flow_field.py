@@ -0,0 +1,243 @@
+"""Shared grid flow field that steers every chasing bot toward one goal."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from heapq import heappop, heappush
+from math import floor, inf, sqrt
+
+from src.ai.bot import Bot, BotAIState
+from src.environment.facility import FacilityLayout
+from src.environment.navmesh import NavMesh, build_navmesh
+
+
+Vector3 = tuple[float, float, float]
+
+_DIAGONAL_COST = sqrt(2.0)
+_ZERO: Vector3 = (0.0, 0.0, 0.0)
+
+
+def _normalize_flat(dx: float, dz: float) -> Vector3:
+    length = sqrt((dx * dx) + (dz * dz))
+    if length <= 1e-9:
+        return _ZERO
+    return (dx / length, 0.0, dz / length)
+
+
+class FlowField:
+    """Grid of per-cell steering directions toward a single goal (the player).
+
+    Walkable cells are those whose centers lie on the baked navmesh; two cells
+    connect when the midpoint between them is walkable too, so walls are only
+    crossed at doorways and diagonal moves never cut corners. `update(...)`
+    runs one Dijkstra wave from the goal cell and is skipped while the goal
+    stays inside the same cell, so bots only pay for an O(1) lookup.
+    """
+
+    def __init__(self, *, navmesh: NavMesh, cell_size: float = 1.0) -> None:
+        if cell_size <= 0.0:
+            raise ValueError("cell_size must be positive.")
+        if not navmesh.polygons:
+            raise ValueError("Navmesh has no walkable polygons.")
+        self.navmesh = navmesh
+        self.cell_size = cell_size
+        self.origin_x = min(polygon.min_x for polygon in navmesh.polygons)
+        self.origin_z = min(polygon.min_z for polygon in navmesh.polygons)
+        max_x = max(polygon.max_x for polygon in navmesh.polygons)
+        max_z = max(polygon.max_z for polygon in navmesh.polygons)
+        self.columns = max(1, int(floor((max_x - self.origin_x) / cell_size)) + 1)
+        self.rows = max(1, int(floor((max_z - self.origin_z) / cell_size)) + 1)
+
+        cell_count = self.columns * self.rows
+        self.walkable = bytearray(
+            1 if navmesh.polygon_at(self.cell_center(index)) is not None else 0
+            for index in range(cell_count)
+        )
+        self.costs = array("d", [inf]) * cell_count
+        self.direction_x = array("d", [0.0]) * cell_count
+        self.direction_z = array("d", [0.0]) * cell_count
+        self._neighbors: list[list[tuple[int, float]]] = [self._link_cell(index) for index in range(cell_count)]
+        self.goal_cell: int | None = None
+        self.goal_position: Vector3 | None = None
+        self.rebuild_count = 0
+
+    @classmethod
+    def from_layout(
+        cls,
+        layout: FacilityLayout,
+        *,
+        cell_size: float = 1.0,
+        agent_radius: float = 0.35,
+    ) -> "FlowField":
+        """Build a flow field over the layout's cached navmesh."""
+        return cls(navmesh=build_navmesh(layout, agent_radius=agent_radius), cell_size=cell_size)
+
+    def cell_center(self, index: int) -> Vector3:
+        row, column = divmod(index, self.columns)
+        return (
+            self.origin_x + ((column + 0.5) * self.cell_size),
+            0.0,
+            self.origin_z + ((row + 0.5) * self.cell_size),
+        )
+
+    def cell_index(self, position: Vector3) -> int | None:
+        """Return the walkable cell under a position, or None when off the field."""
+        column = int(floor((position[0] - self.origin_x) / self.cell_size))
+        row = int(floor((position[2] - self.origin_z) / self.cell_size))
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        index = (row * self.columns) + column
+        return index if self.walkable[index] else None
+
+    def update(self, goal_position: Vector3) -> bool:
+        """Retarget the field on `goal_position`; returns True when it was rebuilt."""
+        goal_cell = self.cell_index(goal_position)
+        if goal_cell is None:
+            _, snapped = self.navmesh.snap(goal_position)
+            goal_cell = self.cell_index((snapped[0], goal_position[1], snapped[1]))
+        self.goal_position = goal_position
+        if goal_cell is None:
+            raise ValueError("Goal position is not on any walkable flow-field cell.")
+        if goal_cell == self.goal_cell:
+            return False
+        self.goal_cell = goal_cell
+        self._integrate(goal_cell)
+        self.rebuild_count += 1
+        return True
+
+    def distance_at(self, position: Vector3) -> float:
+        """Return path distance from a position's cell to the goal cell (inf when unreachable)."""
+        index = self.cell_index(position)
+        if index is None:
+            index = self._nearest_reachable_cell(position)
+        return inf if index is None else self.costs[index]
+
+    def direction_at(self, position: Vector3) -> Vector3:
+        """Return the unit steering direction for a position.
+
+        Inside the goal cell the direction points straight at the goal. Positions
+        whose own cell center is off the navmesh (typically near walls) steer
+        toward the best reachable neighbour cell. Positions more than one cell
+        off the navmesh, or with no reachable neighbour, get a zero vector.
+        """
+        if self.goal_position is None:
+            return _ZERO
+        index = self.cell_index(position)
+        if index is None:
+            index = self._nearest_reachable_cell(position)
+            if index is None:
+                return _ZERO
+            if index != self.goal_cell:
+                target = self.cell_center(index)
+                return _normalize_flat(target[0] - position[0], target[2] - position[2])
+        if index == self.goal_cell:
+            return _normalize_flat(
+                self.goal_position[0] - position[0],
+                self.goal_position[2] - position[2],
+            )
+        return (self.direction_x[index], 0.0, self.direction_z[index])
+
+    def directions_for(self, positions: Iterable[Vector3]) -> list[Vector3]:
+        return [self.direction_at(position) for position in positions]
+
+    def chase_directions(self, bots: Iterable[Bot]) -> dict[str, Vector3]:
+        """Return steering directions for every living bot in the `chasing` state."""
+        return {
+            bot.bot_id: self.direction_at(bot.position)
+            for bot in bots
+            if bot.is_alive and bot.ai_state == BotAIState.CHASING
+        }
+
+    def _nearest_reachable_cell(self, position: Vector3) -> int | None:
+        """Pick the cell to steer into from a position whose own cell is not walkable.
+
+        Off-mesh positions within one cell of the navmesh are snapped onto it
+        first. Candidates are the snapped cell and its 8 neighbours with a finite
+        cost whose midpoint toward the snapped point is on the navmesh, so the
+        hop never crosses a wall. The lowest cost plus hop length wins.
+        """
+        if self.navmesh.polygon_at(position) is None:
+            _, snapped = self.navmesh.snap(position)
+            if sqrt(((snapped[0] - position[0]) ** 2) + ((snapped[1] - position[2]) ** 2)) > self.cell_size:
+                return None
+            position = (snapped[0], position[1], snapped[1])
+        column = int(floor((position[0] - self.origin_x) / self.cell_size))
+        row = int(floor((position[2] - self.origin_z) / self.cell_size))
+        best: int | None = None
+        best_cost = inf
+        for d_row in (-1, 0, 1):
+            for d_column in (-1, 0, 1):
+                neighbor = self._offset(row + d_row, column + d_column)
+                if neighbor is None or self.costs[neighbor] == inf:
+                    continue
+                center = self.cell_center(neighbor)
+                dx = center[0] - position[0]
+                dz = center[2] - position[2]
+                midpoint = (position[0] + (dx * 0.5), 0.0, position[2] + (dz * 0.5))
+                if self.navmesh.polygon_at(midpoint) is None:
+                    continue
+                cost = self.costs[neighbor] + sqrt((dx * dx) + (dz * dz))
+                if cost < best_cost:
+                    best = neighbor
+                    best_cost = cost
+        return best
+
+    def _link_cell(self, index: int) -> list[tuple[int, float]]:
+        if not self.walkable[index]:
+            return []
+        row, column = divmod(index, self.columns)
+        center = self.cell_center(index)
+        half = self.cell_size * 0.5
+        links: list[tuple[int, float]] = []
+        orthogonal: dict[tuple[int, int], bool] = {}
+        for d_row, d_column in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            neighbor = self._offset(row + d_row, column + d_column)
+            midpoint = (center[0] + (d_column * half), 0.0, center[2] + (d_row * half))
+            connected = neighbor is not None and self.navmesh.polygon_at(midpoint) is not None
+            orthogonal[(d_row, d_column)] = connected
+            if connected:
+                links.append((neighbor, 1.0))
+        for d_row, d_column in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+            neighbor = self._offset(row + d_row, column + d_column)
+            if neighbor is None or not (orthogonal[(d_row, 0)] and orthogonal[(0, d_column)]):
+                continue
+            links.append((neighbor, _DIAGONAL_COST))
+        return links
+
+    def _offset(self, row: int, column: int) -> int | None:
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        index = (row * self.columns) + column
+        return index if self.walkable[index] else None
+
+    def _integrate(self, goal_cell: int) -> None:
+        costs = self.costs
+        neighbors = self._neighbors
+        for index in range(len(costs)):
+            costs[index] = inf
+        costs[goal_cell] = 0.0
+        frontier: list[tuple[float, int]] = [(0.0, goal_cell)]
+        while frontier:
+            cost, index = heappop(frontier)
+            if cost > costs[index]:
+                continue
+            for neighbor, step in neighbors[index]:
+                next_cost = cost + (step * self.cell_size)
+                if next_cost < costs[neighbor]:
+                    costs[neighbor] = next_cost
+                    heappush(frontier, (next_cost, neighbor))
+
+        direction_x = self.direction_x
+        direction_z = self.direction_z
+        for index, cost in enumerate(costs):
+            direction_x[index] = 0.0
+            direction_z[index] = 0.0
+            if cost == inf or index == goal_cell:
+                continue
+            best_neighbor = min(neighbors[index], key=lambda link: costs[link[0]])[0]
+            here = self.cell_center(index)
+            there = self.cell_center(best_neighbor)
+            direction = _normalize_flat(there[0] - here[0], there[2] - here[2])
+            direction_x[index] = direction[0]
+            direction_z[index] = direction[2]
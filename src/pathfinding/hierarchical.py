@@ -0,0 +1,272 @@
+"""Two-level path planning: doorway graph first, then per-room navmesh refinement."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from math import sqrt
+
+from src.environment.facility import Doorway, FacilityLayout
+from src.environment.navmesh import NavMesh, build_navmesh
+
+
+Vector3 = tuple[float, float, float]
+
+_START = "__start__"
+_GOAL = "__goal__"
+
+
+def _distance_2d(a: Vector3, b: Vector3) -> float:
+    dx = a[0] - b[0]
+    dz = a[2] - b[2]
+    return sqrt((dx * dx) + (dz * dz))
+
+
+def _doorway_point(doorway: Doorway, floor_y: float) -> Vector3:
+    if doorway.wall_axis == "x":
+        return (doorway.wall_value, floor_y, doorway.center)
+    return (doorway.center, floor_y, doorway.wall_value)
+
+
+class HierarchicalPath:
+    """Room corridor from the abstract search, refined one room leg at a time.
+
+    Leg `i` runs inside `rooms[i]` from the previous doorway (or the start) to
+    `doorways[i]` (or the goal). Legs are refined on first access, so a bot only
+    pays for the rooms it actually reaches. The room search assumes rooms are
+    connected inside; when a leg cannot be refined (for example, cover splits
+    the room), `blocked_leg` records it, the planner stops using that room
+    transit, and `full_path()` returns `[]`.
+    """
+
+    def __init__(
+        self,
+        *,
+        planner: "HierarchicalPlanner",
+        start: Vector3,
+        goal: Vector3,
+        rooms: tuple[str, ...],
+        doorways: tuple[str, ...],
+    ) -> None:
+        self._planner = planner
+        self.start = start
+        self.goal = goal
+        self.rooms = rooms
+        self.doorways = doorways
+        self.current_leg = 0
+        self.blocked_leg: int | None = None
+        self._legs: dict[int, tuple[Vector3, ...]] = {}
+
+    @property
+    def leg_count(self) -> int:
+        return len(self.rooms)
+
+    @property
+    def refined_leg_count(self) -> int:
+        return len(self._legs)
+
+    def leg(self, index: int) -> tuple[Vector3, ...]:
+        """Return the corner points of one room leg, refining it on first use."""
+        if not 0 <= index < len(self.rooms):
+            raise ValueError(f"Leg index {index} is out of range.")
+        if index not in self._legs:
+            entry = self.start if index == 0 else self._planner.doorway_point(self.doorways[index - 1])
+            exit_ = self.goal if index == len(self.rooms) - 1 else self._planner.doorway_point(self.doorways[index])
+            areas = {self.rooms[index]}
+            if index > 0:
+                areas.add(self.doorways[index - 1])
+            if index < len(self.doorways):
+                areas.add(self.doorways[index])
+            corners = tuple(self._planner.navmesh.find_path(entry, exit_, allowed_areas=areas))
+            self._legs[index] = corners
+            if not corners:
+                if self.blocked_leg is None or index < self.blocked_leg:
+                    self.blocked_leg = index
+                self._planner.block_transit(*self.transit(index))
+        return self._legs[index]
+
+    def transit(self, index: int) -> tuple[str, str, str]:
+        """Return `(room_id, entry_node, exit_node)` for a leg, naming the ends by doorway id."""
+        entry = _START if index == 0 else self.doorways[index - 1]
+        exit_ = _GOAL if index == len(self.rooms) - 1 else self.doorways[index]
+        return (self.rooms[index], entry, exit_)
+
+    def advance(self) -> tuple[Vector3, ...]:
+        """Return the next unconsumed leg (refining it) or `()` when finished or blocked.
+
+        Check `blocked_leg` after an empty result and replan from the bot's position.
+        """
+        if self.current_leg >= len(self.rooms):
+            return ()
+        corners = self.leg(self.current_leg)
+        self.current_leg += 1
+        return corners
+
+    def full_path(self) -> list[Vector3]:
+        """Refine every leg and join them into one corner path."""
+        path: list[Vector3] = []
+        for index in range(len(self.rooms)):
+            corners = self.leg(index)
+            if not corners:
+                return []
+            path.extend(corners[1:] if path else corners)
+        return path
+
+
+class HierarchicalPlanner:
+    """Searches the small doorway graph, then refines only the rooms on the corridor.
+
+    Abstract nodes are doorways; two doorways connect when they open into the
+    same room, weighted by the straight distance between their centers. Search
+    cost therefore follows the number of rooms and doorways, and per-room
+    refinement touches only navmesh polygons inside that room. Doorway-to-doorway
+    transits that fail to refine are remembered and skipped by later searches.
+    """
+
+    def __init__(self, *, layout: FacilityLayout, navmesh: NavMesh | None = None) -> None:
+        self.layout = layout
+        self.navmesh = navmesh or build_navmesh(layout)
+        self._doorways: dict[str, Doorway] = {doorway.doorway_id: doorway for doorway in layout.doorways}
+        self._room_doorways: dict[str, list[str]] = {room_id: [] for room_id in layout.rooms}
+        for doorway in layout.doorways:
+            self._room_doorways[doorway.room_a].append(doorway.doorway_id)
+            self._room_doorways[doorway.room_b].append(doorway.doorway_id)
+        self._blocked_transits: set[tuple[str, str, str]] = set()
+        self.last_abstract_expansions = 0
+        self.last_replans = 0
+
+    def doorway_point(self, doorway_id: str) -> Vector3:
+        doorway = self._doorways[doorway_id]
+        return _doorway_point(doorway, self.layout.rooms[doorway.room_a].floor_y)
+
+    def block_transit(self, room_id: str, entry_node: str, exit_node: str) -> None:
+        """Stop routing through a room between two doorways (both directions).
+
+        Transits that start or end at a query's start/goal position are skipped,
+        because they only hold for that query.
+        """
+        if entry_node in self._doorways and exit_node in self._doorways:
+            self._blocked_transits.add((room_id, entry_node, exit_node))
+            self._blocked_transits.add((room_id, exit_node, entry_node))
+
+    def is_transit_blocked(self, room_id: str, entry_node: str, exit_node: str) -> bool:
+        return (room_id, entry_node, exit_node) in self._blocked_transits
+
+    def room_for(self, position: Vector3) -> str:
+        """Return the room under a position, snapping onto the navmesh when outside rooms."""
+        room_id = self.layout.find_room_for_position(position)
+        if room_id is not None:
+            return room_id
+        polygon_id, _ = self.navmesh.snap(position)
+        area_id = self.navmesh.polygons[polygon_id].area_id
+        if area_id in self._doorways:
+            return self._doorways[area_id].room_a
+        return area_id
+
+    def plan(
+        self,
+        start_position: Vector3,
+        goal_position: Vector3,
+        *,
+        avoid: set[tuple[str, str, str]] | None = None,
+    ) -> HierarchicalPath | None:
+        """Return a lazily refined path, or None when no doorway route exists.
+
+        `avoid` adds `(room_id, entry_node, exit_node)` transits (see
+        `HierarchicalPath.transit(...)`) to skip for this query only.
+        """
+        start_room = self.room_for(start_position)
+        goal_room = self.room_for(goal_position)
+        route = self._search_rooms(start_position, start_room, goal_position, goal_room, avoid or set())
+        if route is None:
+            return None
+        rooms, doorways = route
+        return HierarchicalPath(
+            planner=self,
+            start=start_position,
+            goal=goal_position,
+            rooms=rooms,
+            doorways=doorways,
+        )
+
+    def find_path(self, start_position: Vector3, goal_position: Vector3) -> list[Vector3]:
+        """Plan and fully refine a path, replanning around unusable legs; `[]` when unreachable."""
+        avoid: set[tuple[str, str, str]] = set()
+        self.last_replans = 0
+        while True:
+            path = self.plan(start_position, goal_position, avoid=avoid)
+            if path is None:
+                return []
+            corners = path.full_path()
+            if corners:
+                return corners
+            avoid.add(path.transit(path.blocked_leg))
+            self.last_replans += 1
+
+    def _search_rooms(
+        self,
+        start_position: Vector3,
+        start_room: str,
+        goal_position: Vector3,
+        goal_room: str,
+        avoid: set[tuple[str, str, str]],
+    ) -> tuple[tuple[str, ...], tuple[str, ...]] | None:
+        self.last_abstract_expansions = 0
+        if start_room == goal_room and (start_room, _START, _GOAL) not in avoid:
+            return (start_room,), ()
+
+        # Each frontier entry remembers the room it stands in after crossing a doorway.
+        best: dict[tuple[str, str], float] = {(_START, start_room): 0.0}
+        came_from: dict[tuple[str, str], tuple[str, str] | None] = {(_START, start_room): None}
+        frontier: list[tuple[float, float, str, str]] = [
+            (_distance_2d(start_position, goal_position), 0.0, _START, start_room)
+        ]
+        closed: set[tuple[str, str]] = set()
+        while frontier:
+            _, cost, node, room_id = heappop(frontier)
+            state = (node, room_id)
+            if node == _GOAL:
+                return self._unwind(came_from, state)
+            if state in closed:
+                continue
+            closed.add(state)
+            self.last_abstract_expansions += 1
+            here = start_position if node == _START else self.doorway_point(node)
+            candidates: list[tuple[str, str, Vector3]] = []
+            if room_id == goal_room:
+                candidates.append((_GOAL, goal_room, goal_position))
+            for doorway_id in self._room_doorways.get(room_id, []):
+                if doorway_id == node:
+                    continue
+                doorway = self._doorways[doorway_id]
+                next_room = doorway.room_b if doorway.room_a == room_id else doorway.room_a
+                candidates.append((doorway_id, next_room, self.doorway_point(doorway_id)))
+            for next_node, next_room, there in candidates:
+                transit = (room_id, node, next_node)
+                if transit in avoid or transit in self._blocked_transits:
+                    continue
+                next_state = (next_node, next_room)
+                next_cost = cost + _distance_2d(here, there)
+                if next_cost >= best.get(next_state, float("inf")):
+                    continue
+                best[next_state] = next_cost
+                came_from[next_state] = state
+                heappush(
+                    frontier,
+                    (next_cost + _distance_2d(there, goal_position), next_cost, next_node, next_room),
+                )
+        return None
+
+    @staticmethod
+    def _unwind(
+        came_from: dict[tuple[str, str], tuple[str, str] | None],
+        state: tuple[str, str],
+    ) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        chain: list[tuple[str, str]] = []
+        crawl: tuple[str, str] | None = state
+        while crawl is not None:
+            chain.append(crawl)
+            crawl = came_from[crawl]
+        chain.reverse()
+        rooms = tuple(room_id for node, room_id in chain if node != _GOAL)
+        doorways = tuple(node for node, _ in chain[1:-1])
+        return rooms, doorways
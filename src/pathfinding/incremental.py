@@ -0,0 +1,159 @@
+"""Incremental waypoint replanning with D* Lite."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from math import inf
+
+from src.ai.navigation import WaypointPathfinder
+
+
+Key = tuple[float, float]
+
+
+class DStarLitePlanner:
+    """Keeps a shortest waypoint path to one goal valid as links change.
+
+    The search runs backward from the goal (Koenig & Likhachev, optimized D*
+    Lite). The planner subscribes to the pathfinder's link changes
+    (`block_link`, `unblock_link`, `add_link`, `remove_link`). When a link
+    changes, only its source vertex is re-evaluated, and the next `path()` call
+    repairs just the part of the search that change made inconsistent. As the
+    bot advances, `move_start(...)` keeps earlier work valid through the
+    key modifier `km`.
+    """
+
+    def __init__(self, *, pathfinder: WaypointPathfinder, start_id: str, goal_id: str) -> None:
+        for waypoint_id in (start_id, goal_id):
+            if waypoint_id not in pathfinder.waypoints:
+                raise ValueError(f"Unknown waypoint '{waypoint_id}'.")
+        self.pathfinder = pathfinder
+        self.start_id = start_id
+        self.goal_id = goal_id
+        self._last_start_id = start_id
+        self._km = 0.0
+        self._g: dict[str, float] = {}
+        self._rhs: dict[str, float] = {goal_id: 0.0}
+        self._open: dict[str, Key] = {}
+        self._heap: list[tuple[Key, str]] = []
+        self._predecessors: dict[str, set[str]] = {waypoint_id: set() for waypoint_id in pathfinder.waypoints}
+        for source, neighbors in pathfinder.links.items():
+            for neighbor in neighbors:
+                self._predecessors.setdefault(neighbor, set()).add(source)
+        self.last_expansions = 0
+        self.total_expansions = 0
+        self._push(goal_id, self._key(goal_id))
+        pathfinder.add_link_listener(self._on_link_changed)
+
+    def close(self) -> None:
+        """Stop listening to link changes."""
+        self.pathfinder.remove_link_listener(self._on_link_changed)
+
+    def move_start(self, start_id: str) -> None:
+        """Record that the agent moved to a new waypoint."""
+        if start_id not in self.pathfinder.waypoints:
+            raise ValueError(f"Unknown waypoint '{start_id}'.")
+        if start_id == self.start_id:
+            return
+        self._km += self._heuristic(self._last_start_id, start_id)
+        self._last_start_id = start_id
+        self.start_id = start_id
+
+    def path(self) -> list[str]:
+        """Repair the search as needed and return waypoint ids from start to goal."""
+        self._compute_shortest_path()
+        if self._g_of(self.start_id) == inf:
+            return []
+        waypoint_ids = [self.start_id]
+        current = self.start_id
+        for _ in range(len(self.pathfinder.waypoints)):
+            if current == self.goal_id:
+                return waypoint_ids
+            current = min(
+                self.pathfinder.open_neighbors(current),
+                key=lambda neighbor: self.pathfinder.link_cost(current, neighbor) + self._g_of(neighbor),
+            )
+            waypoint_ids.append(current)
+        return waypoint_ids if current == self.goal_id else []
+
+    def cost_to_goal(self, waypoint_id: str) -> float:
+        """Return the current shortest distance from a waypoint to the goal."""
+        self._compute_shortest_path()
+        return self._g_of(waypoint_id)
+
+    def _on_link_changed(self, from_id: str, to_id: str) -> None:
+        if to_id in self.pathfinder.links.get(from_id, []):
+            self._predecessors.setdefault(to_id, set()).add(from_id)
+        else:
+            self._predecessors.get(to_id, set()).discard(from_id)
+        self._update_vertex(from_id)
+
+    def _g_of(self, waypoint_id: str) -> float:
+        return self._g.get(waypoint_id, inf)
+
+    def _rhs_of(self, waypoint_id: str) -> float:
+        return self._rhs.get(waypoint_id, inf)
+
+    def _heuristic(self, a: str, b: str) -> float:
+        return self.pathfinder.link_length(a, b)
+
+    def _key(self, waypoint_id: str) -> Key:
+        best = min(self._g_of(waypoint_id), self._rhs_of(waypoint_id))
+        return (best + self._heuristic(self.start_id, waypoint_id) + self._km, best)
+
+    def _push(self, waypoint_id: str, key: Key) -> None:
+        self._open[waypoint_id] = key
+        heappush(self._heap, (key, waypoint_id))
+
+    def _top(self) -> tuple[Key, str] | None:
+        heap = self._heap
+        while heap:
+            key, waypoint_id = heap[0]
+            if self._open.get(waypoint_id) == key:
+                return key, waypoint_id
+            heappop(heap)
+        return None
+
+    def _update_vertex(self, waypoint_id: str) -> None:
+        if waypoint_id != self.goal_id:
+            pathfinder = self.pathfinder
+            self._rhs[waypoint_id] = min(
+                (
+                    pathfinder.link_cost(waypoint_id, neighbor) + self._g_of(neighbor)
+                    for neighbor in pathfinder.open_neighbors(waypoint_id)
+                ),
+                default=inf,
+            )
+        self._open.pop(waypoint_id, None)
+        if self._g_of(waypoint_id) != self._rhs_of(waypoint_id):
+            self._push(waypoint_id, self._key(waypoint_id))
+
+    def _compute_shortest_path(self) -> None:
+        expansions = 0
+        start_id = self.start_id
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            start_consistent = self._g_of(start_id) == self._rhs_of(start_id)
+            if top[0] >= self._key(start_id) and start_consistent:
+                break
+            old_key, waypoint_id = top
+            new_key = self._key(waypoint_id)
+            expansions += 1
+            if old_key < new_key:
+                self._push(waypoint_id, new_key)
+                continue
+            heappop(self._heap)
+            del self._open[waypoint_id]
+            if self._g_of(waypoint_id) > self._rhs_of(waypoint_id):
+                self._g[waypoint_id] = self._rhs_of(waypoint_id)
+                for predecessor in self._predecessors.get(waypoint_id, ()):
+                    self._update_vertex(predecessor)
+            else:
+                self._g[waypoint_id] = inf
+                self._update_vertex(waypoint_id)
+                for predecessor in self._predecessors.get(waypoint_id, ()):
+                    self._update_vertex(predecessor)
+        self.last_expansions = expansions
+        self.total_expansions += expansions
@@ -0,0 +1,152 @@
+"""Queued path planning time-sliced under a per-frame microsecond budget."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from enum import Enum
+from time import perf_counter
+
+
+Vector3 = tuple[float, float, float]
+PathPlanner = Callable[[Vector3, Vector3], Sequence[Vector3]]
+
+
+class PathRequestStatus(str, Enum):
+    """Lifecycle states of a queued path request."""
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class PathRequest:
+    """Handle returned by `PathRequestService.submit(...)`."""
+
+    request_id: int
+    requester_id: str
+    start: Vector3
+    goal: Vector3
+    callback: Callable[["PathRequest"], None] | None = field(default=None, repr=False)
+    status: PathRequestStatus = PathRequestStatus.PENDING
+    path: tuple[Vector3, ...] | None = None
+    error: str | None = None
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status == PathRequestStatus.PENDING
+
+
+class PathRequestService:
+    """Accepts path requests and plans them a few at a time each frame.
+
+    `process()` plans queued requests in FIFO order until `budget_us` is spent
+    (at least one request always runs), then fires callbacks for finished
+    requests. A newer request from the same requester supersedes its pending
+    one. `current_path(requester_id)` keeps returning the last delivered path
+    until a new one is planned, so bots keep moving while they wait.
+    """
+
+    def __init__(
+        self,
+        *,
+        planner: PathPlanner,
+        budget_us: float = 1_000.0,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        if budget_us <= 0.0:
+            raise ValueError("budget_us must be positive.")
+        self.planner = planner
+        self.budget_us = budget_us
+        self._clock = clock
+        self._queue: deque[PathRequest] = deque()
+        self._pending_by_requester: dict[str, PathRequest] = {}
+        self._paths: dict[str, tuple[Vector3, ...]] = {}
+        self._next_request_id = 1
+        self.last_frame_processed = 0
+        self.last_frame_elapsed_us = 0.0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending_by_requester)
+
+    def submit(
+        self,
+        *,
+        requester_id: str,
+        start: Vector3,
+        goal: Vector3,
+        callback: Callable[[PathRequest], None] | None = None,
+    ) -> PathRequest:
+        """Queue a request and return its handle, cancelling the requester's older one."""
+        previous = self._pending_by_requester.get(requester_id)
+        if previous is not None:
+            self.cancel(previous)
+        request = PathRequest(
+            request_id=self._next_request_id,
+            requester_id=requester_id,
+            start=start,
+            goal=goal,
+            callback=callback,
+        )
+        self._next_request_id += 1
+        self._queue.append(request)
+        self._pending_by_requester[requester_id] = request
+        return request
+
+    def cancel(self, request: PathRequest) -> bool:
+        """Cancel a pending request. Its callback is not called."""
+        if not request.is_pending:
+            return False
+        request.status = PathRequestStatus.CANCELLED
+        if self._pending_by_requester.get(request.requester_id) is request:
+            del self._pending_by_requester[request.requester_id]
+        return True
+
+    def current_path(self, requester_id: str) -> tuple[Vector3, ...] | None:
+        """Return the most recently delivered path for a requester, if any."""
+        return self._paths.get(requester_id)
+
+    def forget(self, requester_id: str) -> None:
+        """Cancel pending work and drop the stored path for a removed requester."""
+        pending = self._pending_by_requester.get(requester_id)
+        if pending is not None:
+            self.cancel(pending)
+        self._paths.pop(requester_id, None)
+
+    def process(self, *, budget_us: float | None = None) -> list[PathRequest]:
+        """Plan queued requests until the budget is spent and return the finished ones."""
+        started = self._clock()
+        budget_seconds = (self.budget_us if budget_us is None else budget_us) / 1_000_000.0
+        finished: list[PathRequest] = []
+        while self._queue:
+            if finished and (self._clock() - started) >= budget_seconds:
+                break
+            request = self._queue.popleft()
+            if not request.is_pending:
+                continue
+            self._plan(request)
+            finished.append(request)
+
+        self.last_frame_processed = len(finished)
+        self.last_frame_elapsed_us = (self._clock() - started) * 1_000_000.0
+        for request in finished:
+            if request.callback is not None:
+                request.callback(request)
+        return finished
+
+    def _plan(self, request: PathRequest) -> None:
+        del self._pending_by_requester[request.requester_id]
+        try:
+            path = tuple(self.planner(request.start, request.goal))
+        except ValueError as error:
+            request.status = PathRequestStatus.FAILED
+            request.error = str(error)
+            return
+        request.path = path
+        request.status = PathRequestStatus.DONE
+        if path:
+            self._paths[request.requester_id] = path
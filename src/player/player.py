@@ -169,6 +169,32 @@ class Player:
         )
         return [Projectile.from_payload(item) for item in payload]
 
+    def shoot_projectiles_held(
+        self,
+        *,
+        frame_start: float,
+        now: float,
+        origin: tuple[float, float, float],
+        direction: tuple[float, float, float],
+    ) -> list[Projectile]:
+        """Fire every shot due while the trigger was held this frame.
+
+        Each projectile is spawned at its sub-frame timestamp and moved forward to
+        where it would be at `now`, so automatic weapons keep their DPS at low
+        frame rates.
+        """
+        if not self.is_alive or self.is_game_over:
+            return []
+        weapon = self.equipped_weapon
+        shot_times = weapon.fire_due(frame_start=frame_start, now=now)
+        payload = weapon.create_scheduled_projectile_payloads(
+            origin=origin,
+            direction=direction,
+            shot_times=shot_times,
+            now=now,
+        )
+        return [Projectile.from_payload(item) for item in payload]
+
     def shoot_hitscan(
         self,
         *,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 
 from src.core.collision import AABB, CollisionWorld
@@ -10,29 +11,68 @@ from src.projectiles.projectile import Projectile
 
 @dataclass
 class ProjectilePhysicsSystem:
-    """Advances projectiles and deactivates on world collision."""
+    """Advances projectiles and deactivates on world collision.
+
+    Static geometry never moves, so each projectile's straight-line impact
+    distance against walls and world bounds is solved once with a single ray
+    query the first time the projectile is stepped. Later frames only compare
+    the distance traveled with that precomputed expiry.
+    """
 
     def step(self, projectiles: list[Projectile], delta_time: float, world: CollisionWorld) -> int:
         collision_count = 0
         for projectile in projectiles:
             if not projectile.is_active:
                 continue
+            if projectile.static_impact_distance is None:
+                projectile.static_impact_distance = self.compute_static_impact_distance(projectile, world)
             projectile.advance(delta_time)
-            if not projectile.is_active:
+            impact_distance = projectile.static_impact_distance
+            if projectile.distance_traveled < impact_distance:
                 continue
-            projectile_box = AABB(
+            overshoot = projectile.distance_traveled - impact_distance
+            if overshoot > 0.0:
+                heading = projectile.heading()
+                projectile.position = (
+                    projectile.position[0] - (heading[0] * overshoot),
+                    projectile.position[1] - (heading[1] * overshoot),
+                    projectile.position[2] - (heading[2] * overshoot),
+                )
+                projectile.distance_traveled = impact_distance
+            projectile.is_active = False
+            collision_count += 1
+        return collision_count
+
+    def compute_static_impact_distance(self, projectile: Projectile, world: CollisionWorld) -> float:
+        """Return total travel distance at which the projectile hits static geometry.
+
+        Distances are measured from the muzzle so projectiles spawned mid-flight
+        (sub-frame shots) still collide with walls they already passed. Returns
+        `math.inf` when the path ends by lifetime before touching anything.
+        """
+        if projectile.speed <= 0.0:
+            radius = projectile.radius
+            box = AABB(
                 min_corner=(
-                    projectile.position[0] - projectile.radius,
-                    projectile.position[1] - projectile.radius,
-                    projectile.position[2] - projectile.radius,
+                    projectile.position[0] - radius,
+                    projectile.position[1] - radius,
+                    projectile.position[2] - radius,
                 ),
                 max_corner=(
-                    projectile.position[0] + projectile.radius,
-                    projectile.position[1] + projectile.radius,
-                    projectile.position[2] + projectile.radius,
+                    projectile.position[0] + radius,
+                    projectile.position[1] + radius,
+                    projectile.position[2] + radius,
                 ),
             )
-            if world.outside_world_bounds(projectile_box) or world.collides_with_wall(projectile_box):
-                projectile.is_active = False
-                collision_count += 1
-        return collision_count
+            if world.outside_world_bounds(box) or world.collides_with_wall(box):
+                return projectile.distance_traveled
+            return math.inf
+        hit_distance = world.static_impact_distance(
+            origin=projectile.muzzle_position(),
+            direction=projectile.heading(),
+            max_distance=projectile.max_distance,
+            half_extent=projectile.radius,
+        )
+        if hit_distance is None:
+            return math.inf
+        return hit_distance
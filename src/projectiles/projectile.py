@@ -36,6 +36,7 @@ class Projectile:
     max_distance: float
     distance_traveled: float = 0.0
     is_active: bool = True
+    static_impact_distance: float | None = None
 
     @classmethod
     def from_payload(cls, payload: dict) -> "Projectile":
@@ -53,6 +54,28 @@ class Projectile:
             radius=payload["radius"],
             damage=payload["damage"],
             max_distance=payload.get("max_distance", 150.0),
+            distance_traveled=payload.get("distance_traveled", 0.0),
+        )
+
+    @property
+    def speed(self) -> float:
+        return math.sqrt(
+            (self.velocity[0] * self.velocity[0])
+            + (self.velocity[1] * self.velocity[1])
+            + (self.velocity[2] * self.velocity[2])
+        )
+
+    def heading(self) -> Vector3:
+        """Unit travel direction of the projectile."""
+        return _normalize(self.velocity)
+
+    def muzzle_position(self) -> Vector3:
+        """Point the projectile was fired from, derived from distance traveled."""
+        heading = self.heading()
+        return (
+            self.position[0] - (heading[0] * self.distance_traveled),
+            self.position[1] - (heading[1] * self.distance_traveled),
+            self.position[2] - (heading[2] * self.distance_traveled),
         )
 
     def advance(self, delta_time: float) -> None:
@@ -0,0 +1,8 @@
+"""Deterministic per-entity random number streams."""
+
+from src.rng.streams import RngService, derive_seed
+
+__all__ = [
+    "RngService",
+    "derive_seed",
+]
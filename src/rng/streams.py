@@ -0,0 +1,78 @@
+"""Seeded, order-independent random streams for bots, waves, and systems."""
+
+from __future__ import annotations
+
+from hashlib import blake2b
+from random import Random
+from threading import Lock
+
+
+StreamKey = tuple[str | int, ...]
+
+
+def derive_seed(root_seed: int, *path: str | int) -> int:
+    """Hash a root seed and a stream path into a 64-bit seed.
+
+    The seed depends only on `(root_seed, path)`, never on how many other
+    streams were created or drawn from before, which keeps results identical
+    when updates are reordered or sharded.
+    """
+    digest = blake2b(digest_size=8)
+    digest.update(str(root_seed).encode("utf-8"))
+    for part in path:
+        # Type tags keep ("bot", 1) and ("bot", "1") apart.
+        tag = "i" if isinstance(part, int) else "s"
+        digest.update(f"\x1f{tag}{part}".encode("utf-8"))
+    return int.from_bytes(digest.digest(), "big")
+
+
+class RngService:
+    """Derives an independent `random.Random` stream per bot, wave, and system.
+
+    `stream(...)` returns the same cached generator for the same path, so a bot
+    keeps advancing its own sequence across frames. Each stream should only be
+    drawn from by one thread at a time; creating streams is thread-safe.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self._streams: dict[StreamKey, Random] = {}
+        self._lock = Lock()
+
+    def stream(self, *path: str | int) -> Random:
+        """Return the persistent stream for a path, creating it on first use."""
+        if not path:
+            raise ValueError("Stream path must not be empty.")
+        existing = self._streams.get(path)
+        if existing is not None:
+            return existing
+        with self._lock:
+            if path not in self._streams:
+                self._streams[path] = Random(derive_seed(self.seed, *path))
+            return self._streams[path]
+
+    def fresh(self, *path: str | int) -> Random:
+        """Return a new generator at the start of a path's sequence (for replays)."""
+        if not path:
+            raise ValueError("Stream path must not be empty.")
+        return Random(derive_seed(self.seed, *path))
+
+    def bot_stream(self, bot_id: str) -> Random:
+        return self.stream("bot", bot_id)
+
+    def wave_stream(self, wave_number: int) -> Random:
+        return self.stream("wave", wave_number)
+
+    def system_stream(self, system_name: str) -> Random:
+        return self.stream("system", system_name)
+
+    def spawn(self, *path: str | int) -> "RngService":
+        """Create a child service whose streams are independent of this one's."""
+        if not path:
+            raise ValueError("Child service path must not be empty.")
+        return RngService(derive_seed(self.seed, "child", *path))
+
+    def forget(self, *path: str | int) -> None:
+        """Drop a cached stream (e.g. when its bot is removed)."""
+        with self._lock:
+            self._streams.pop(path, None)
@@ -0,0 +1,25 @@
+"""Squad-level coordination shared by groups of bots."""
+
+from src.squad.attack_tokens import AttackTokenArbiter, AttackTokenUpdate
+from src.squad.coordinator import DEFAULT_SQUAD, SquadCoordinator, SquadOrder, SquadRole
+from src.squad.influence import InfluenceMap
+from src.squad.statistical_combat import (
+    StatisticalCombat,
+    StatisticalCombatResult,
+    StatisticalVolley,
+    hit_probability,
+)
+
+__all__ = [
+    "AttackTokenArbiter",
+    "AttackTokenUpdate",
+    "SquadCoordinator",
+    "SquadOrder",
+    "SquadRole",
+    "DEFAULT_SQUAD",
+    "InfluenceMap",
+    "StatisticalCombat",
+    "StatisticalCombatResult",
+    "StatisticalVolley",
+    "hit_probability",
+]
@@ -0,0 +1,133 @@
+"""Attack tokens that cap how many bots shoot at the player at once."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import sqrt
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.waves import WaveDifficulty
+from src.squad.influence import InfluenceMap
+
+
+Vector3 = tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class AttackTokenUpdate:
+    """Token changes from one arbiter update."""
+
+    granted: list[str]
+    revoked: list[str]
+    holders: list[str]
+
+
+class AttackTokenArbiter:
+    """Grants a bounded number of firing slots among `ATTACKING` bots.
+
+    A token is held for `hold_seconds`, then returned, and its bot rests for
+    `rest_seconds`. Only bots with line of fire to the player (from the optional
+    `influence_map`) compete. Free tokens go to the nearest waiting bots, minus
+    `wait_weight` metres per second already waited, so far bots still rotate in.
+    Resting bots only get tokens that nobody else wants. Holders that stop
+    attacking, die, or lose line of fire give their token back at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        token_count: int,
+        hold_seconds: float = 1.5,
+        rest_seconds: float = 1.0,
+        wait_weight: float = 2.0,
+        influence_map: InfluenceMap | None = None,
+    ) -> None:
+        if token_count <= 0:
+            raise ValueError("token_count must be positive.")
+        if hold_seconds <= 0.0 or rest_seconds < 0.0 or wait_weight < 0.0:
+            raise ValueError("hold_seconds must be positive; rest_seconds and wait_weight non-negative.")
+        self.token_count = token_count
+        self.hold_seconds = hold_seconds
+        self.rest_seconds = rest_seconds
+        self.wait_weight = wait_weight
+        self.influence_map = influence_map
+        self._granted_at: dict[str, float] = {}
+        self._waiting_since: dict[str, float] = {}
+        self._rest_until: dict[str, float] = {}
+        self.last_candidates = 0
+
+    @classmethod
+    def for_difficulty(cls, difficulty: WaveDifficulty, **options) -> "AttackTokenArbiter":
+        """Create an arbiter with the wave's `attack_tokens` slots."""
+        return cls(token_count=difficulty.attack_tokens, **options)
+
+    @property
+    def holders(self) -> list[str]:
+        return list(self._granted_at)
+
+    def holds(self, bot_id: str) -> bool:
+        return bot_id in self._granted_at
+
+    def forget(self, bot_id: str) -> None:
+        """Drop every record of a removed bot, returning its token."""
+        self._granted_at.pop(bot_id, None)
+        self._waiting_since.pop(bot_id, None)
+        self._rest_until.pop(bot_id, None)
+
+    def update(self, *, bots: Sequence[Bot], now: float, player_position: Vector3) -> AttackTokenUpdate:
+        """Expire and hand out tokens for this tick and report what changed."""
+        influence_map = self.influence_map
+        candidates: dict[str, float] = {}
+        for bot in bots:
+            if not (bot.is_alive and bot.ai_state == BotAIState.ATTACKING):
+                continue
+            if influence_map is None or influence_map.has_line_of_fire(bot.position):
+                dx = bot.position[0] - player_position[0]
+                dz = bot.position[2] - player_position[2]
+                candidates[bot.bot_id] = sqrt((dx * dx) + (dz * dz))
+        self.last_candidates = len(candidates)
+        previous = set(self._granted_at)
+
+        for bot_id in list(self._granted_at):
+            expired = now >= self._granted_at[bot_id] + self.hold_seconds
+            if bot_id not in candidates or expired:
+                del self._granted_at[bot_id]
+                if expired:
+                    self._rest_until[bot_id] = now + self.rest_seconds
+        for bot_id in list(self._waiting_since):
+            if bot_id not in candidates:
+                del self._waiting_since[bot_id]
+        for bot_id in list(self._rest_until):
+            if self._rest_until[bot_id] <= now or bot_id not in candidates:
+                del self._rest_until[bot_id]
+        for bot_id in candidates:
+            if bot_id not in self._granted_at:
+                self._waiting_since.setdefault(bot_id, now)
+
+        def priority(bot_id: str) -> float:
+            waited = now - self._waiting_since.get(bot_id, now)
+            return candidates[bot_id] - (self.wait_weight * waited)
+
+        # Shrinking the token count drops the lowest-priority holders.
+        if len(self._granted_at) > self.token_count:
+            for bot_id in sorted(self._granted_at, key=priority)[self.token_count:]:
+                del self._granted_at[bot_id]
+                self._waiting_since[bot_id] = now
+
+        waiting = [bot_id for bot_id in candidates if bot_id not in self._granted_at]
+        fresh = sorted((bot_id for bot_id in waiting if bot_id not in self._rest_until), key=priority)
+        resting = sorted((bot_id for bot_id in waiting if bot_id in self._rest_until), key=priority)
+        for bot_id in fresh + resting:
+            if len(self._granted_at) >= self.token_count:
+                break
+            self._granted_at[bot_id] = now
+            self._waiting_since.pop(bot_id, None)
+            self._rest_until.pop(bot_id, None)
+
+        current = set(self._granted_at)
+        return AttackTokenUpdate(
+            granted=[bot_id for bot_id in self._granted_at if bot_id not in previous],
+            revoked=sorted(previous - current),
+            holders=list(self._granted_at),
+        )
@@ -0,0 +1,269 @@
+"""Squad-level tactical decisions computed once per tick for every bot."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import Enum
+from math import inf, sqrt
+
+from src.ai.bot import Bot
+from src.ai.tactics import (
+    CoverPlan,
+    CoverService,
+    TacticalAction,
+    decide_tactical_action,
+    find_cover_plan,
+    flank_candidates,
+)
+from src.environment.cover_points import CoverDatabase
+from src.environment.facility import CoverObject
+from src.squad.influence import InfluenceMap
+
+
+Vector3 = tuple[float, float, float]
+
+DEFAULT_SQUAD = "default"
+
+
+def _distance_2d(a: Vector3, b: Vector3) -> float:
+    dx = a[0] - b[0]
+    dz = a[2] - b[2]
+    return sqrt((dx * dx) + (dz * dz))
+
+
+class SquadRole(str, Enum):
+    """Part a bot plays in its squad's plan this tick."""
+
+    RIFLEMAN = "rifleman"
+    FLANKER = "flanker"
+    SUPPRESSOR = "suppressor"
+    COVER = "cover"
+
+
+@dataclass(frozen=True)
+class SquadOrder:
+    """Action assigned to one bot by `SquadCoordinator.assign(...)`."""
+
+    bot_id: str
+    squad_id: str
+    action: TacticalAction
+    role: SquadRole
+    distance_to_player: float
+    ally_count: int
+    cover: CoverPlan | None = None
+    flank_route: tuple[Vector3, ...] | None = None
+
+
+class SquadCoordinator:
+    """Assigns tactical actions to all living bots in one batch per tick.
+
+    `assign(...)` computes bot-to-player distances, the bot-to-bot distance
+    matrix, and per-squad ally counts once, and looks cover up through one
+    shared `CoverService` (or a baked `CoverDatabase`). Bots whose individual
+    rule says `flank` are then split per squad: the ones nearest the player
+    flank (up to `max_flankers_per_squad`) and the rest stay back as
+    suppressors firing at the player. Cover is looked up only for bots whose
+    action can depend on it, so `SquadOrder.cover` is `None` for bots that
+    were going to attack or flank anyway. Flank points already claimed this tick,
+    by any squad, are skipped in favour of the other side; a bot with no free
+    side suppresses instead, so no two flankers share a route. With an
+    `influence_map`, the less exposed flank side is tried first.
+    """
+
+    def __init__(
+        self,
+        *,
+        cover_objects: list[CoverObject],
+        cover_service: CoverService | None = None,
+        cover_database: CoverDatabase | None = None,
+        ally_radius: float = inf,
+        flank_radius: float = 5.0,
+        min_flank_separation: float = 2.0,
+        max_flankers_per_squad: int = 2,
+        low_health_threshold: int = 35,
+        attack_range: float = 14.0,
+        influence_map: InfluenceMap | None = None,
+    ) -> None:
+        if ally_radius <= 0.0 or flank_radius <= 0.0 or min_flank_separation < 0.0:
+            raise ValueError("ally_radius and flank_radius must be positive and separation non-negative.")
+        if max_flankers_per_squad < 0:
+            raise ValueError("max_flankers_per_squad must be non-negative.")
+        self.cover_objects = cover_objects
+        self.cover_database = cover_database
+        self.cover_service = cover_service
+        if cover_service is None and cover_database is None:
+            self.cover_service = CoverService(cover_objects)
+        self.ally_radius = ally_radius
+        self.flank_radius = flank_radius
+        self.min_flank_separation = min_flank_separation
+        self.max_flankers_per_squad = max_flankers_per_squad
+        self.low_health_threshold = low_health_threshold
+        self.attack_range = attack_range
+        self.influence_map = influence_map
+        self._squads: dict[str, str] = {}
+        self.bot_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self.player_distances: list[float] = []
+        self.bot_distances: list[list[float]] = []
+        self.ally_counts: dict[str, int] = {}
+        self.last_cover_lookups = 0
+
+    def set_squad(self, bot_id: str, squad_id: str) -> None:
+        self._squads[bot_id] = squad_id
+
+    def squad_of(self, bot_id: str) -> str:
+        return self._squads.get(bot_id, DEFAULT_SQUAD)
+
+    def forget(self, bot_id: str) -> None:
+        """Drop squad membership for a removed bot."""
+        self._squads.pop(bot_id, None)
+
+    def distance_between(self, bot_a: str, bot_b: str) -> float:
+        """Return a bot-to-bot distance from the last tick's matrix."""
+        return self.bot_distances[self._rows[bot_a]][self._rows[bot_b]]
+
+    def assign(self, *, bots: Sequence[Bot], player_position: Vector3) -> list[SquadOrder]:
+        """Compute shared per-tick data and return one order per living bot, in input order."""
+        living = [bot for bot in bots if bot.is_alive]
+        positions = [bot.position for bot in living]
+        squads = [self.squad_of(bot.bot_id) for bot in living]
+        self.bot_ids = [bot.bot_id for bot in living]
+        self._rows = {bot_id: row for row, bot_id in enumerate(self.bot_ids)}
+        self.player_distances = [_distance_2d(position, player_position) for position in positions]
+        self.bot_distances = self._distance_matrix(positions)
+        ally_counts = self._ally_counts(squads)
+        self.ally_counts = dict(zip(self.bot_ids, ally_counts))
+        self.last_cover_lookups = 0
+
+        actions: list[TacticalAction] = []
+        covers: list[CoverPlan | None] = []
+        for index, bot in enumerate(living):
+            distance = self.player_distances[index]
+            cover = self._cover_for(bot, distance, ally_counts[index], player_position)
+            covers.append(cover)
+            actions.append(
+                decide_tactical_action(
+                    health=bot.health,
+                    distance_to_player=distance,
+                    has_cover=cover is not None,
+                    ally_count=ally_counts[index],
+                    low_health_threshold=self.low_health_threshold,
+                    attack_range=self.attack_range,
+                )
+            )
+
+        roles, routes = self._assign_flank_roles(living, squads, actions, player_position)
+        orders: list[SquadOrder] = []
+        for index, bot in enumerate(living):
+            action = actions[index]
+            role = roles.get(index)
+            if role is None:
+                role = SquadRole.COVER if action == TacticalAction.TAKE_COVER else SquadRole.RIFLEMAN
+            if role == SquadRole.SUPPRESSOR:
+                action = TacticalAction.ATTACK
+            orders.append(
+                SquadOrder(
+                    bot_id=bot.bot_id,
+                    squad_id=squads[index],
+                    action=action,
+                    role=role,
+                    distance_to_player=self.player_distances[index],
+                    ally_count=ally_counts[index],
+                    cover=covers[index],
+                    flank_route=routes.get(index),
+                )
+            )
+        return orders
+
+    @staticmethod
+    def _distance_matrix(positions: list[Vector3]) -> list[list[float]]:
+        count = len(positions)
+        matrix = [[0.0] * count for _ in range(count)]
+        for row in range(count):
+            here = positions[row]
+            matrix_row = matrix[row]
+            for column in range(row + 1, count):
+                distance = _distance_2d(here, positions[column])
+                matrix_row[column] = distance
+                matrix[column][row] = distance
+        return matrix
+
+    def _ally_counts(self, squads: list[str]) -> list[int]:
+        counts = [0] * len(squads)
+        for row, squad_id in enumerate(squads):
+            matrix_row = self.bot_distances[row]
+            for column, other_squad in enumerate(squads):
+                if column != row and other_squad == squad_id and matrix_row[column] <= self.ally_radius:
+                    counts[row] += 1
+        return counts
+
+    def _cover_for(
+        self,
+        bot: Bot,
+        distance: float,
+        ally_count: int,
+        player_position: Vector3,
+    ) -> CoverPlan | None:
+        # Cover only changes the outcome for hurt bots or bots with nothing better to do.
+        can_engage = distance <= self.attack_range or (ally_count >= 1 and distance <= self.attack_range * 1.5)
+        if bot.health > self.low_health_threshold and can_engage:
+            return None
+        self.last_cover_lookups += 1
+        if self.cover_service is not None:
+            return self.cover_service.find_cover(bot_position=bot.position, player_position=player_position)
+        return find_cover_plan(
+            bot_position=bot.position,
+            player_position=player_position,
+            cover_objects=self.cover_objects,
+            cover_database=self.cover_database,
+        )
+
+    def _assign_flank_roles(
+        self,
+        living: list[Bot],
+        squads: list[str],
+        actions: list[TacticalAction],
+        player_position: Vector3,
+    ) -> tuple[dict[int, SquadRole], dict[int, tuple[Vector3, ...]]]:
+        candidates_by_squad: dict[str, list[int]] = {}
+        for index, action in enumerate(actions):
+            if action == TacticalAction.FLANK:
+                candidates_by_squad.setdefault(squads[index], []).append(index)
+
+        roles: dict[int, SquadRole] = {}
+        routes: dict[int, tuple[Vector3, ...]] = {}
+        claimed: list[Vector3] = []
+        for squad_id in sorted(candidates_by_squad):
+            candidates = sorted(candidates_by_squad[squad_id], key=lambda index: self.player_distances[index])
+            flankers = 0
+            for index in candidates:
+                point = None
+                if flankers < self.max_flankers_per_squad:
+                    point = self._free_flank_point(living[index].position, player_position, claimed)
+                if point is None:
+                    roles[index] = SquadRole.SUPPRESSOR
+                    continue
+                claimed.append(point)
+                flankers += 1
+                roles[index] = SquadRole.FLANKER
+                routes[index] = (point, player_position)
+        return roles, routes
+
+    def _free_flank_point(
+        self,
+        bot_position: Vector3,
+        player_position: Vector3,
+        claimed: list[Vector3],
+    ) -> Vector3 | None:
+        points = flank_candidates(
+            bot_position=bot_position,
+            player_position=player_position,
+            flank_radius=self.flank_radius,
+        )
+        if self.influence_map is not None:
+            points.sort(key=self.influence_map.exposure_at)
+        for point in points:
+            if all(_distance_2d(point, taken) >= self.min_flank_separation for taken in claimed):
+                return point
+        return None
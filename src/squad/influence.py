@@ -0,0 +1,249 @@
+"""Coarse influence grid of player threat, bot density, and recent danger."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from math import floor, sqrt
+
+from src.core.collision import CollisionWorld
+from src.environment.collision import build_collision_world
+from src.environment.facility import FacilityLayout
+
+
+Vector3 = tuple[float, float, float]
+
+_EPSILON = 1e-6
+_MIN_DECAY_SCALE = 1e-6
+# Separable [1, 2, 1] / 4 blur; the 2D kernel is its outer product.
+_BLUR = (0.25, 0.5, 0.25)
+
+
+class InfluenceMap:
+    """Grid over the facility updated incrementally each tick.
+
+    Three layers are kept per cell:
+    - threat: line of fire from the player's cell (ray-tested once per player
+      cell, then memoized) plus decaying stamps along recent shot lines;
+    - density: living bots per cell, blurred with a small kernel every tick;
+    - danger: decaying stamps around recent bot deaths.
+
+    Decay is a single scale factor shared by the decaying layers, so a tick
+    costs O(1) for decay; stored values are renormalized only when the scale
+    gets tiny. Readers look values up per cell instead of running geometry.
+    """
+
+    def __init__(
+        self,
+        *,
+        layout: FacilityLayout,
+        collision_world: CollisionWorld | None = None,
+        cell_size: float = 2.0,
+        threat_range: float = 20.0,
+        half_life_seconds: float = 4.0,
+        sight_height: float = 1.0,
+    ) -> None:
+        if cell_size <= 0.0 or threat_range <= 0.0 or half_life_seconds <= 0.0:
+            raise ValueError("cell_size, threat_range, and half_life_seconds must be positive.")
+        if not layout.rooms:
+            raise ValueError("Influence maps need at least one room.")
+        self.layout = layout
+        self.world = collision_world or build_collision_world(layout)
+        self.cell_size = cell_size
+        self.threat_range = threat_range
+        self.half_life_seconds = half_life_seconds
+        self.sight_height = sight_height
+        self.origin = (
+            min(room.min_x for room in layout.rooms.values()),
+            min(room.min_z for room in layout.rooms.values()),
+        )
+        max_x = max(room.max_x for room in layout.rooms.values())
+        max_z = max(room.max_z for room in layout.rooms.values())
+        self.columns = int(floor((max_x - self.origin[0]) / cell_size)) + 1
+        self.rows = int(floor((max_z - self.origin[1]) / cell_size)) + 1
+        count = self.columns * self.rows
+        self.walkable = bytearray(count)
+        self._floor_y = [0.0] * count
+        for index in range(count):
+            center = self.cell_center(index)
+            room_id = layout.find_room_for_position(center)
+            if room_id is not None:
+                self.walkable[index] = 1
+                self._floor_y[index] = layout.rooms[room_id].floor_y
+        self.line_of_fire = [0.0] * count
+        self.density = [0.0] * count
+        self._shots = [0.0] * count
+        self._danger = [0.0] * count
+        self._decay_scale = 1.0
+        self._visible_from: dict[int, list[tuple[int, float]]] = {}
+        self._player_cell: int | None = None
+        self.visibility_bakes = 0
+
+    def cell_center(self, index: int) -> Vector3:
+        column, row = divmod(index, self.rows)
+        return (
+            self.origin[0] + ((column + 0.5) * self.cell_size),
+            self._floor_y[index],
+            self.origin[1] + ((row + 0.5) * self.cell_size),
+        )
+
+    def cell_index(self, position: Vector3) -> int | None:
+        """Return the flat cell index under a position, or None outside the grid."""
+        column = int(floor((position[0] - self.origin[0]) / self.cell_size))
+        row = int(floor((position[2] - self.origin[1]) / self.cell_size))
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        return (column * self.rows) + row
+
+    def update(
+        self,
+        *,
+        dt: float,
+        player_position: Vector3,
+        bot_positions: Iterable[Vector3],
+    ) -> None:
+        """Advance decay, refresh line of fire on cell change, and rebuild density."""
+        if dt < 0.0:
+            raise ValueError("dt must be non-negative.")
+        self._decay_scale *= 0.5 ** (dt / self.half_life_seconds)
+        if self._decay_scale < _MIN_DECAY_SCALE:
+            self._renormalize()
+        self._update_line_of_fire(player_position)
+
+        counts = [0.0] * len(self.density)
+        for position in bot_positions:
+            index = self.cell_index(position)
+            if index is not None:
+                counts[index] += 1.0
+        self.density = self._blur(counts)
+
+    def record_shot(self, origin: Vector3, target: Vector3, amount: float = 1.0) -> None:
+        """Stamp decaying threat on every cell a shot line crosses."""
+        dx = target[0] - origin[0]
+        dz = target[2] - origin[2]
+        length = sqrt((dx * dx) + (dz * dz))
+        steps = max(1, int(length / (self.cell_size * 0.5)))
+        stamped: set[int] = set()
+        for step in range(steps + 1):
+            t = step / steps
+            index = self.cell_index((origin[0] + (dx * t), 0.0, origin[2] + (dz * t)))
+            if index is not None and index not in stamped and self.walkable[index]:
+                stamped.add(index)
+                self._shots[index] += amount / self._decay_scale
+
+    def record_death(self, position: Vector3, amount: float = 1.0) -> None:
+        """Stamp decaying danger around a death with the blur kernel."""
+        index = self.cell_index(position)
+        if index is None:
+            return
+        column, row = divmod(index, self.rows)
+        for offset_x, weight_x in zip((-1, 0, 1), _BLUR):
+            for offset_z, weight_z in zip((-1, 0, 1), _BLUR):
+                near_column = column + offset_x
+                near_row = row + offset_z
+                if 0 <= near_column < self.columns and 0 <= near_row < self.rows:
+                    near = (near_column * self.rows) + near_row
+                    if self.walkable[near]:
+                        self._danger[near] += (amount * 4.0 * weight_x * weight_z) / self._decay_scale
+
+    def threat_at(self, position: Vector3) -> float:
+        index = self.cell_index(position)
+        if index is None:
+            return 0.0
+        return self.line_of_fire[index] + (self._shots[index] * self._decay_scale)
+
+    def has_line_of_fire(self, position: Vector3) -> bool:
+        """Return True when the position's cell is in the player's line of fire."""
+        index = self.cell_index(position)
+        return index is not None and self.line_of_fire[index] > 0.0
+
+    def density_at(self, position: Vector3) -> float:
+        index = self.cell_index(position)
+        return 0.0 if index is None else self.density[index]
+
+    def danger_at(self, position: Vector3) -> float:
+        index = self.cell_index(position)
+        return 0.0 if index is None else self._danger[index] * self._decay_scale
+
+    def exposure_at(self, position: Vector3) -> float:
+        """Threat plus danger: how risky it is for a bot to stand here."""
+        return self.threat_at(position) + self.danger_at(position)
+
+    def rank_spawn_positions(self, spawn_positions: Sequence[Vector3]) -> list[Vector3]:
+        """Order spawn positions from least to most exposed (stable on ties)."""
+        return sorted(spawn_positions, key=self.exposure_at)
+
+    def _update_line_of_fire(self, player_position: Vector3) -> None:
+        player_cell = self.cell_index(player_position)
+        if player_cell == self._player_cell:
+            return
+        self._player_cell = player_cell
+        line_of_fire = [0.0] * len(self.line_of_fire)
+        if player_cell is not None:
+            for index, weight in self._visible_cells(player_cell):
+                line_of_fire[index] = weight
+        self.line_of_fire = line_of_fire
+
+    def _visible_cells(self, player_cell: int) -> list[tuple[int, float]]:
+        cached = self._visible_from.get(player_cell)
+        if cached is not None:
+            return cached
+        self.visibility_bakes += 1
+        source = self.cell_center(player_cell)
+        eye = (source[0], source[1] + self.sight_height, source[2])
+        visible: list[tuple[int, float]] = []
+        for index in range(len(self.walkable)):
+            if not self.walkable[index]:
+                continue
+            center = self.cell_center(index)
+            dx = center[0] - eye[0]
+            dy = (center[1] + self.sight_height) - eye[1]
+            dz = center[2] - eye[2]
+            distance = sqrt((dx * dx) + (dy * dy) + (dz * dz))
+            if distance >= self.threat_range:
+                continue
+            if distance > _EPSILON:
+                hit = self.world.static_impact_distance(
+                    origin=eye,
+                    direction=(dx / distance, dy / distance, dz / distance),
+                    max_distance=distance,
+                )
+                if hit is not None and hit < distance - _EPSILON:
+                    continue
+            visible.append((index, 1.0 - (distance / self.threat_range)))
+        self._visible_from[player_cell] = visible
+        return visible
+
+    def _blur(self, values: list[float]) -> list[float]:
+        rows = self.rows
+        columns = self.columns
+        along_z = [0.0] * len(values)
+        for column in range(columns):
+            base = column * rows
+            for row in range(rows):
+                total = values[base + row] * _BLUR[1]
+                if row > 0:
+                    total += values[base + row - 1] * _BLUR[0]
+                if row < rows - 1:
+                    total += values[base + row + 1] * _BLUR[2]
+                along_z[base + row] = total
+        blurred = [0.0] * len(values)
+        for column in range(columns):
+            base = column * rows
+            for row in range(rows):
+                if not self.walkable[base + row]:
+                    continue
+                total = along_z[base + row] * _BLUR[1]
+                if column > 0:
+                    total += along_z[base - rows + row] * _BLUR[0]
+                if column < columns - 1:
+                    total += along_z[base + rows + row] * _BLUR[2]
+                blurred[base + row] = total
+        return blurred
+
+    def _renormalize(self) -> None:
+        scale = self._decay_scale
+        for layer in (self._shots, self._danger):
+            for index, value in enumerate(layer):
+                value *= scale
+                layer[index] = value if value > _EPSILON else 0.0
+        self._decay_scale = 1.0
@@ -0,0 +1,205 @@
+"""Analytic combat resolution for low-LOD bots, swapped with full fire simulation."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from math import atan2, cos, floor, radians, sqrt
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.firing import BotFireSystem
+from src.ai.lod import AILodTier
+from src.ai.waves import WaveDifficulty
+from src.player.player import Player
+from src.rng.streams import RngService
+from src.squad.influence import InfluenceMap
+
+
+Vector3 = tuple[float, float, float]
+
+
+def hit_probability(*, accuracy_degrees: float, distance: float, target_radius: float = 0.4) -> float:
+    """Chance that one shot lands on a target disc of `target_radius` at `distance`.
+
+    Matches `ai.combat.vary_directions_with_accuracy(...)`, which samples shots
+    uniformly over a spherical cap: the hit share is the target's cap area over
+    the accuracy cap area.
+    """
+    if accuracy_degrees < 0.0 or distance < 0.0 or target_radius < 0.0:
+        raise ValueError("accuracy_degrees, distance, and target_radius must be non-negative.")
+    target_angle = atan2(target_radius, distance)
+    cone_angle = radians(accuracy_degrees)
+    if target_angle >= cone_angle:
+        return 1.0
+    return (1.0 - cos(target_angle)) / (1.0 - cos(cone_angle))
+
+
+@dataclass(frozen=True)
+class StatisticalVolley:
+    """Shots one analytic bot fired during a resolve window."""
+
+    bot_id: str
+    shots: int
+    hits: int
+    damage: float
+
+
+@dataclass(frozen=True)
+class StatisticalCombatResult:
+    volleys: list[StatisticalVolley]
+    total_damage: float
+    applied_damage: int
+
+
+class StatisticalCombat:
+    """Resolves fire for bots the player cannot see without aim rays or projectiles.
+
+    Each bot is either simulated in full by a `BotFireSystem` or resolved
+    analytically here. An analytic bot in `ATTACKING` fires every cooldown it
+    had in the window, until its magazine is empty, and its hits are
+    sampled from `hit_probability(...)` using the wave's `accuracy_degrees` and
+    its own `RngService` stream. The damage of every volley reaches the player
+    in one `apply_damage(...)` call.
+
+    Ammo and `last_fired_at` are written back to the bot's weapon after every
+    volley, so `use_full(...)` hands a bot back to the fire system mid-fight with
+    its cooldown and magazine intact. A bot keeps its fire system slot across
+    mode changes; analytic mode only releases its trigger. Like the fire system,
+    analytic mode never reloads by itself: call `reload(bot_id)` in either mode.
+    """
+
+    def __init__(
+        self,
+        *,
+        fire_system: BotFireSystem,
+        difficulty: WaveDifficulty,
+        rng_service: RngService,
+        target_radius: float = 0.4,
+        influence_map: InfluenceMap | None = None,
+    ) -> None:
+        if target_radius < 0.0:
+            raise ValueError("target_radius must be non-negative.")
+        self.fire_system = fire_system
+        self.difficulty = difficulty
+        self.rng_service = rng_service
+        self.target_radius = target_radius
+        self.influence_map = influence_map
+        self._analytic: dict[str, Bot] = {}
+        self._registered: set[str] = set()
+        self.last_shots = 0
+
+    def is_analytic(self, bot_id: str) -> bool:
+        return bot_id in self._analytic
+
+    @property
+    def analytic_count(self) -> int:
+        return len(self._analytic)
+
+    def use_analytic(self, bot: Bot) -> None:
+        """Stop a bot's fire system trigger and resolve its shots statistically."""
+        if bot.bot_id in self._analytic:
+            return
+        if bot.bot_id in self._registered:
+            self.fire_system.set_trigger(bot.bot_id, False)
+        self._analytic[bot.bot_id] = bot
+
+    def use_full(self, bot: Bot) -> None:
+        """Hand a bot (back) to the fire system, holding its trigger while it attacks."""
+        if bot.bot_id in self._registered and bot.bot_id not in self._analytic:
+            return
+        self._analytic.pop(bot.bot_id, None)
+        if bot.bot_id in self._registered:
+            self.fire_system.refresh(bot.bot_id)
+        else:
+            self.fire_system.register(bot, accuracy_degrees=self.difficulty.accuracy_degrees)
+            self._registered.add(bot.bot_id)
+        self.fire_system.set_trigger(bot.bot_id, bot.ai_state == BotAIState.ATTACKING)
+
+    def reload(self, bot_id: str) -> int:
+        """Reload a bot's weapon in whichever mode it is in and return rounds loaded."""
+        bot = self._analytic.get(bot_id)
+        if bot is not None:
+            return bot.weapon.reload()
+        if bot_id not in self._registered:
+            raise ValueError(f"Bot '{bot_id}' is not tracked.")
+        return self.fire_system.reload(bot_id)
+
+    def sync_tiers(self, bots: Sequence[Bot], tiers: Mapping[str, AILodTier]) -> None:
+        """Resolve `FAR` bots analytically and every other living bot in full."""
+        for bot in bots:
+            if not bot.is_alive:
+                self.forget(bot.bot_id)
+                continue
+            tier = tiers.get(bot.bot_id)
+            if tier is None:
+                continue
+            if tier == AILodTier.FAR:
+                self.use_analytic(bot)
+            else:
+                self.use_full(bot)
+
+    def forget(self, bot_id: str) -> None:
+        """Drop a removed bot from whichever mode it was in."""
+        self._analytic.pop(bot_id, None)
+        if bot_id in self._registered:
+            self.fire_system.unregister(bot_id)
+            self._registered.discard(bot_id)
+
+    def resolve(
+        self,
+        *,
+        now: float,
+        frame_start: float,
+        player_position: Vector3,
+        player: Player | None = None,
+    ) -> StatisticalCombatResult:
+        """Fire every analytic attacker's shots due in `[frame_start, now]`."""
+        if frame_start > now:
+            raise ValueError("frame_start must not be after now.")
+        volleys: list[StatisticalVolley] = []
+        total_damage = 0.0
+        shots_fired = 0
+        for bot in list(self._analytic.values()):
+            if not bot.is_alive:
+                del self._analytic[bot.bot_id]
+                continue
+            if bot.ai_state != BotAIState.ATTACKING:
+                continue
+            if self.influence_map is not None and not self.influence_map.has_line_of_fire(bot.position):
+                continue
+            shots = self._spend_shots(bot, now=now, frame_start=frame_start)
+            if shots == 0:
+                continue
+            dx = player_position[0] - bot.position[0]
+            dy = player_position[1] - bot.position[1]
+            dz = player_position[2] - bot.position[2]
+            chance = hit_probability(
+                accuracy_degrees=self.difficulty.accuracy_degrees,
+                distance=sqrt((dx * dx) + (dy * dy) + (dz * dz)),
+                target_radius=self.target_radius,
+            )
+            rng = self.rng_service.bot_stream(bot.bot_id)
+            hits = sum(1 for _ in range(shots) if rng.random() < chance)
+            damage = hits * bot.weapon.damage
+            total_damage += damage
+            shots_fired += shots
+            volleys.append(StatisticalVolley(bot_id=bot.bot_id, shots=shots, hits=hits, damage=damage))
+
+        applied = int(round(total_damage))
+        if player is not None and applied > 0:
+            player.apply_damage(applied)
+        self.last_shots = shots_fired
+        return StatisticalCombatResult(volleys=volleys, total_damage=total_damage, applied_damage=applied)
+
+    @staticmethod
+    def _spend_shots(bot: Bot, *, now: float, frame_start: float) -> int:
+        weapon = bot.weapon
+        cooldown = weapon.cooldown_seconds
+        first = max(weapon.last_fired_at + cooldown, frame_start)
+        if first > now:
+            return 0
+        shots = min(int(floor((now - first) / cooldown)) + 1, max(0, weapon.ammo_in_magazine))
+        weapon.ammo_in_magazine -= shots
+        if shots:
+            weapon.last_fired_at = first + ((shots - 1) * cooldown)
+        return shots
@@ -4,6 +4,7 @@ from src.weapons.assault_rifle import AssaultRifle
 from src.weapons.pistol import Pistol
 from src.weapons.rpg import RPG
 from src.weapons.shotgun import Shotgun
+from src.weapons.specs import WEAPON_SPECS, WeaponSpec, get_weapon_spec
 from src.weapons.switching import WeaponSwitchState
 from src.weapons.visuals import PrimitiveVisual, WeaponVisual, get_weapon_visual
 from src.weapons.weapon import Weapon
@@ -14,6 +15,9 @@ __all__ = [
     "Shotgun",
     "AssaultRifle",
     "RPG",
+    "WeaponSpec",
+    "WEAPON_SPECS",
+    "get_weapon_spec",
     "WeaponSwitchState",
     "PrimitiveVisual",
     "WeaponVisual",
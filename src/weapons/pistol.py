@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from src.weapons.specs import get_weapon_spec
 from src.weapons.weapon import Weapon
 
 
@@ -9,11 +10,5 @@ class Pistol(Weapon):
     """Default starter weapon with reliable semi-auto fire."""
 
     def __init__(self) -> None:
-        super().__init__(
-            name="Pistol",
-            damage=20.0,
-            fire_rate=3.0,
-            magazine_size=12,
-            reserve_ammo=48,
-        )
+        super().__init__(get_weapon_spec("Pistol"))
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from src.weapons.specs import get_weapon_spec
 from src.weapons.weapon import Weapon
 
 
@@ -9,16 +10,7 @@ class RPG(Weapon):
     """Endgame launcher that triggers the glitch sequence on fire."""
 
     def __init__(self) -> None:
-        super().__init__(
-            name="RPG",
-            damage=200.0,
-            fire_rate=0.5,
-            magazine_size=1,
-            reserve_ammo=3,
-            projectile_speed=45.0,
-            projectile_radius=0.3,
-            projectile_kind="rocket",
-        )
+        super().__init__(get_weapon_spec("RPG"))
         self.crash_triggered = False
 
     def fire(self, now: float) -> bool:
@@ -26,3 +18,9 @@ class RPG(Weapon):
         if fired:
             self.crash_triggered = True
         return fired
+
+    def fire_due(self, *, frame_start: float, now: float) -> list[float]:
+        shot_times = super().fire_due(frame_start=frame_start, now=now)
+        if shot_times:
+            self.crash_triggered = True
+        return shot_times
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import math
 
+from src.weapons.specs import get_weapon_spec
 from src.weapons.weapon import Weapon
 
 
@@ -11,25 +12,25 @@ class Shotgun(Weapon):
     """High-damage close-range weapon with pellet spread."""
 
     def __init__(self) -> None:
-        super().__init__(
-            name="Shotgun",
-            damage=12.0,
-            fire_rate=1.0,
-            magazine_size=8,
-            reserve_ammo=32,
-            projectile_speed=70.0,
-            projectile_radius=0.1,
-            projectile_kind="pellet",
-        )
-        self.pellet_count = 8
-        self.spread_degrees = 6.0
+        super().__init__(get_weapon_spec("Shotgun"))
 
     def create_projectile_payload(
         self,
         origin: tuple[float, float, float],
         direction: tuple[float, float, float],
+        pellet_directions: list[tuple[float, float, float]] | None = None,
     ) -> list[dict]:
+        """Return one payload per pellet.
+
+        Without `pellet_directions` the pellets use a deterministic fan. Callers
+        that want randomized spread pass pre-sampled unit directions, e.g. from
+        `ai.combat.vary_directions_with_accuracy(...)` with `spread_degrees`.
+        """
         base = super().create_projectile_payload(origin=origin, direction=direction)[0]
+        if pellet_directions is not None:
+            if len(pellet_directions) != self.pellet_count:
+                raise ValueError("pellet_directions must contain one direction per pellet.")
+            return [{**base, "direction": pellet_direction} for pellet_direction in pellet_directions]
         spread_rad = math.radians(self.spread_degrees)
         payload: list[dict] = []
         for index in range(self.pellet_count):
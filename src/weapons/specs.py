@@ -0,0 +1,81 @@
+"""Shared immutable weapon stat table."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class WeaponSpec:
+    """Static weapon stats shared by every owner of the same weapon type."""
+
+    name: str
+    damage: float
+    fire_rate: float
+    magazine_size: int
+    reserve_ammo: int
+    projectile_speed: float = 80.0
+    projectile_radius: float = 0.08
+    projectile_kind: str = "bullet"
+    pellet_count: int = 1
+    spread_degrees: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.fire_rate <= 0:
+            raise ValueError(f"fire_rate must be positive, got {self.fire_rate}")
+        if self.projectile_speed <= 0:
+            raise ValueError(f"projectile_speed must be positive, got {self.projectile_speed}")
+        if self.magazine_size <= 0:
+            raise ValueError(f"magazine_size must be positive, got {self.magazine_size}")
+        if self.pellet_count <= 0:
+            raise ValueError(f"pellet_count must be positive, got {self.pellet_count}")
+
+
+WEAPON_SPECS: dict[str, WeaponSpec] = {
+    "Pistol": WeaponSpec(
+        name="Pistol",
+        damage=20.0,
+        fire_rate=3.0,
+        magazine_size=12,
+        reserve_ammo=48,
+    ),
+    "Shotgun": WeaponSpec(
+        name="Shotgun",
+        damage=12.0,
+        fire_rate=1.0,
+        magazine_size=8,
+        reserve_ammo=32,
+        projectile_speed=70.0,
+        projectile_radius=0.1,
+        projectile_kind="pellet",
+        pellet_count=8,
+        spread_degrees=6.0,
+    ),
+    "AssaultRifle": WeaponSpec(
+        name="AssaultRifle",
+        damage=16.0,
+        fire_rate=9.0,
+        magazine_size=30,
+        reserve_ammo=120,
+        projectile_speed=95.0,
+        projectile_radius=0.07,
+        projectile_kind="bullet",
+    ),
+    "RPG": WeaponSpec(
+        name="RPG",
+        damage=200.0,
+        fire_rate=0.5,
+        magazine_size=1,
+        reserve_ammo=3,
+        projectile_speed=45.0,
+        projectile_radius=0.3,
+        projectile_kind="rocket",
+    ),
+}
+
+
+def get_weapon_spec(weapon_name: str) -> WeaponSpec:
+    """Return the shared stat spec for a known weapon."""
+    if weapon_name not in WEAPON_SPECS:
+        raise ValueError(f"No weapon spec for weapon '{weapon_name}'.")
+    return WEAPON_SPECS[weapon_name]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from math import sqrt
 
+from src.weapons.specs import WeaponSpec
+
 
 Vector3 = tuple[float, float, float]
 
@@ -24,28 +25,128 @@ def _normalize(direction: Vector3) -> Vector3:
     )
 
 
-@dataclass
+def schedule_shot_times(
+    *,
+    ready_at: float,
+    cooldown_seconds: float,
+    ammo: int,
+    frame_start: float,
+    now: float,
+) -> list[float]:
+    """Return every shot timestamp due between `frame_start` and `now`.
+
+    The first shot fires once the weapon is ready (never before the trigger window
+    opened) and later shots follow at exact cooldown intervals, so high fire rates
+    keep their DPS even when one frame spans several cooldowns.
+    """
+    if cooldown_seconds <= 0.0:
+        raise ValueError("cooldown_seconds must be positive.")
+    if frame_start > now:
+        raise ValueError("frame_start must not be after now.")
+    first_shot_at = max(ready_at, frame_start)
+    shot_times: list[float] = []
+    while len(shot_times) < ammo:
+        fired_at = first_shot_at + (len(shot_times) * cooldown_seconds)
+        if fired_at > now:
+            break
+        shot_times.append(fired_at)
+    return shot_times
+
+
+def advance_projectile_payloads(payload: list[dict], *, fired_at: float, now: float) -> list[dict]:
+    """Move payload origins forward to where each projectile is at `now`."""
+    age = max(0.0, now - fired_at)
+    advanced: list[dict] = []
+    for item in payload:
+        heading = _normalize(item["direction"])
+        travel = item["speed"] * age
+        origin = item["origin"]
+        advanced.append(
+            {
+                **item,
+                "origin": (
+                    origin[0] + (heading[0] * travel),
+                    origin[1] + (heading[1] * travel),
+                    origin[2] + (heading[2] * travel),
+                ),
+                "fired_at": fired_at,
+                "distance_traveled": travel,
+            }
+        )
+    return advanced
+
+
 class Weapon:
-    """Shared weapon attributes and firing cooldown logic."""
-
-    name: str
-    damage: float
-    fire_rate: float
-    magazine_size: int
-    reserve_ammo: int
-    projectile_speed: float = 80.0
-    projectile_radius: float = 0.08
-    projectile_kind: str = "bullet"
-    ammo_in_magazine: int | None = None
-    _last_fired_at: float = -1_000_000.0
-
-    def __post_init__(self) -> None:
-        if self.ammo_in_magazine is None:
-            self.ammo_in_magazine = self.magazine_size
-        if self.fire_rate <= 0:
-            raise ValueError(f"fire_rate must be positive, got {self.fire_rate}")
-        if self.projectile_speed <= 0:
-            raise ValueError(f"projectile_speed must be positive, got {self.projectile_speed}")
+    """Per-owner ammo and firing cooldown state over a shared `WeaponSpec`.
+
+    Stats (`damage`, `magazine_size`, projectile settings, ...) are read from the
+    immutable spec, so every owner of one weapon type shares a single stat
+    object. Without a `spec`, the stat keywords build a one-off spec for custom
+    weapons. `fire_rate` is `spec.fire_rate * fire_rate_multiplier`.
+    """
+
+    __slots__ = ("spec", "ammo_in_magazine", "reserve_ammo", "fire_rate_multiplier", "last_fired_at")
+
+    def __init__(
+        self,
+        spec: WeaponSpec | None = None,
+        *,
+        ammo_in_magazine: int | None = None,
+        fire_rate_multiplier: float = 1.0,
+        **stats,
+    ) -> None:
+        if spec is None:
+            spec = WeaponSpec(**stats)
+        elif stats:
+            raise ValueError("Pass either a weapon spec or weapon stats, not both.")
+        if fire_rate_multiplier <= 0:
+            raise ValueError(f"fire_rate_multiplier must be positive, got {fire_rate_multiplier}")
+        self.spec = spec
+        self.ammo_in_magazine = spec.magazine_size if ammo_in_magazine is None else ammo_in_magazine
+        self.reserve_ammo = spec.reserve_ammo
+        self.fire_rate_multiplier = fire_rate_multiplier
+        self.last_fired_at = -1_000_000.0
+
+    @classmethod
+    def from_spec(cls, spec: WeaponSpec, fire_rate_multiplier: float = 1.0) -> "Weapon":
+        """Create a fully loaded weapon for a shared spec."""
+        return cls(spec, fire_rate_multiplier=fire_rate_multiplier)
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def damage(self) -> float:
+        return self.spec.damage
+
+    @property
+    def magazine_size(self) -> int:
+        return self.spec.magazine_size
+
+    @property
+    def projectile_speed(self) -> float:
+        return self.spec.projectile_speed
+
+    @property
+    def projectile_radius(self) -> float:
+        return self.spec.projectile_radius
+
+    @property
+    def projectile_kind(self) -> str:
+        return self.spec.projectile_kind
+
+    @property
+    def pellet_count(self) -> int:
+        return self.spec.pellet_count
+
+    @property
+    def spread_degrees(self) -> float:
+        return self.spec.spread_degrees
+
+    @property
+    def fire_rate(self) -> float:
+        return self.spec.fire_rate * self.fire_rate_multiplier
 
     @property
     def cooldown_seconds(self) -> float:
@@ -64,7 +165,7 @@ class Weapon:
     def can_fire(self, now: float) -> bool:
         """Return True when weapon has ammo and cooldown is ready."""
         has_ammo = self.ammo_in_magazine > 0
-        off_cooldown = (now - self._last_fired_at) >= self.cooldown_seconds
+        off_cooldown = (now - self.last_fired_at) >= self.cooldown_seconds
         return has_ammo and off_cooldown
 
     def fire(self, now: float) -> bool:
@@ -72,9 +173,23 @@ class Weapon:
         if not self.can_fire(now):
             return False
         self.ammo_in_magazine -= 1
-        self._last_fired_at = now
+        self.last_fired_at = now
         return True
 
+    def fire_due(self, *, frame_start: float, now: float) -> list[float]:
+        """Fire every shot due since `frame_start` and return their timestamps."""
+        shot_times = schedule_shot_times(
+            ready_at=self.last_fired_at + self.cooldown_seconds,
+            cooldown_seconds=self.cooldown_seconds,
+            ammo=self.ammo_in_magazine,
+            frame_start=frame_start,
+            now=now,
+        )
+        if shot_times:
+            self.ammo_in_magazine -= len(shot_times)
+            self.last_fired_at = shot_times[-1]
+        return shot_times
+
     def reload(self) -> int:
         """Move reserve ammo into magazine and return rounds loaded."""
         if not self.can_reload():
@@ -98,3 +213,18 @@ class Weapon:
                 "damage": self.damage,
             }
         ]
+
+    def create_scheduled_projectile_payloads(
+        self,
+        *,
+        origin: Vector3,
+        direction: Vector3,
+        shot_times: list[float],
+        now: float,
+    ) -> list[dict]:
+        """Build payloads for sub-frame shots with origins advanced to `now`."""
+        payloads: list[dict] = []
+        for fired_at in shot_times:
+            payload = self.create_projectile_payload(origin=origin, direction=direction)
+            payloads.extend(advance_projectile_payloads(payload, fired_at=fired_at, now=now))
+        return payloads
@@ -1,12 +1,32 @@
-"""Pytest configuration for import resolution."""
+"""Pytest configuration for import resolution and shared test helpers."""
 
 from __future__ import annotations
 
 import sys
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+
+class StepClock:
+    """Fake clock that advances a fixed amount on every read."""
+
+    def __init__(self, step_seconds: float) -> None:
+        self.now = 0.0
+        self.step_seconds = step_seconds
+
+    def __call__(self) -> float:
+        value = self.now
+        self.now += self.step_seconds
+        return value
+
+
+@pytest.fixture
+def step_clock() -> type[StepClock]:
+    """Return the `StepClock` factory for budgeted systems that take a `clock`."""
+    return StepClock
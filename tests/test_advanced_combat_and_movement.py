@@ -1,3 +1,5 @@
+import pytest
+
 from src.core.camera import FirstPersonCamera
 from src.core.collision import AABB, CollisionWorld
 from src.core.input_handler import InputHandler, InputSnapshot
@@ -5,6 +7,7 @@ from src.core.movement import PlayerMovementController
 from src.core.raycasting import RaycastingSystem, RaycastTarget
 from src.player.player import Player
 from src.projectiles.physics import ProjectilePhysicsSystem
+from src.projectiles.projectile import Projectile
 from src.weapons.assault_rifle import AssaultRifle
 from src.weapons.rpg import RPG
 from src.weapons.shotgun import Shotgun
@@ -140,3 +143,95 @@ def test_projectile_system_and_collision_physics():
     collisions = physics.step(projectiles, delta_time=0.05, world=world)
     assert collisions == 1
     assert projectiles[0].is_active is False
+
+
+def test_held_trigger_spawns_sub_frame_projectiles_with_advanced_origins():
+    player = Player.with_starter_loadout(start_health=100, start_money=0)
+    player.add_weapon(AssaultRifle(), auto_equip=True)
+    rifle = player.equipped_weapon
+
+    projectiles = player.shoot_projectiles_held(
+        frame_start=1.0,
+        now=1.25,
+        origin=(0.0, 0.0, 0.0),
+        direction=(0.0, 0.0, 1.0),
+    )
+    assert len(projectiles) == 3
+    # The oldest shot has flown the longest, so origins lead in firing order.
+    assert projectiles[0].position[2] == pytest.approx(rifle.projectile_speed * 0.25)
+    assert projectiles[1].position[2] == pytest.approx(rifle.projectile_speed * (0.25 - rifle.cooldown_seconds))
+    assert projectiles[0].distance_traveled == pytest.approx(projectiles[0].position[2])
+
+    follow_up = player.shoot_projectiles_held(
+        frame_start=1.25,
+        now=1.35,
+        origin=(0.0, 0.0, 0.0),
+        direction=(0.0, 0.0, 1.0),
+    )
+    assert len(follow_up) == 1
+    assert rifle.ammo_in_magazine == rifle.magazine_size - 4
+
+
+def test_collision_world_ray_queries_find_first_static_contact():
+    world = CollisionWorld(
+        world_bounds=AABB(min_corner=(-10.0, -10.0, -10.0), max_corner=(10.0, 10.0, 10.0)),
+        static_walls=[
+            AABB(min_corner=(4.0, -1.0, -1.0), max_corner=(5.0, 1.0, 1.0)),
+            AABB(min_corner=(2.0, -1.0, 3.0), max_corner=(3.0, 1.0, 4.0)),
+        ],
+    )
+    assert world.static_impact_distance(
+        origin=(0.0, 0.0, 0.0), direction=(1.0, 0.0, 0.0), max_distance=50.0
+    ) == pytest.approx(4.0)
+    assert world.static_impact_distance(
+        origin=(0.0, 0.0, 0.0), direction=(1.0, 0.0, 0.0), max_distance=50.0, half_extent=0.5
+    ) == pytest.approx(3.5)
+    assert world.static_impact_distance(
+        origin=(0.0, 0.0, 0.0), direction=(-1.0, 0.0, 0.0), max_distance=50.0, half_extent=0.5
+    ) == pytest.approx(9.5)
+    assert world.static_impact_distance(
+        origin=(0.0, 0.0, 0.0), direction=(-1.0, 0.0, 0.0), max_distance=5.0
+    ) is None
+    assert world.static_walls[0].ray_entry_distance((4.5, 0.0, 0.0), (1.0, 0.0, 0.0)) == 0.0
+    assert world.static_walls[1].ray_entry_distance((0.0, 0.0, 0.0), (1.0, 0.0, 0.0)) is None
+
+
+def test_fast_projectile_uses_precomputed_impact_and_cannot_tunnel_thin_walls():
+    world = CollisionWorld(
+        world_bounds=AABB(min_corner=(-50.0, -5.0, -5.0), max_corner=(50.0, 5.0, 5.0)),
+        static_walls=[AABB(min_corner=(10.0, -2.0, -2.0), max_corner=(10.05, 2.0, 2.0))],
+    )
+    rifle = AssaultRifle()
+    projectiles = [
+        Projectile.from_payload(item)
+        for item in rifle.create_projectile_payload(origin=(0.0, 0.0, 0.0), direction=(1.0, 0.0, 0.0))
+    ]
+    physics = ProjectilePhysicsSystem()
+
+    assert physics.step(projectiles, delta_time=0.05, world=world) == 0
+    expected_impact = 10.0 - rifle.projectile_radius
+    assert projectiles[0].static_impact_distance == pytest.approx(expected_impact)
+
+    # One step jumps from x=4.75 to x=14.25, fully across the 5 cm wall.
+    assert physics.step(projectiles, delta_time=0.1, world=world) == 1
+    assert projectiles[0].is_active is False
+    assert projectiles[0].position[0] == pytest.approx(expected_impact)
+
+
+def test_sub_frame_projectile_spawned_past_wall_still_collides():
+    world = CollisionWorld(
+        world_bounds=AABB(min_corner=(-50.0, -5.0, -5.0), max_corner=(50.0, 5.0, 5.0)),
+        static_walls=[AABB(min_corner=(2.0, -2.0, -2.0), max_corner=(2.2, 2.0, 2.0))],
+    )
+    rifle = AssaultRifle()
+    payload = rifle.create_scheduled_projectile_payloads(
+        origin=(0.0, 0.0, 0.0),
+        direction=(1.0, 0.0, 0.0),
+        shot_times=[0.0],
+        now=0.1,
+    )
+    projectile = Projectile.from_payload(payload[0])
+    assert projectile.position[0] > 2.2
+
+    assert ProjectilePhysicsSystem().step([projectile], delta_time=0.0, world=world) == 1
+    assert projectile.position[0] == pytest.approx(2.0 - rifle.projectile_radius)
@@ -5,7 +5,7 @@ import pytest
 
 from config.config import ECONOMY_CONFIG
 from src.ai.bot import Bot, BotAIState
-from src.ai.navigation import WaypointPathfinder
+from src.ai.navigation import PathStrategy, WaypointPathfinder
 from src.ai.waves import WaveDirector
 from src.economy.money import MoneyPickupSystem, get_money_pickup_visual
 from src.environment import create_default_facility_layout
@@ -52,12 +52,115 @@ def test_waypoint_pathfinding_uses_nearest_start_goal():
         start_position=(1.0, 0.0, 0.2),
         goal_position=(9.9, 0.0, 4.7),
     )
-    assert path == [
+    assert path == (
         (0.0, 0.0, 0.0),
         (5.0, 0.0, 0.0),
         (10.0, 0.0, 0.0),
         (10.0, 0.0, 5.0),
-    ]
+    )
+
+
+def test_weighted_astar_and_next_hop_table_prefer_shorter_distance_over_fewer_hops():
+    pathfinder = WaypointPathfinder(
+        waypoints={
+            "a": (0.0, 0.0, 0.0),
+            "detour": (0.0, 0.0, 20.0),
+            "b": (3.0, 0.0, 0.5),
+            "c": (6.0, 0.0, 0.5),
+            "goal": (10.0, 0.0, 0.0),
+            "island": (50.0, 0.0, 50.0),
+        },
+        links={
+            "a": ["detour", "b"],
+            "detour": ["a", "goal"],
+            "b": ["a", "c"],
+            "c": ["b", "goal"],
+            "goal": ["c", "detour"],
+        },
+    )
+    assert pathfinder.find_waypoint_path("a", "goal") == ["a", "detour", "goal"]
+    weighted = ["a", "b", "c", "goal"]
+    assert pathfinder.find_waypoint_path("a", "goal", strategy=PathStrategy.WEIGHTED_ASTAR) == weighted
+
+    table = pathfinder.build_next_hop_table()
+    assert table["a"]["goal"] == "b"
+    assert table["detour"]["b"] == "a"
+    assert "island" not in table["a"]
+    pathfinder.strategy = PathStrategy.NEXT_HOP_TABLE
+    assert pathfinder.find_waypoint_path("a", "goal") == weighted
+    assert pathfinder.find_waypoint_path("goal", "a") == ["goal", "c", "b", "a"]
+    assert pathfinder.find_waypoint_path("a", "island") == []
+    assert pathfinder.find_waypoint_path("a", "island", strategy=PathStrategy.WEIGHTED_ASTAR) == []
+    assert pathfinder.find_waypoint_path("b", "b") == ["b"]
+    with pytest.raises(ValueError):
+        pathfinder.find_waypoint_path("a", "missing")
+
+
+def test_path_cache_shares_tuples_evicts_lru_and_invalidates_on_link_changes():
+    pathfinder = WaypointPathfinder(
+        waypoints={
+            "a": (0.0, 0.0, 0.0),
+            "b": (5.0, 0.0, 0.0),
+            "c": (10.0, 0.0, 0.0),
+            "d": (5.0, 0.0, 5.0),
+        },
+        links={"a": ["b"], "b": ["a", "c"], "c": ["b"], "d": []},
+        strategy=PathStrategy.NEXT_HOP_TABLE,
+        path_cache_size=2,
+    )
+    first = pathfinder.find_path((0.2, 0.0, 0.0), (9.8, 0.0, 0.0))
+    second = pathfinder.find_path((0.0, 0.0, -0.3), (10.0, 0.0, 0.4))
+    assert first is second
+    assert isinstance(first, tuple)
+    assert (pathfinder.path_cache_hits, pathfinder.path_cache_misses) == (1, 1)
+
+    pathfinder.find_path((10.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    pathfinder.find_path((5.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    assert pathfinder.find_path((0.0, 0.0, 0.0), (10.0, 0.0, 0.0)) is not first
+    assert pathfinder.path_cache_misses == 4
+
+    assert pathfinder.find_path((0.0, 0.0, 0.0), (5.0, 0.0, 5.0)) == ()
+    pathfinder.add_link("a", "d")
+    assert pathfinder.links_version == 1
+    assert pathfinder.find_path((0.0, 0.0, 0.0), (5.0, 0.0, 5.0)) == ((0.0, 0.0, 0.0), (5.0, 0.0, 5.0))
+    pathfinder.remove_link("b", "c")
+    assert pathfinder.find_path((0.0, 0.0, 0.0), (10.0, 0.0, 0.0)) == ()
+
+    with pytest.raises(ValueError):
+        WaypointPathfinder(waypoints={}, links={}, path_cache_size=-1)
+
+
+def test_waypoint_kd_index_matches_linear_nearest_scan_and_snaps_batches():
+    rng = Random(36)
+    waypoints = {
+        f"wp_{index}": (rng.uniform(-100.0, 100.0), 0.0, rng.uniform(-100.0, 100.0))
+        for index in range(500)
+    }
+    waypoints["dup_first"] = (200.0, 0.0, 0.0)
+    waypoints["dup_second"] = (200.0, 0.0, 0.0)
+    pathfinder = WaypointPathfinder(waypoints=waypoints, links={})
+
+    def linear_nearest(position):
+        return min(
+            waypoints,
+            key=lambda waypoint_id: sum((a - b) ** 2 for a, b in zip(position, waypoints[waypoint_id])),
+        )
+
+    probes = [(rng.uniform(-120.0, 120.0), rng.uniform(-2.0, 2.0), rng.uniform(-120.0, 120.0)) for _ in range(200)]
+    assert [pathfinder.nearest_waypoint(probe) for probe in probes] == [linear_nearest(probe) for probe in probes]
+    assert pathfinder.nearest_waypoint((210.0, 0.0, 0.0)) == "dup_first"
+    assert pathfinder.nearest_waypoints(probes + probes[:3]) == [linear_nearest(probe) for probe in probes + probes[:3]]
+
+    pathfinder.waypoints["late"] = (500.0, 0.0, 500.0)
+    pathfinder.rebuild_waypoint_index()
+    assert pathfinder.nearest_waypoint((490.0, 0.0, 490.0)) == "late"
+    assert pathfinder.links_version == 1
+
+    empty = WaypointPathfinder(waypoints={}, links={})
+    with pytest.raises(ValueError):
+        empty.nearest_waypoint((0.0, 0.0, 0.0))
+    with pytest.raises(ValueError):
+        empty.nearest_waypoints([(0.0, 0.0, 0.0)])
 
 
 def test_bot_shooting_accuracy_variance_and_cooldown():
@@ -181,3 +284,18 @@ def test_max_expected_bot_count_update_path_is_fast():
     assert director.bot_count_for_wave(20) == 13
     if elapsed >= 0.6:
         print(f"Warning: Performance test took {elapsed:.3f}s (expected < 0.6s)")
+
+
+def test_wave_bots_share_one_weapon_spec_with_per_bot_state():
+    layout = create_default_facility_layout()
+    bots = WaveDirector().spawn_wave(
+        wave_number=5,
+        spawn_positions=layout.bot_spawn_positions(),
+        rng=Random(3),
+    )
+    specs = {id(bot.weapon.spec) for bot in bots}
+    assert len(specs) == 1
+    assert bots[0].weapon is not bots[1].weapon
+
+    assert bots[0].shoot_at(now=1.0, target_position=(0.0, 0.0, 0.0), rng=Random(1))[0] is True
+    assert bots[0].weapon.ammo_in_magazine == bots[1].weapon.ammo_in_magazine - 1
@@ -0,0 +1,119 @@
+import pytest
+
+from src.ai.bot import Bot, BotAIState
+from src.behavior import (
+    DAMAGE_TAKEN,
+    PATH_DONE,
+    PLAYER_SEEN,
+    Action,
+    BehaviorRuntime,
+    BehaviorStatus,
+    Condition,
+    NodeKind,
+    Selector,
+    Sequence,
+    Wait,
+    build_bot_combat_tree,
+    compile_tree,
+)
+
+
+def test_trees_compile_to_shared_flat_node_arrays():
+    tree = compile_tree(
+        Selector(
+            Sequence(Condition(lambda board: True, watch=("alarm",)), Action(lambda board: BehaviorStatus.SUCCESS)),
+            Wait(1.0),
+        )
+    )
+    assert tree.kinds == [NodeKind.SELECTOR, NodeKind.SEQUENCE, NodeKind.CONDITION, NodeKind.ACTION, NodeKind.WAIT]
+    assert tree.children(0) == [1, 4]
+    assert tree.children(1) == [2, 3]
+    assert tree.subtree_end == [5, 4, 3, 4, 5]
+    assert tree.watched_events == frozenset({"alarm"})
+
+    first = BehaviorRuntime(tree)
+    second = BehaviorRuntime(tree)
+    assert first.tree is second.tree
+    with pytest.raises(ValueError):
+        compile_tree(Sequence())
+    with pytest.raises(ValueError):
+        compile_tree(Wait(-1.0))
+
+
+def test_sleeping_bots_cost_nothing_until_events_or_timers_wake_them():
+    runtime = BehaviorRuntime(build_bot_combat_tree(attack_recheck_seconds=0.5))
+    bots = [Bot.create_default(bot_id=f"bot-{index}", position=(float(index), 0.0, 0.0)) for index in range(200)]
+    for bot in bots:
+        runtime.add_bot(bot.bot_id, {"bot": bot})
+
+    assert runtime.update(0.0) == 200
+    assert all(bot.ai_state == BotAIState.CHASING for bot in bots)
+    assert runtime.sleeping_count == 200
+    for frame in range(1, 30):
+        assert runtime.update(frame / 60.0) == 0
+
+    hurt = bots[3]
+    hurt.apply_damage(80)
+    assert runtime.post_event(hurt.bot_id, DAMAGE_TAKEN)
+    assert runtime.update(0.5) == 1
+    assert hurt.ai_state == BotAIState.SEEKING_COVER
+    assert runtime.post_event(hurt.bot_id, PATH_DONE)
+    assert runtime.update(0.6) == 1
+    assert runtime.running_node(hurt.bot_id) is None
+
+    for bot in bots[10:15]:
+        runtime.blackboard(bot.bot_id)["player_visible"] = True
+        runtime.post_event(bot.bot_id, PLAYER_SEEN)
+    assert runtime.update(1.0) == 5
+    assert all(bot.ai_state == BotAIState.ATTACKING for bot in bots[10:15])
+    assert runtime.update(1.2) == 0
+    assert runtime.update(1.5) == 5
+
+    chaser = bots[40]
+    assert runtime.post_event(chaser.bot_id, PATH_DONE)
+    assert runtime.update(1.6) == 1
+    assert chaser.ai_state == BotAIState.IDLE
+    assert not runtime.post_event(chaser.bot_id, PATH_DONE)
+    assert runtime.broadcast(PLAYER_SEEN) == 200
+    runtime.remove_bot(chaser.bot_id)
+    assert runtime.update(1.7) == 199
+    with pytest.raises(ValueError):
+        runtime.add_bot(bots[0].bot_id)
+
+
+def test_wait_nodes_sleep_on_timers_and_watched_events_interrupt_them():
+    log: list[tuple[str, float]] = []
+
+    def respond(board):
+        log.append(("respond", board["now"]))
+        board["alarm"] = False
+        return BehaviorStatus.SUCCESS
+
+    def patrol(board):
+        log.append(("patrol", board["now"]))
+        return BehaviorStatus.SUCCESS
+
+    tree = compile_tree(
+        Selector(
+            Sequence(Condition(lambda board: board.get("alarm", False), watch=("alarm",)), Action(respond)),
+            Sequence(Wait(2.0), Action(patrol)),
+        )
+    )
+    runtime = BehaviorRuntime(tree)
+    board = runtime.add_bot("guard")
+
+    assert runtime.update(0.0) == 1
+    assert runtime.running_node("guard") == 5
+    assert runtime.update(1.0) == 0
+    board["alarm"] = True
+    assert runtime.post_event("guard", "alarm", payload="door")
+    assert runtime.update(1.5) == 1
+    assert log == [("respond", 1.5)]
+
+    # The interrupted wait restarts, then patrols once it has fully elapsed.
+    runtime.wake("guard")
+    assert runtime.update(1.6) == 1
+    assert runtime.update(2.0) == 0
+    assert runtime.update(3.6) == 1
+    assert log[-1] == ("patrol", 3.6)
+    assert runtime.running_node("guard") is None
@@ -0,0 +1,311 @@
+from concurrent.futures import ThreadPoolExecutor
+from math import acos, degrees, sqrt
+from random import Random
+
+import pytest
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.combat import vary_directions_with_accuracy
+from src.ai.firing import BotFireSystem
+from src.ai.swarm import BotSwarm
+from src.ai.tactics import TacticalAction, choose_tactical_action
+from src.ai.waves import WaveDirector
+from src.environment import create_default_facility_layout
+from src.rng import RngService, derive_seed
+from src.weapons.shotgun import Shotgun
+from src.weapons.specs import get_weapon_spec
+from src.weapons.weapon import Weapon
+
+
+def _armed_fire_system(bot_count: int) -> tuple[BotFireSystem, list[Bot]]:
+    system = BotFireSystem()
+    bots = [
+        Bot.create_default(bot_id=f"bot-{index}", position=(float(index), 0.0, -10.0))
+        for index in range(bot_count)
+    ]
+    for bot in bots:
+        system.register(bot, accuracy_degrees=2.0)
+        system.set_trigger(bot.bot_id, True)
+    return system, bots
+
+
+def test_bot_fire_system_resolves_all_ready_bots_in_one_pass():
+    system, bots = _armed_fire_system(5)
+    shots = system.resolve(now=1.0, target_position=(0.0, 0.0, 10.0), rng=Random(4))
+    assert [shot.bot_id for shot in shots] == [bot.bot_id for bot in bots]
+    for shot in shots:
+        assert shot.fired_at == 1.0
+        assert shot.direction[2] > 0.9
+        assert sum(component * component for component in shot.direction) == pytest.approx(1.0)
+    assert bots[0].weapon.ammo_in_magazine == bots[0].weapon.magazine_size - 1
+    assert bots[0].weapon.last_fired_at == 1.0
+
+    assert system.resolve(now=1.05, target_position=(0.0, 0.0, 10.0), rng=Random(4)) == []
+    assert len(system.resolve(now=1.12, target_position=(0.0, 0.0, 10.0), rng=Random(4))) == 5
+
+
+def test_bot_fire_system_skips_released_dead_and_empty_bots():
+    system, bots = _armed_fire_system(4)
+    system.set_trigger("bot-1", False)
+    bots[2].apply_damage(1_000)
+    system.unregister("bot-3")
+    system.register(Bot.create_default(bot_id="bot-late", position=(0.0, 0.0, 0.0)))
+    system.set_trigger("bot-late", True)
+
+    shots = system.resolve(now=2.0, target_position=(0.0, 0.0, 10.0), rng=Random(1))
+    assert [shot.bot_id for shot in shots] == ["bot-0", "bot-late"]
+
+    with pytest.raises(ValueError):
+        system.register(bots[0])
+    with pytest.raises(ValueError):
+        system.set_trigger("bot-3", True)
+
+
+def test_bot_fire_system_reuses_freed_slots_and_drops_their_heap_entries():
+    system, bots = _armed_fire_system(3)
+    for wave in range(20):
+        system.unregister("bot-1")
+        assert len(system._schedule) == 2
+        late = Bot.create_default(bot_id="bot-1", position=(0.0, 0.0, 0.0))
+        late.weapon.last_fired_at = 10.0 + wave
+        assert system.register(late) == 1
+        system.set_trigger("bot-1", True)
+    assert len(system) == 3
+    assert len(system.ready_at) == len(system.ammo) == len(system._bots) == 3
+    assert len(system._schedule) == 3
+
+    # The freed slot's old entry (ready long ago) must not fire the new bot early.
+    shots = system.resolve(now=2.0, target_position=(0.0, 0.0, 10.0), rng=Random(3))
+    assert [shot.bot_id for shot in shots] == ["bot-0", "bot-2"]
+    assert system.slot_for("bot-1") == 1
+
+
+def test_bot_fire_system_reload_rearms_bot_after_empty_magazine():
+    system, bots = _armed_fire_system(1)
+    system.ammo[0] = 1
+    assert len(system.resolve(now=1.0, target_position=(0.0, 0.0, 10.0), rng=Random(2))) == 1
+    assert bots[0].weapon.ammo_in_magazine == 0
+    assert system.resolve(now=5.0, target_position=(0.0, 0.0, 10.0), rng=Random(2)) == []
+
+    assert system.reload("bot-0") == bots[0].weapon.magazine_size
+    assert system.ammo[system.slot_for("bot-0")] == bots[0].weapon.magazine_size
+    assert len(system.resolve(now=5.0, target_position=(0.0, 0.0, 10.0), rng=Random(2))) == 1
+
+
+def test_bot_fire_system_emits_every_sub_frame_shot_in_long_frames():
+    system, bots = _armed_fire_system(2)
+    shots = system.resolve(
+        now=1.25,
+        frame_start=1.0,
+        target_position=(0.0, 0.0, 10.0),
+        rng=Random(8),
+    )
+    cooldown = bots[0].weapon.cooldown_seconds
+    assert len(shots) == 6
+    bot_zero_times = [shot.fired_at for shot in shots if shot.bot_id == "bot-0"]
+    assert bot_zero_times == [1.0, pytest.approx(1.0 + cooldown), pytest.approx(1.0 + (2 * cooldown))]
+    assert bots[0].weapon.last_fired_at == pytest.approx(1.0 + (2 * cooldown))
+
+    assert system.resolve(now=1.25, target_position=(0.0, 0.0, 10.0), rng=Random(8)) == []
+
+
+def test_bot_swarm_stores_rows_in_arrays_and_exposes_bot_views():
+    layout = create_default_facility_layout()
+    director = WaveDirector()
+    swarm = director.spawn_swarm(
+        wave_number=4,
+        spawn_positions=layout.bot_spawn_positions(),
+        rng=Random(42),
+        bot_count=2_000,
+    )
+    assert len(swarm) == 2_000
+    assert director.bot_count_for_wave(4) < len(swarm)
+    difficulty = director.difficulty_for_wave(4)
+
+    view = swarm.view("wave-4-bot-1")
+    assert view.health == difficulty.bot_health
+    assert view.ai_state == BotAIState.IDLE
+    assert view.weapon.fire_rate == pytest.approx(swarm.weapon_spec.fire_rate * difficulty.fire_rate_multiplier)
+
+    plain_wave = director.spawn_wave(wave_number=4, spawn_positions=layout.bot_spawn_positions(), rng=Random(42))
+    small_swarm = director.spawn_swarm(wave_number=4, spawn_positions=layout.bot_spawn_positions(), rng=Random(42))
+    assert [bot.position for bot in plain_wave] == [bot.position for bot in small_swarm.views()]
+
+    fired, _ = view.shoot_at(now=1.0, target_position=(0.0, 1.0, 0.0), rng=Random(1))
+    assert fired is True
+    assert swarm.ammo[swarm.index_of("wave-4-bot-1")] == swarm.weapon_spec.magazine_size - 1
+
+    view.position = (1.0, 0.0, 2.0)
+    assert swarm.position_of(0) == (1.0, 0.0, 2.0)
+    assert choose_tactical_action(
+        bot=view,
+        player_position=(1.0, 0.0, 6.0),
+        cover_objects=[],
+        ally_count=0,
+    ) == TacticalAction.ATTACK
+
+
+def test_bot_swarm_vectorized_damage_states_and_compaction():
+    swarm = BotSwarm()
+    for index in range(6):
+        swarm.add(bot_id=f"b{index}", position=(float(index), 0.0, 0.0), max_health=100)
+
+    changed = swarm.set_states(swarm.alive_indices(), BotAIState.CHASING)
+    assert changed == 6
+    assert swarm.count_in_state(BotAIState.CHASING) == 6
+
+    killed = swarm.apply_damage([0, 1, 2], [100, 40, 250])
+    assert killed == [0, 2]
+    assert swarm.health[1] == 60
+    assert swarm.apply_damage([0], 10) == []
+    assert swarm.view("b0").ai_state == BotAIState.DEAD
+    assert swarm.set_states([0, 1], BotAIState.ATTACKING) == 1
+
+    splash = swarm.apply_area_damage((4.0, 0.0, 0.0), radius=1.0, amount=500)
+    assert splash == [3, 4, 5]
+    assert swarm.indices_in_state(BotAIState.ATTACKING) == [1]
+
+    survivor = swarm.view("b1")
+    removed = swarm.compact()
+    assert removed == ["b0", "b2", "b3", "b4", "b5"]
+    assert len(swarm) == 1
+    assert survivor.health == 60
+    assert survivor.position == (1.0, 0.0, 0.0)
+
+    with pytest.raises(ValueError):
+        swarm.apply_damage([0], [-1])
+    with pytest.raises(ValueError):
+        swarm.view("b0")
+    with pytest.raises(ValueError):
+        swarm.add(bot_id="b1", position=(0.0, 0.0, 0.0), max_health=100)
+
+
+def test_bot_swarm_takes_fractional_weapon_damage():
+    swarm = BotSwarm()
+    for index in range(3):
+        swarm.add(bot_id=f"b{index}", position=(float(index), 0.0, 0.0), max_health=100)
+    rifle_damage = get_weapon_spec("AssaultRifle").damage
+    assert isinstance(rifle_damage, float)
+
+    assert swarm.view("b0").apply_damage(rifle_damage) is False
+    assert swarm.view("b0").health == pytest.approx(100.0 - rifle_damage)
+    assert swarm.apply_damage([1, 2], [rifle_damage, 12.5]) == []
+    assert list(swarm.health[1:]) == [pytest.approx(100.0 - rifle_damage), pytest.approx(87.5)]
+    assert swarm.apply_damage([2], 87.5) == [2]
+    assert swarm.view("b2").ai_state == BotAIState.DEAD
+    assert swarm.apply_area_damage((0.0, 0.0, 0.0), radius=1.5, amount=rifle_damage * 0.5) == []
+
+
+def test_bot_swarm_round_trips_plain_bots_and_works_with_fire_system():
+    bots = [Bot.create_default(bot_id=f"plain-{index}", position=(float(index), 0.0, -5.0)) for index in range(3)]
+    bots[2].apply_damage(1_000)
+    swarm = BotSwarm.from_bots(bots)
+    assert swarm.alive_indices() == [0, 1]
+    assert swarm.view("plain-2").ai_state == BotAIState.DEAD
+
+    system = BotFireSystem()
+    for view in swarm.views():
+        system.register(view)
+        system.set_trigger(view.bot_id, True)
+    shots = system.resolve(now=1.0, target_position=(0.0, 0.0, 5.0), rng=Random(5))
+    assert [shot.bot_id for shot in shots] == ["plain-0", "plain-1"]
+    assert list(swarm.ammo[:2]) == [swarm.weapon_spec.magazine_size - 1] * 2
+    assert list(swarm.last_fired_at[:2]) == [1.0, 1.0]
+
+    bots[1].weapon = Weapon.from_spec(get_weapon_spec("Pistol"))
+    with pytest.raises(ValueError):
+        BotSwarm.from_bots(bots)
+    with pytest.raises(ValueError):
+        BotSwarm.from_bots(bots[:1], weapon_spec=get_weapon_spec("Pistol"))
+
+
+def _angle_degrees(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b)) / (sqrt(sum(x * x for x in a)) * sqrt(sum(y * y for y in b)))
+    return degrees(acos(max(-1.0, min(1.0, dot))))
+
+
+def test_batched_accuracy_cone_sampling_stays_inside_per_row_cones():
+    directions = [(0.0, 0.0, 1.0), (0.0, 0.0, -4.0), (0.0, 2.0, 0.0), (1.0, -1.0, 0.5)] * 250
+    accuracies = [1.0, 3.0, 6.0, 0.0] * 250
+    varied = vary_directions_with_accuracy(directions=directions, accuracy_degrees=accuracies, rng=Random(11))
+    assert len(varied) == len(directions)
+    for base, sample, accuracy in zip(directions, varied, accuracies):
+        assert sum(component * component for component in sample) == pytest.approx(1.0)
+        assert _angle_degrees(base, sample) <= accuracy + 1e-6
+
+    # Uniform cap sampling puts the mean deflection near two thirds of the cone angle.
+    wide = vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)] * 4_000, accuracy_degrees=6.0, rng=Random(3))
+    mean_angle = sum(_angle_degrees((0.0, 0.0, 1.0), sample) for sample in wide) / len(wide)
+    assert mean_angle == pytest.approx(4.0, abs=0.2)
+
+    assert vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)], accuracy_degrees=2.0, rng=Random(9)) == (
+        vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)], accuracy_degrees=[2.0], rng=Random(9))
+    )
+    with pytest.raises(ValueError):
+        vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)], accuracy_degrees=[1.0, 2.0], rng=Random(1))
+    with pytest.raises(ValueError):
+        vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)], accuracy_degrees=-1.0, rng=Random(1))
+
+
+def test_batched_cone_sampling_drives_shotgun_pellet_spread():
+    shotgun = Shotgun()
+    pellets = vary_directions_with_accuracy(
+        directions=[(1.0, 0.0, 0.0)] * shotgun.pellet_count,
+        accuracy_degrees=shotgun.spread_degrees,
+        rng=Random(21),
+    )
+    payload = shotgun.create_projectile_payload(
+        origin=(0.0, 1.0, 0.0),
+        direction=(1.0, 0.0, 0.0),
+        pellet_directions=pellets,
+    )
+    assert [item["direction"] for item in payload] == pellets
+    assert len({item["direction"] for item in payload}) == shotgun.pellet_count
+    assert all(item["kind"] == "pellet" for item in payload)
+
+    with pytest.raises(ValueError):
+        shotgun.create_projectile_payload(origin=(0.0, 0.0, 0.0), direction=(1.0, 0.0, 0.0), pellet_directions=pellets[:2])
+
+
+def test_rng_service_streams_are_order_independent_and_replayable():
+    service = RngService(seed=2024)
+    first = [service.bot_stream("bot-a").random() for _ in range(3)]
+
+    reordered = RngService(seed=2024)
+    reordered.bot_stream("bot-b").random()
+    reordered.wave_stream(3).random()
+    assert [reordered.bot_stream("bot-a").random() for _ in range(3)] == first
+
+    replay = service.fresh("bot", "bot-a")
+    assert [replay.random() for _ in range(3)] == first
+    assert service.bot_stream("bot-a") is service.bot_stream("bot-a")
+
+    assert derive_seed(1, "bot", 1) != derive_seed(1, "bot", "1")
+    assert RngService(seed=1).system_stream("ai").random() != RngService(seed=2).system_stream("ai").random()
+    assert service.spawn("shard", 0).seed != service.spawn("shard", 1).seed
+    with pytest.raises(ValueError):
+        service.stream()
+
+
+def test_per_bot_streams_make_sharded_fire_resolution_bit_identical():
+    bots = [Bot.create_default(bot_id=f"bot-{index}", position=(float(index), 0.0, -10.0)) for index in range(8)]
+
+    def resolve_shard(shard: list[Bot]) -> dict[str, tuple[float, float, float]]:
+        system = BotFireSystem(rng_service=RngService(seed=77))
+        for bot in shard:
+            system.register(Bot.create_default(bot_id=bot.bot_id, position=bot.position))
+            system.set_trigger(bot.bot_id, True)
+        return {shot.bot_id: shot.direction for shot in system.resolve(now=1.0, target_position=(0.0, 0.0, 10.0))}
+
+    combined = resolve_shard(bots)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        sharded_results = list(pool.map(resolve_shard, [bots[::2], list(reversed(bots[1::2]))]))
+    sharded = {bot_id: direction for result in sharded_results for bot_id, direction in result.items()}
+    assert sharded == combined
+
+    wave_a = WaveDirector().spawn_wave(wave_number=2, spawn_positions=[(0.0, 0.0, 0.0), (5.0, 0.0, 5.0)], rng=RngService(seed=5).wave_stream(2))
+    wave_b = WaveDirector().spawn_wave(wave_number=2, spawn_positions=[(0.0, 0.0, 0.0), (5.0, 0.0, 5.0)], rng=RngService(seed=5).wave_stream(2))
+    assert [bot.position for bot in wave_a] == [bot.position for bot in wave_b]
+
+    with pytest.raises(ValueError):
+        BotFireSystem().resolve(now=1.0, target_position=(0.0, 0.0, 0.0))
@@ -0,0 +1,148 @@
+from itertools import combinations
+from math import cos, dist, sin
+from random import Random
+
+import pytest
+
+from src.ai.bot import Bot
+from src.ai.waves import WaveDirector
+from src.core.collision import AABB
+from src.crowd import BotLocomotion, CrowdSteering, SpatialHash, WallGrid
+from src.environment import build_collision_world, build_navmesh, create_default_facility_layout
+
+
+def _overlaps_wall(world, position, half_extent=0.3):
+    x, _, z = position
+    box = AABB(min_corner=(x - half_extent, 0.05, z - half_extent), max_corner=(x + half_extent, 1.0, z + half_extent))
+    return world.collides_with_wall(box)
+
+
+def test_crowd_steering_spreads_a_stacked_wave_without_entering_walls():
+    layout = create_default_facility_layout()
+    world = build_collision_world(layout)
+    director = WaveDirector(max_extra_bots=30)
+    bots = director.spawn_wave(wave_number=16, spawn_positions=[(0.0, 0.0, 6.0)], rng=Random(1))
+    positions = [bot.position for bot in bots]
+    assert len(set(positions)) == 1
+
+    steering = CrowdSteering(collision_world=world)
+    for _ in range(120):
+        directions = steering.steer(positions)
+        positions = [
+            (position[0] + (direction[0] * 0.1), position[1], position[2] + (direction[2] * 0.1))
+            for position, direction in zip(positions, directions)
+        ]
+        assert all(dist((0.0, 0.0, 0.0), direction) <= 1.0 + 1e-9 for direction in directions)
+
+    assert min(dist(a, b) for a, b in combinations(positions, 2)) > 0.9
+    assert not any(_overlaps_wall(world, position) for position in positions)
+    assert steering.last_neighbor_checks < len(positions) * (len(positions) - 1)
+
+
+def test_spatial_hash_keeps_neighbour_checks_local_in_large_crowds():
+    positions = [(column * 2.0, 0.0, row * 2.0) for column in range(20) for row in range(20)]
+    steering = CrowdSteering(neighbor_radius=1.2)
+    directions = steering.steer(positions)
+    assert directions == [(0.0, 0.0, 0.0)] * len(positions)
+    assert steering.last_neighbor_checks < len(positions) * 4
+
+    crowded = [(column * 1.0, 0.0, row * 1.0) for column in range(20) for row in range(20)]
+    steering.steer(crowded)
+    assert 0 < steering.last_neighbor_checks < len(crowded) * (len(crowded) - 1) // 20
+
+    spatial_hash = SpatialHash(1.0)
+    spatial_hash.rebuild([(0.2, 0.0, 0.2), (1.5, 0.0, 0.5), (5.0, 0.0, 5.0)])
+    assert sorted(spatial_hash.candidates((0.5, 0.0, 0.5))) == [0, 1]
+    with pytest.raises(ValueError):
+        SpatialHash(0.0)
+
+
+def test_crowd_steering_aligns_with_paths_and_turns_away_from_walls():
+    layout = create_default_facility_layout()
+    world = build_collision_world(layout)
+    steering = CrowdSteering(collision_world=world)
+
+    open_floor = steering.steer([(-2.0, 0.0, 5.0)], [(0.0, 0.0, 1.0)])
+    assert open_floor == [(0.0, 0.0, 1.0)]
+
+    # Heading straight at the central hall's east wall, away from any doorway.
+    toward_wall = (1.0, 0.0, 0.0)
+    near_wall = (3.0, 0.0, 0.0)
+    direction = steering.steer([near_wall], [toward_wall])[0]
+    assert direction != toward_wall
+    assert abs(direction[2]) > 0.3
+    assert direction[0] < toward_wall[0]
+    with pytest.raises(ValueError):
+        steering.steer([near_wall], [])
+
+
+def test_wall_grid_probes_match_the_full_collision_world():
+    world = build_collision_world(create_default_facility_layout())
+    grid = WallGrid(world, cell_size=3.0)
+    rng = Random(5)
+    for _ in range(200):
+        origin = (rng.uniform(-20.0, 20.0), 0.4, rng.uniform(-20.0, 20.0))
+        angle = rng.uniform(0.0, 6.283)
+        direction = (cos(angle), 0.0, sin(angle))
+        expected = world.static_impact_distance(origin=origin, direction=direction, max_distance=1.5, half_extent=0.35)
+        assert grid.impact_distance(origin=origin, direction=direction, max_distance=1.5, half_extent=0.35) == expected
+    assert len(grid.walls_in(-1.0, -1.0, 1.0, 1.0)) < len(world.static_walls)
+    with pytest.raises(ValueError):
+        WallGrid(world, cell_size=0.0)
+
+
+def test_bot_locomotion_moves_at_speed_lands_on_goals_and_slides_along_walls():
+    world = build_collision_world(create_default_facility_layout())
+    locomotion = BotLocomotion(collision_world=world, speed=2.0)
+    runner = Bot.create_default(bot_id="runner", position=(-2.0, 0.0, 5.0))
+    locomotion.set_path(runner.bot_id, [(-2.0, 0.0, 6.0), (0.0, 0.0, 6.0)])
+
+    assert locomotion.step([runner], 0.25) == []
+    assert runner.position == pytest.approx((-2.0, 0.0, 5.5))
+    for _ in range(10):
+        arrived = locomotion.step([runner], 0.25)
+        if arrived:
+            break
+    assert arrived == ["runner"]
+    assert runner.position == pytest.approx((0.0, 0.0, 6.0))
+    assert not locomotion.has_path(runner.bot_id)
+    assert locomotion.step([runner], 0.25) == []
+
+    # Pushing diagonally into the central hall's east wall slides along it.
+    slider = Bot.create_default(bot_id="slider", position=(3.0, 0.0, 0.0))
+    locomotion.set_path(slider.bot_id, [(9.0, 0.0, 6.0)])
+    for _ in range(8):
+        locomotion.step([slider], 0.1)
+    assert 3.3 < slider.position[0] < 3.45
+    assert slider.position[2] > 1.0
+    assert not _overlaps_wall(world, slider.position, half_extent=0.3)
+
+    locomotion.set_path(slider.bot_id, [])
+    assert locomotion.remaining_path(slider.bot_id) == []
+    with pytest.raises(ValueError):
+        BotLocomotion(collision_world=world, speed=0.0)
+    with pytest.raises(ValueError):
+        locomotion.step([slider], -1.0)
+
+
+def test_bot_locomotion_moves_a_steered_crowd_along_navmesh_paths():
+    layout = create_default_facility_layout()
+    world = build_collision_world(layout)
+    navmesh = build_navmesh(layout)
+    rng = Random(3)
+    bots = [
+        Bot.create_default(bot_id=f"bot-{index}", position=(rng.uniform(-11.0, -5.0), 0.0, rng.uniform(2.0, 7.0)))
+        for index in range(40)
+    ]
+    locomotion = BotLocomotion(collision_world=world, steering=CrowdSteering(collision_world=world))
+    for bot in bots:
+        goal = (rng.uniform(-3.0, 3.0), 0.0, rng.uniform(-9.0, 9.0))
+        locomotion.set_path(bot.bot_id, navmesh.find_path(bot.position, goal))
+
+    arrived: set[str] = set()
+    for _ in range(600):
+        arrived.update(locomotion.step(bots, 1.0 / 30.0))
+        assert not any(_overlaps_wall(world, bot.position, half_extent=0.3) for bot in bots)
+        if locomotion.last_moved:
+            assert locomotion.last_wall_tests < len(world.static_walls) * locomotion.last_moved
+    assert len(arrived) >= 38
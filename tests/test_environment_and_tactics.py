@@ -1,13 +1,32 @@
+from math import dist
 from random import Random
 
 import pytest
 
-from src.ai.bot import Bot
-from src.ai.tactics import TacticalAction, build_flank_route, choose_tactical_action, find_cover_plan
+from src.ai.bot import Bot, BotAIState
+from src.ai.lod import AILodPolicy, AILodScheduler, AILodTier
+from src.ai.navigation import PathStrategy
+from src.ai.tactics import (
+    CoverService,
+    TacticalAction,
+    build_flank_route,
+    choose_tactical_action,
+    find_cover_plan,
+)
 from src.ai.waves import WaveDirector
 from src.core.collision import AABB
 from src.core.movement import PlayerMovementController
-from src.environment import build_collision_world, build_waypoint_pathfinder, create_default_facility_layout
+from src.environment import (
+    CoverObject,
+    NavMesh,
+    NavPolygon,
+    bake_cover_database,
+    build_collision_world,
+    build_cover_database,
+    build_navmesh,
+    build_waypoint_pathfinder,
+    create_default_facility_layout,
+)
 
 
 def test_default_facility_has_five_rooms_and_doorway_connectivity():
@@ -68,6 +87,99 @@ def test_layout_navigation_data_builds_pathfinder_with_connected_path():
     assert len(path) >= 3
     assert path[0] == layout.waypoints["wp_lobby"]
     assert path[-1] == layout.waypoints["wp_lab"]
+    assert pathfinder.strategy == PathStrategy.NEXT_HOP_TABLE
+    assert path == pathfinder.find_path(
+        start_position=(-8.0, 0.0, 0.0),
+        goal_position=(8.0, 0.0, 6.0),
+        strategy=PathStrategy.WEIGHTED_ASTAR,
+    )
+
+
+def _path_length(path):
+    return sum(dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_navmesh_bakes_from_layout_and_string_pulls_paths_around_cover():
+    layout = create_default_facility_layout()
+    navmesh = build_navmesh(layout)
+    assert build_navmesh(layout) is navmesh
+    assert build_navmesh(layout, agent_radius=0.5) is not navmesh
+    assert {polygon.area_id for polygon in navmesh.polygons} >= set(layout.rooms) | {
+        doorway.doorway_id for doorway in layout.doorways
+    }
+    assert navmesh.polygon_at((0.0, 0.0, 0.0)) is None
+    assert navmesh.polygon_at((-9.5, 0.0, -1.0)) is None
+    assert navmesh.polygon_at((-4.0, 0.0, 0.0)) is not None
+    assert navmesh.polygon_at((-4.0, 0.0, 5.0)) is None
+
+    start = (-8.0, 0.0, 0.0)
+    goal = (10.5, 0.0, 4.0)
+    path = navmesh.find_path(start, goal)
+    assert path[0] == start and path[-1] == goal
+    assert navmesh.find_path(start, (8.0, 0.0, 6.0))[-1] == pytest.approx((6.85, 0.0, 6.0))
+    for a, b in zip(path, path[1:]):
+        for step in range(21):
+            t = step / 20.0
+            sample = (a[0] + ((b[0] - a[0]) * t), 0.0, a[2] + ((b[2] - a[2]) * t))
+            assert navmesh.polygon_at(sample) is not None
+    waypoint_path = build_waypoint_pathfinder(layout).find_path(start, goal)
+    assert _path_length(path) < _path_length([start, *waypoint_path, goal])
+
+    around_pillar = navmesh.find_path((-2.0, 0.0, 0.0), (2.0, 0.0, 0.0))
+    assert len(around_pillar) == 4
+    assert all(abs(corner[2]) == pytest.approx(0.9 + navmesh.agent_radius) for corner in around_pillar[1:3])
+    assert navmesh.find_path((-6.0, 0.0, 3.0), (-5.0, 0.0, 4.0)) == [(-6.0, 0.0, 3.0), (-5.0, 0.0, 4.0)]
+
+    islands = NavMesh(
+        polygons=[NavPolygon(0, "a", 0.0, 1.0, 0.0, 1.0), NavPolygon(1, "b", 3.0, 4.0, 0.0, 1.0)],
+        agent_radius=0.35,
+    )
+    assert islands.find_path((0.5, 0.0, 0.5), (3.5, 0.0, 0.5)) == []
+    with pytest.raises(ValueError):
+        build_navmesh(layout, agent_radius=0.0)
+
+
+def test_navmesh_funnel_bends_at_inner_corners_of_asymmetric_corridors():
+    corridors = [
+        ([NavPolygon(0, "a", 0.0, 10.0, 0.0, 2.0), NavPolygon(1, "b", 8.0, 10.0, 2.0, 10.0)], (1.0, 1.0), (9.0, 9.0), (8.0, 2.0)),
+        ([NavPolygon(0, "a", 0.0, 10.0, 0.0, 2.0), NavPolygon(1, "b", 0.0, 2.0, 2.0, 10.0)], (9.0, 1.0), (1.0, 9.0), (2.0, 2.0)),
+        ([NavPolygon(0, "a", 0.0, 2.0, 0.0, 10.0), NavPolygon(1, "b", 2.0, 10.0, 8.0, 10.0)], (1.0, 1.0), (9.0, 9.0), (2.0, 8.0)),
+    ]
+    for polygons, start, goal, corner in corridors:
+        navmesh = NavMesh(polygons=polygons, agent_radius=0.35)
+        start_3d = (start[0], 0.0, start[1])
+        goal_3d = (goal[0], 0.0, goal[1])
+        corner_3d = (corner[0], 0.0, corner[1])
+        assert navmesh.find_path(start_3d, goal_3d) == [start_3d, corner_3d, goal_3d]
+        assert navmesh.find_path(goal_3d, start_3d) == [goal_3d, corner_3d, start_3d]
+
+
+def test_navmesh_paths_keep_agents_clear_of_wall_boxes():
+    layout = create_default_facility_layout()
+    world = build_collision_world(layout)
+    navmesh = build_navmesh(layout, agent_radius=0.35)
+    assert build_navmesh(layout, agent_radius=0.35, wall_thickness=0.0) is not navmesh
+    rng = Random(1)
+    points = [
+        (rng.uniform(room.min_x, room.max_x), 0.0, rng.uniform(room.min_z, room.max_z))
+        for room in layout.rooms.values()
+        for _ in range(8)
+    ]
+    pairs = [((-5.28, 0.0, -12.42), (-11.26, 0.0, 3.06))] + [tuple(rng.sample(points, 2)) for _ in range(40)]
+    for start, goal in pairs:
+        path = navmesh.find_path(start, goal)
+        assert path
+        for a, b in zip(path, path[1:]):
+            for step in range(41):
+                t = step / 40.0
+                x = a[0] + ((b[0] - a[0]) * t)
+                z = a[2] + ((b[2] - a[2]) * t)
+                assert navmesh.polygon_at((x, 0.0, z)) is not None
+                # Slightly under the agent radius, so grazing a wall face is allowed.
+                box = AABB(min_corner=(x - 0.34, 0.05, z - 0.34), max_corner=(x + 0.34, 1.0, z + 0.34))
+                assert not world.collides_with_wall(box)
+    with pytest.raises(ValueError):
+        build_navmesh(layout, wall_thickness=-0.1)
 
 
 def test_cover_selection_and_tactical_action_choice():
@@ -196,3 +308,185 @@ def test_bot_ai_selects_cover_flank_and_attack_across_scenarios():
             cover_objects=layout.cover_objects,
             ally_count=0,
         )
+
+
+def test_cover_service_matches_linear_cover_search_and_shares_work_between_bots():
+    layout = create_default_facility_layout()
+    service = CoverService(layout.cover_objects)
+    rng = Random(42)
+    for _ in range(60):
+        player_position = (rng.uniform(-12.0, 12.0), 0.0, rng.uniform(-14.0, 10.0))
+        bot_position = (rng.uniform(-12.0, 12.0), 0.0, rng.uniform(-14.0, 10.0))
+        expected = find_cover_plan(
+            bot_position=bot_position,
+            player_position=service.quantize(player_position),
+            cover_objects=layout.cover_objects,
+        )
+        assert service.find_cover(bot_position=bot_position, player_position=player_position) == expected
+
+    service = CoverService(layout.cover_objects)
+    player_position = (-2.0, 0.0, -1.0)
+    squad = [Bot.create_default(bot_id=f"squad-{index}", position=(-7.5 + index, 0.0, -1.0)) for index in range(8)]
+    for bot in squad:
+        bot.health = 25
+        shared = choose_tactical_action(
+            bot=bot,
+            player_position=player_position,
+            cover_objects=layout.cover_objects,
+            ally_count=0,
+            cover_service=service,
+        )
+        assert shared == choose_tactical_action(
+            bot=bot,
+            player_position=player_position,
+            cover_objects=layout.cover_objects,
+            ally_count=0,
+        )
+    assert service.queries == len(squad)
+    assert service.anchor_computations <= len(layout.cover_objects)
+    service.find_cover(bot_position=(0.0, 0.0, 5.0), player_position=(-2.1, 0.0, -1.1))
+    assert service.anchor_computations <= len(layout.cover_objects)
+    service.find_cover(bot_position=(0.0, 0.0, 5.0), player_position=(3.0, 0.0, 3.0))
+    assert service.anchor_computations > len(layout.cover_objects)
+
+
+def test_cover_service_only_visits_nearby_cover_in_large_maps():
+    covers = [
+        CoverObject(
+            cover_id=f"crate-{row}-{column}",
+            kind="crate",
+            min_corner=(column * 20.0, 0.0, row * 20.0),
+            max_corner=((column * 20.0) + 1.5, 1.5, (row * 20.0) + 1.5),
+        )
+        for row in range(10)
+        for column in range(10)
+    ]
+    service = CoverService(covers)
+    plan = service.find_cover(bot_position=(42.0, 0.0, 38.0), player_position=(60.0, 0.0, 60.0))
+    assert plan == find_cover_plan(
+        bot_position=(42.0, 0.0, 38.0),
+        player_position=(60.0, 0.0, 60.0),
+        cover_objects=covers,
+    )
+    assert plan is not None
+    assert service.candidates_checked < 10
+    with pytest.raises(ValueError):
+        CoverService(covers, quantum=0.0)
+
+
+def _ray_blocked(world, origin, target):
+    direction = tuple(b - a for a, b in zip(origin, target))
+    length = dist(origin, target)
+    hit = world.static_impact_distance(
+        origin=origin,
+        direction=tuple(component / length for component in direction),
+        max_distance=length,
+    )
+    return hit is not None and hit < length - 1e-6
+
+
+def test_cover_database_bakes_ray_tested_spots_and_picks_hidden_cover():
+    layout = create_default_facility_layout()
+    database = build_cover_database(layout)
+    assert build_cover_database(layout) is database
+    world = build_collision_world(layout)
+    assert database.cell_count > 0
+    assert {spot.cover_id for spot in database.spots} == {cover.cover_id for cover in layout.cover_objects}
+    for spot in database.spots:
+        x, y, z = spot.position
+        assert layout.find_room_for_position(spot.position) is not None
+        assert not world.collides_with_wall(AABB(min_corner=(x - 0.3, y, z - 0.3), max_corner=(x + 0.3, y + 1.0, z + 0.3)))
+
+    rng = Random(7)
+    for spot in rng.sample(database.spots, 6):
+        eye = (spot.position[0], spot.position[1] + 1.0, spot.position[2])
+        for bit in rng.sample(range(database.cell_count), 10):
+            assert spot.is_hidden_from(1 << bit) == _ray_blocked(world, eye, database.cell_centers[bit])
+
+    player_position = (-2.0, 0.0, -1.0)
+    bot_position = (-7.5, 0.0, -1.0)
+    spot = database.nearest_hidden_spot(bot_position=bot_position, threat_positions=(player_position,))
+    assert spot is not None
+    player_cell = database.cell_centers[database.cell_bit(player_position)]
+    assert _ray_blocked(world, (spot.position[0], 1.0, spot.position[2]), player_cell)
+    assert spot in database.hidden_spots((player_position,))
+    plan = find_cover_plan(
+        bot_position=bot_position,
+        player_position=player_position,
+        cover_objects=layout.cover_objects,
+        cover_database=database,
+    )
+    assert plan is not None
+    assert plan.anchor_position == spot.position
+    assert find_cover_plan(
+        bot_position=bot_position,
+        player_position=player_position,
+        cover_objects=layout.cover_objects,
+        max_cover_distance=0.1,
+        cover_database=database,
+    ) is None
+
+    bot = Bot.create_default(bot_id="baked", position=bot_position)
+    bot.health = 20
+    assert choose_tactical_action(
+        bot=bot,
+        player_position=player_position,
+        cover_objects=layout.cover_objects,
+        ally_count=0,
+        cover_database=database,
+    ) == TacticalAction.TAKE_COVER
+    with pytest.raises(ValueError):
+        bake_cover_database(layout, cell_size=0.0)
+
+
+def test_ai_lod_tiers_follow_distance_and_room_visibility():
+    layout = create_default_facility_layout()
+    scheduler = AILodScheduler(layout=layout)
+    player_position = (-8.0, 0.0, 2.0)
+    visible = scheduler.visible_rooms(player_position)
+    assert visible == {"lobby", "central_hall", "security"}
+
+    assert scheduler.tier_for(bot_position=(-9.5, 0.0, -3.0), player_position=player_position, visible_rooms=visible) == AILodTier.NEAR
+    assert scheduler.tier_for(bot_position=(3.0, 0.0, 8.0), player_position=player_position, visible_rooms=visible) == AILodTier.MID
+    # The lab is close enough for MID by distance but is not visible from the lobby.
+    assert scheduler.tier_for(bot_position=(5.0, 0.0, 3.0), player_position=player_position, visible_rooms=visible) == AILodTier.FAR
+
+    bots = [
+        Bot.create_default(bot_id="near", position=(-9.5, 0.0, -3.0)),
+        Bot.create_default(bot_id="far", position=(9.0, 0.0, 7.8)),
+    ]
+    decisions = scheduler.update(bots=bots, now=1.0, player_position=player_position, cover_objects=layout.cover_objects)
+    by_id = {decision.bot_id: decision for decision in decisions}
+    assert by_id["near"].action is not None
+    assert by_id["far"].action is None
+    assert bots[1].ai_state == BotAIState.CHASING
+
+    # Far bots sleep for their interval while near bots update every frame.
+    decisions = scheduler.update(bots=bots, now=1.1, player_position=player_position, cover_objects=layout.cover_objects)
+    assert [decision.bot_id for decision in decisions] == ["near"]
+
+
+def test_ai_lod_budget_time_slices_updates_round_robin(step_clock):
+    layout = create_default_facility_layout()
+    clock = step_clock(step_seconds=0.0004)
+    scheduler = AILodScheduler(layout=layout, policy=AILodPolicy(frame_budget_us=1_000.0), clock=clock)
+    bots = [Bot.create_default(bot_id=f"bot-{index}", position=(-9.0, 0.0, -2.0 + index * 0.1)) for index in range(6)]
+    bots[4].apply_damage(1_000)
+
+    updated: list[str] = []
+    for frame in range(3):
+        decisions = scheduler.update(
+            bots=bots,
+            now=float(frame),
+            player_position=(-8.0, 0.0, 2.0),
+            cover_objects=layout.cover_objects,
+        )
+        assert 1 <= len(decisions) <= 3
+        if frame == 0:
+            assert scheduler.last_frame_deferred > 0
+        updated.extend(decision.bot_id for decision in decisions)
+    assert set(updated) == {"bot-0", "bot-1", "bot-2", "bot-3", "bot-5"}
+    assert updated[:3] == ["bot-0", "bot-1", "bot-2"]
+
+    with pytest.raises(ValueError):
+        AILodPolicy(near_distance=10.0, mid_distance=5.0)
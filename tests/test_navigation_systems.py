@@ -0,0 +1,332 @@
+from dataclasses import replace
+from random import Random
+
+import pytest
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.navigation import PathStrategy, WaypointPathfinder
+from src.ai.waves import WaveDirector
+from src.environment import (
+    CoverObject,
+    Doorway,
+    Room,
+    build_navmesh,
+    build_waypoint_pathfinder,
+    create_default_facility_layout,
+)
+from src.pathfinding import (
+    DStarLitePlanner,
+    FlowField,
+    HierarchicalPlanner,
+    PathRequestService,
+    PathRequestStatus,
+)
+
+
+def _follow_flow(field: FlowField, start, step: float = 0.25, max_steps: int = 400):
+    position = start
+    for _ in range(max_steps):
+        if field.cell_index(position) == field.goal_cell:
+            return position
+        direction = field.direction_at(position)
+        position = (position[0] + (direction[0] * step), 0.0, position[2] + (direction[2] * step))
+        assert field.cell_index(position) is not None
+    raise AssertionError(f"Flow from {start} never reached the goal cell.")
+
+
+def test_flow_field_steers_every_room_to_the_player_and_rebuilds_only_on_cell_change():
+    layout = create_default_facility_layout()
+    field = FlowField.from_layout(layout)
+    player_position = layout.player_spawn_position()
+
+    assert field.update(player_position) is True
+    nudged_goal = (player_position[0] + 0.1, 0.0, player_position[2] + 0.1)
+    assert field.update(nudged_goal) is False
+    assert field.rebuild_count == 1
+
+    for spawn in layout.bot_spawn_positions():
+        assert field.distance_at(spawn) < float("inf")
+        _follow_flow(field, spawn)
+
+    storage = (9.0, 0.0, -8.0)
+    lab = (10.0, 0.0, 9.0)
+    assert field.distance_at(lab) > field.distance_at((0.0, 0.0, 8.0))
+    inside_goal = field.direction_at((nudged_goal[0] - 0.3, 0.0, nudged_goal[2]))
+    assert inside_goal == pytest.approx((1.0, 0.0, 0.0))
+
+    assert field.update((8.0, 0.0, -4.0)) is True
+    assert field.rebuild_count == 2
+    assert field.distance_at(storage) < field.distance_at(lab)
+    assert field.direction_at((0.0, 0.0, 0.0)) == (0.0, 0.0, 0.0)
+    assert field.direction_at((100.0, 0.0, 100.0)) == (0.0, 0.0, 0.0)
+
+
+def test_flow_field_steers_on_mesh_positions_in_wall_cells_toward_the_goal():
+    layout = create_default_facility_layout()
+    field = FlowField.from_layout(layout)
+    field.update(layout.player_spawn_position())
+    rng = Random(5)
+    near_wall_rooms: set[str] = set()
+    for polygon in field.navmesh.polygons:
+        for _ in range(60):
+            start = (rng.uniform(polygon.min_x, polygon.max_x), 0.0, rng.uniform(polygon.min_z, polygon.max_z))
+            if field.navmesh.polygon_at(start) is None or field.cell_index(start) is not None:
+                continue
+            near_wall_rooms.add(polygon.area_id)
+            assert field.direction_at(start) != (0.0, 0.0, 0.0)
+            assert field.distance_at(start) < float("inf")
+            position = start
+            for _ in range(800):
+                if field.cell_index(position) == field.goal_cell:
+                    break
+                direction = field.direction_at(position)
+                position = (position[0] + (direction[0] * 0.1), 0.0, position[2] + (direction[2] * 0.1))
+            else:
+                raise AssertionError(f"Flow from {start} never reached the goal cell.")
+    assert near_wall_rooms >= set(layout.rooms)
+
+
+def test_flow_field_serves_chasing_bots_only_and_validates_inputs():
+    layout = create_default_facility_layout()
+    field = FlowField(navmesh=build_navmesh(layout), cell_size=0.5)
+    field.update((-9.0, 0.0, 3.0))
+
+    chaser = Bot.create_default(bot_id="chaser", position=(8.0, 0.0, -8.0))
+    chaser.set_state(BotAIState.CHASING)
+    attacker = Bot.create_default(bot_id="attacker", position=(8.0, 0.0, -8.5))
+    attacker.set_state(BotAIState.ATTACKING)
+    dead = Bot.create_default(bot_id="dead", position=(8.0, 0.0, -9.0))
+    dead.set_state(BotAIState.CHASING)
+    dead.apply_damage(dead.max_health)
+
+    directions = field.chase_directions([chaser, attacker, dead])
+    assert set(directions) == {"chaser"}
+    assert directions["chaser"] == field.direction_at(chaser.position)
+    assert directions["chaser"] != (0.0, 0.0, 0.0)
+    assert field.directions_for([chaser.position, (100.0, 0.0, 0.0)])[1] == (0.0, 0.0, 0.0)
+
+    with pytest.raises(ValueError):
+        FlowField(navmesh=build_navmesh(layout), cell_size=0.0)
+
+
+def test_hierarchical_planner_searches_rooms_first_and_refines_legs_lazily():
+    layout = create_default_facility_layout()
+    planner = HierarchicalPlanner(layout=layout)
+    start = (-8.0, 0.0, -12.0)
+    goal = (10.5, 0.0, 4.0)
+
+    plan = planner.plan(start, goal)
+    assert plan.rooms == ("security", "lobby", "central_hall", "lab")
+    assert plan.doorways == ("lobby_to_security", "lobby_to_central", "central_to_lab")
+    assert planner.last_abstract_expansions <= len(layout.doorways) + 1
+    assert plan.refined_leg_count == 0
+
+    first_leg = plan.advance()
+    assert first_leg[0] == start
+    assert first_leg[-1] == planner.doorway_point("lobby_to_security")
+    assert plan.refined_leg_count == 1
+    security_polygons = [polygon for polygon in planner.navmesh.polygons if polygon.area_id == "security"]
+    assert planner.navmesh.last_search_expansions <= len(security_polygons) + 1
+
+    path = plan.full_path()
+    assert plan.refined_leg_count == plan.leg_count == 4
+    assert path[0] == start and path[-1] == goal
+    for corner in path:
+        assert planner.navmesh.polygon_at(corner) is not None
+    assert planner.find_path((-2.0, 0.0, 0.0), (2.0, 0.0, 0.0))[1:3] == [(-1.25, 0.0, -1.25), (1.25, 0.0, -1.25)]
+    with pytest.raises(ValueError):
+        plan.leg(4)
+
+
+def test_hierarchical_planner_reports_unreachable_rooms():
+    layout = create_default_facility_layout()
+    sealed = replace(
+        layout,
+        doorways=[doorway for doorway in layout.doorways if doorway.doorway_id != "lobby_to_security"],
+    )
+    planner = HierarchicalPlanner(layout=sealed)
+    assert planner.plan((-8.0, 0.0, 0.0), (-8.0, 0.0, -12.0)) is None
+    assert planner.find_path((-8.0, 0.0, 0.0), (-8.0, 0.0, -12.0)) == []
+    assert planner.plan((-8.0, 0.0, 0.0), (10.5, 0.0, 4.0)).rooms == ("lobby", "central_hall", "lab")
+
+
+def test_hierarchical_planner_replans_around_rooms_split_by_cover():
+    rooms = {
+        room_id: Room(room_id, min_x=x, max_x=x + 8.0, min_z=z, max_z=z + 8.0)
+        for room_id, (x, z) in {"r00": (0.0, 0.0), "r10": (8.0, 0.0), "r01": (0.0, 8.0), "r11": (8.0, 8.0)}.items()
+    }
+    doorways = [
+        Doorway("d00_10", "r00", "r10", "x", 8.0, 4.0, 3.0),
+        Doorway("d00_01", "r00", "r01", "z", 8.0, 4.0, 3.0),
+        Doorway("d10_11", "r10", "r11", "z", 8.0, 12.0, 3.0),
+        Doorway("d01_11", "r01", "r11", "x", 8.0, 12.0, 3.0),
+    ]
+    walls = [
+        # Splits r00 between its two doorways.
+        CoverObject("r00_wall", "barrier", (0.0, 0.0, 6.0), (8.0, 1.2, 6.6)),
+        # Seals off the far corner of r11.
+        CoverObject("r11_wall_x", "barrier", (12.0, 0.0, 12.0), (16.0, 1.2, 12.6)),
+        CoverObject("r11_wall_z", "barrier", (12.0, 0.0, 12.0), (12.6, 1.2, 16.0)),
+    ]
+    layout = replace(create_default_facility_layout(), rooms=rooms, doorways=doorways, cover_objects=walls)
+    planner = HierarchicalPlanner(layout=layout)
+
+    # The shortest room route crosses r00, whose doorway-to-doorway leg is cut off.
+    path = planner.plan((10.0, 0.0, 3.0), (3.0, 0.0, 10.0))
+    assert path.rooms == ("r10", "r00", "r01")
+    assert path.advance()
+    assert path.advance() == ()
+    assert path.blocked_leg == 1
+    assert path.full_path() == []
+    assert planner.is_transit_blocked("r00", "d00_01", "d00_10")
+
+    corners = planner.find_path((10.0, 0.0, 3.0), (3.0, 0.0, 10.0))
+    assert planner.last_replans == 0
+    assert corners[0] == (10.0, 0.0, 3.0) and corners[-1] == (3.0, 0.0, 10.0)
+    assert (12.0, 0.0, 8.0) in corners and (8.0, 0.0, 12.0) in corners
+
+    # Start and goal in the same split room: the route goes around the whole ring.
+    corners = planner.find_path((3.0, 0.0, 3.0), (3.0, 0.0, 7.0))
+    assert planner.last_replans == 1
+    assert len(corners) == 6 and corners[-1] == (3.0, 0.0, 7.0)
+    for a, b in zip(corners, corners[1:]):
+        assert planner.navmesh.find_path(a, b) == [a, b]
+
+    # Every route into the sealed corner ends with an unreachable leg.
+    sealed = planner.plan((10.0, 0.0, 3.0), (14.5, 0.0, 14.5))
+    assert sealed.full_path() == []
+    assert sealed.blocked_leg == sealed.leg_count - 1
+    assert planner.find_path((10.0, 0.0, 3.0), (14.5, 0.0, 14.5)) == []
+
+
+def test_path_request_service_time_slices_wave_replans_and_keeps_previous_paths(step_clock):
+    layout = create_default_facility_layout()
+    pathfinder = build_waypoint_pathfinder(layout)
+    bots = WaveDirector().spawn_wave(wave_number=10, spawn_positions=layout.bot_spawn_positions(), rng=Random(40))
+    assert len(bots) >= 13
+    service = PathRequestService(planner=pathfinder.find_path, budget_us=300.0, clock=step_clock(0.0001))
+    delivered: list[str] = []
+    handles = [
+        service.submit(
+            requester_id=bot.bot_id,
+            start=bot.position,
+            goal=layout.player_spawn_position(),
+            callback=lambda request: delivered.append(request.requester_id),
+        )
+        for bot in bots
+    ]
+    assert service.pending_count == len(bots)
+    assert service.current_path(bots[0].bot_id) is None
+
+    first_frame = service.process()
+    assert 1 <= len(first_frame) < len(bots)
+    assert delivered == [request.requester_id for request in first_frame]
+    assert service.last_frame_processed == len(first_frame)
+    while service.pending_count:
+        service.process()
+    assert sorted(delivered) == sorted(bot.bot_id for bot in bots)
+    assert all(handle.status == PathRequestStatus.DONE for handle in handles)
+    assert service.current_path(bots[0].bot_id) == handles[0].path
+
+    old_path = service.current_path(bots[0].bot_id)
+    stale = service.submit(requester_id=bots[0].bot_id, start=bots[0].position, goal=(8.0, 0.0, 6.0))
+    fresh = service.submit(requester_id=bots[0].bot_id, start=bots[0].position, goal=(8.0, 0.0, -6.0))
+    assert stale.status == PathRequestStatus.CANCELLED
+    assert service.current_path(bots[0].bot_id) == old_path
+    assert service.process(budget_us=1_000_000.0) == [fresh]
+    assert service.current_path(bots[0].bot_id)[-1] == (8.0, 0.0, -6.0)
+    assert service.cancel(fresh) is False
+
+
+def test_path_request_service_reports_failures_and_forgets_requesters():
+    def planner(start, goal):
+        if goal[0] > 100.0:
+            raise ValueError("goal outside facility")
+        return [start, goal]
+
+    service = PathRequestService(planner=planner)
+    failed = service.submit(requester_id="a", start=(0.0, 0.0, 0.0), goal=(500.0, 0.0, 0.0))
+    kept = service.submit(requester_id="b", start=(0.0, 0.0, 0.0), goal=(1.0, 0.0, 0.0))
+    dropped = service.submit(requester_id="c", start=(0.0, 0.0, 0.0), goal=(2.0, 0.0, 0.0))
+    service.forget("c")
+    assert service.process(budget_us=1_000_000.0) == [failed, kept]
+    assert failed.status == PathRequestStatus.FAILED and failed.error == "goal outside facility"
+    assert dropped.status == PathRequestStatus.CANCELLED
+    assert service.current_path("a") is None
+    assert service.current_path("b") == ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    with pytest.raises(ValueError):
+        PathRequestService(planner=planner, budget_us=0.0)
+
+
+def _grid_pathfinder(size: int) -> WaypointPathfinder:
+    waypoints = {f"{row}_{column}": (float(column), 0.0, float(row)) for row in range(size) for column in range(size)}
+    links = {
+        f"{row}_{column}": [
+            f"{row + d_row}_{column + d_column}"
+            for d_row, d_column in ((0, 1), (1, 0), (0, -1), (-1, 0))
+            if 0 <= row + d_row < size and 0 <= column + d_column < size
+        ]
+        for row in range(size)
+        for column in range(size)
+    }
+    return WaypointPathfinder(waypoints=waypoints, links=links)
+
+
+def _path_cost(pathfinder: WaypointPathfinder, waypoint_ids: list[str]) -> float:
+    return sum(pathfinder.link_length(a, b) for a, b in zip(waypoint_ids, waypoint_ids[1:]))
+
+
+def test_dstar_lite_repairs_only_what_blocked_links_change():
+    pathfinder = _grid_pathfinder(12)
+    planner = DStarLitePlanner(pathfinder=pathfinder, start_id="0_0", goal_id="11_11")
+    path = planner.path()
+    assert _path_cost(pathfinder, path) == pytest.approx(22.0)
+    initial_expansions = planner.last_expansions
+
+    pathfinder.block_link("11_0", "11_1")
+    assert planner.path() == path
+    assert planner.last_expansions <= 2
+
+    rng = Random(41)
+    for _ in range(12):
+        index = rng.randrange(len(path) - 1)
+        pathfinder.block_link(path[index], path[index + 1])
+        pathfinder.block_link(path[index + 1], path[index])
+        path = planner.path()
+        reference = pathfinder.find_waypoint_path(planner.start_id, "11_11", strategy=PathStrategy.WEIGHTED_ASTAR)
+        assert _path_cost(pathfinder, path) == pytest.approx(_path_cost(pathfinder, reference))
+        assert planner.last_expansions < initial_expansions
+        for a, b in zip(path, path[1:]):
+            assert (a, b) not in pathfinder.blocked_links
+        planner.move_start(path[1])
+        path = planner.path()
+        assert path[0] == planner.start_id
+
+    for from_id, to_id in sorted(pathfinder.blocked_links):
+        pathfinder.unblock_link(from_id, to_id)
+    assert planner.cost_to_goal(planner.start_id) == pytest.approx(
+        _path_cost(pathfinder, pathfinder.find_waypoint_path(planner.start_id, "11_11"))
+    )
+
+
+def test_blocked_links_apply_to_every_strategy_and_can_isolate_the_goal():
+    pathfinder = _grid_pathfinder(3)
+    planner = DStarLitePlanner(pathfinder=pathfinder, start_id="0_0", goal_id="2_2")
+    assert len(planner.path()) == 5
+    version = pathfinder.links_version
+    pathfinder.block_link("2_1", "2_2")
+    pathfinder.block_link("1_2", "2_2")
+    assert pathfinder.links_version == version + 2
+    assert planner.path() == []
+    for strategy in PathStrategy:
+        assert pathfinder.find_waypoint_path("0_0", "2_2", strategy=strategy) == []
+    assert pathfinder.link_cost("2_1", "2_2") == float("inf")
+
+    planner.close()
+    pathfinder.unblock_link("1_2", "2_2")
+    assert planner.path() == []
+    assert pathfinder.find_waypoint_path("0_0", "2_2", strategy=PathStrategy.NEXT_HOP_TABLE)[-2:] == ["1_2", "2_2"]
+    with pytest.raises(ValueError):
+        pathfinder.block_link("0_0", "2_2")
+    with pytest.raises(ValueError):
+        DStarLitePlanner(pathfinder=pathfinder, start_id="0_0", goal_id="missing")
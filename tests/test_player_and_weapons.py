@@ -6,7 +6,8 @@ from src.weapons.assault_rifle import AssaultRifle
 from src.weapons.pistol import Pistol
 from src.weapons.rpg import RPG
 from src.weapons.shotgun import Shotgun
-from src.weapons.weapon import Weapon
+from src.weapons.specs import get_weapon_spec
+from src.weapons.weapon import Weapon, schedule_shot_times
 
 
 def test_player_starter_loadout_and_properties():
@@ -162,3 +163,81 @@ def test_running_out_of_ammo_blocks_fire_until_reload():
     assert loaded == 2
     assert pistol.ammo_in_magazine == 2
     assert player.shoot(3.0) is True
+
+
+def test_weapon_spec_table_drives_concrete_weapon_stats():
+    for weapon in (Pistol(), Shotgun(), AssaultRifle(), RPG()):
+        spec = get_weapon_spec(weapon.name)
+        assert weapon.damage == spec.damage
+        assert weapon.fire_rate == spec.fire_rate
+        assert weapon.magazine_size == spec.magazine_size
+        assert weapon.projectile_kind == spec.projectile_kind
+        assert weapon.spec is spec
+    assert Shotgun().pellet_count == get_weapon_spec("Shotgun").pellet_count
+    assert Pistol().spec is Pistol().spec
+
+    custom = Weapon(name="TestGun", damage=5, fire_rate=5, magazine_size=2, reserve_ammo=0)
+    assert custom.spec.name == "TestGun" and custom.ammo_in_magazine == 2
+
+    with pytest.raises(ValueError):
+        get_weapon_spec("Railgun")
+    with pytest.raises(ValueError):
+        Weapon(get_weapon_spec("Pistol"), damage=99.0)
+
+
+def test_weapons_share_spec_and_scale_cooldown_per_owner():
+    spec = get_weapon_spec("AssaultRifle")
+    base = Weapon.from_spec(spec)
+    boosted = Weapon.from_spec(spec, fire_rate_multiplier=2.0)
+    assert base.spec is boosted.spec
+    assert boosted.fire_rate == spec.fire_rate * 2.0
+    assert boosted.cooldown_seconds == pytest.approx(base.cooldown_seconds * 0.5)
+
+    assert boosted.fire(1.0) is True
+    assert boosted.fire(1.0 + boosted.cooldown_seconds + 1e-6) is True
+    assert base.fire(1.0) is True
+    assert base.fire(1.0 + boosted.cooldown_seconds + 1e-6) is False
+    assert boosted.ammo_in_magazine == spec.magazine_size - 2
+
+    boosted.ammo_in_magazine = 0
+    assert boosted.can_fire(10.0) is False
+    assert boosted.reload() == spec.magazine_size
+    assert boosted.reserve_ammo == spec.reserve_ammo - spec.magazine_size
+
+    with pytest.raises(ValueError):
+        Weapon.from_spec(spec, fire_rate_multiplier=0.0)
+
+
+def test_sub_frame_fire_schedule_keeps_rifle_dps_at_low_frame_rates():
+    rifle = AssaultRifle()
+    frame_time = 0.25
+    now = 1.0
+    shot_times: list[float] = []
+    for _ in range(4):
+        shot_times.extend(rifle.fire_due(frame_start=now, now=now + frame_time))
+        now += frame_time
+
+    assert len(shot_times) == 9
+    assert shot_times[0] == 1.0
+    for earlier, later in zip(shot_times, shot_times[1:]):
+        assert later - earlier == pytest.approx(rifle.cooldown_seconds)
+    assert rifle.ammo_in_magazine == rifle.magazine_size - 9
+
+    boosted = Weapon.from_spec(get_weapon_spec("AssaultRifle"), fire_rate_multiplier=1.5)
+    assert len(boosted.fire_due(frame_start=0.0, now=0.5)) == 7
+
+    with pytest.raises(ValueError):
+        schedule_shot_times(ready_at=0.0, cooldown_seconds=0.1, ammo=5, frame_start=1.0, now=0.5)
+
+
+def test_sub_frame_fire_schedule_respects_ammo_and_rpg_trigger():
+    assert schedule_shot_times(ready_at=0.0, cooldown_seconds=0.1, ammo=3, frame_start=0.0, now=1.0) == [
+        0.0,
+        pytest.approx(0.1),
+        pytest.approx(0.2),
+    ]
+    assert schedule_shot_times(ready_at=2.0, cooldown_seconds=0.1, ammo=3, frame_start=0.0, now=1.0) == []
+
+    rpg = RPG()
+    assert rpg.fire_due(frame_start=0.0, now=1.0) == [0.0]
+    assert rpg.crash_triggered is True
@@ -0,0 +1,338 @@
+from math import acos, atan2, dist
+from random import Random
+
+import pytest
+
+from src.ai.bot import Bot, BotAIState
+from src.ai.combat import vary_directions_with_accuracy
+from src.ai.firing import BotFireSystem
+from src.ai.lod import AILodTier
+from src.ai.tactics import TacticalAction, choose_tactical_action
+from src.ai.waves import WaveDirector
+from src.environment import build_collision_world, create_default_facility_layout
+from src.player.player import Player
+from src.rng import RngService
+from src.squad import (
+    AttackTokenArbiter,
+    InfluenceMap,
+    SquadCoordinator,
+    SquadRole,
+    StatisticalCombat,
+    hit_probability,
+)
+
+
+def _distance_2d(a, b):
+    return dist((a[0], a[2]), (b[0], b[2]))
+
+
+def test_squad_coordinator_matches_per_bot_rules_and_splits_flankers_from_suppressors():
+    layout = create_default_facility_layout()
+    rng = Random(11)
+    bots = [
+        Bot.create_default(bot_id=f"bot-{index}", position=(rng.uniform(-11.0, 11.0), 0.0, rng.uniform(-13.0, 9.0)))
+        for index in range(24)
+    ]
+    for bot in bots[::4]:
+        bot.health = 20
+    bots[3].health = 0
+    player_position = (-2.0, 0.0, 1.0)
+    coordinator = SquadCoordinator(cover_objects=layout.cover_objects, max_flankers_per_squad=3)
+
+    orders = coordinator.assign(bots=bots, player_position=player_position)
+
+    living = [bot for bot in bots if bot.is_alive]
+    assert [order.bot_id for order in orders] == [bot.bot_id for bot in living]
+    flankers = [order for order in orders if order.role == SquadRole.FLANKER]
+    suppressors = [order for order in orders if order.role == SquadRole.SUPPRESSOR]
+    assert 0 < len(flankers) <= 3
+    assert suppressors
+    for bot, order in zip(living, orders):
+        expected = choose_tactical_action(
+            bot=bot,
+            player_position=player_position,
+            cover_objects=layout.cover_objects,
+            ally_count=len(living) - 1,
+            cover_service=coordinator.cover_service,
+        )
+        assert order.ally_count == len(living) - 1
+        assert order.distance_to_player == pytest.approx(_distance_2d(bot.position, player_position))
+        if expected == TacticalAction.FLANK:
+            assert order.role in (SquadRole.FLANKER, SquadRole.SUPPRESSOR)
+        else:
+            assert order.action == expected
+    for order in flankers:
+        assert order.action == TacticalAction.FLANK
+        assert order.flank_route[-1] == player_position
+    for order in suppressors:
+        assert order.action == TacticalAction.ATTACK
+        assert order.flank_route is None
+    nearest_suppressor = min(order.distance_to_player for order in suppressors)
+    assert max(order.distance_to_player for order in flankers) <= nearest_suppressor
+
+    assert coordinator.last_cover_lookups < len(living)
+    assert coordinator.distance_between("bot-0", "bot-1") == pytest.approx(
+        _distance_2d(bots[0].position, bots[1].position)
+    )
+    assert coordinator.distance_between("bot-1", "bot-0") == coordinator.distance_between("bot-0", "bot-1")
+
+
+def test_squad_coordinator_gives_squads_separate_allies_and_unique_flank_routes():
+    layout = create_default_facility_layout()
+    player_position = (0.0, 0.0, 0.0)
+    coordinator = SquadCoordinator(cover_objects=layout.cover_objects, ally_radius=6.0, max_flankers_per_squad=4)
+    # Two tight squads standing side by side would pick the same flank point.
+    bots = [Bot.create_default(bot_id=f"alpha-{index}", position=(-8.0, 0.0, 0.2 * index)) for index in range(3)]
+    bots += [Bot.create_default(bot_id=f"bravo-{index}", position=(-8.0, 0.0, 0.5 + (0.2 * index))) for index in range(3)]
+    bots.append(Bot.create_default(bot_id="loner", position=(8.0, 0.0, 8.0)))
+    for bot in bots:
+        coordinator.set_squad(bot.bot_id, bot.bot_id.split("-")[0])
+
+    orders = {order.bot_id: order for order in coordinator.assign(bots=bots, player_position=player_position)}
+
+    assert orders["alpha-0"].ally_count == 2
+    assert orders["bravo-2"].squad_id == "bravo"
+    assert orders["loner"].ally_count == 0
+    assert orders["loner"].role == SquadRole.RIFLEMAN
+    points = [order.flank_route[0] for order in orders.values() if order.role == SquadRole.FLANKER]
+    assert len(points) == 2
+    assert _distance_2d(points[0], points[1]) >= coordinator.min_flank_separation
+    assert sum(order.role == SquadRole.SUPPRESSOR for order in orders.values()) == 4
+
+    coordinator.forget("loner")
+    assert coordinator.squad_of("loner") == "default"
+    with pytest.raises(ValueError):
+        SquadCoordinator(cover_objects=layout.cover_objects, flank_radius=0.0)
+
+
+def test_influence_map_tracks_line_of_fire_density_and_decaying_danger():
+    layout = create_default_facility_layout()
+    world = build_collision_world(layout)
+    influence = InfluenceMap(layout=layout, collision_world=world)
+    player_position = (-8.0, 0.0, 3.0)
+    influence.update(dt=0.016, player_position=player_position, bot_positions=[(0.0, 0.0, 0.0)] * 4)
+
+    assert influence.threat_at((-8.0, 0.0, -5.0)) > 0.5
+    assert influence.threat_at((8.0, 0.0, 6.0)) == 0.0
+    assert influence.has_line_of_fire((-8.0, 0.0, -5.0)) is True
+    assert influence.has_line_of_fire((8.0, 0.0, 6.0)) is False
+    assert influence.has_line_of_fire((100.0, 0.0, 100.0)) is False
+    assert influence.density_at((0.0, 0.0, 0.0)) == pytest.approx(1.0)
+    assert 0.0 < influence.density_at((2.0, 0.0, 0.0)) < influence.density_at((0.0, 0.0, 0.0))
+    assert sum(influence.density) == pytest.approx(4.0)
+
+    influence.update(dt=0.016, player_position=(-7.4, 0.0, 3.4), bot_positions=[])
+    assert influence.visibility_bakes == 1
+    assert influence.density_at((0.0, 0.0, 0.0)) == 0.0
+
+    influence.record_death((8.0, 0.0, 6.0))
+    influence.record_shot((8.0, 0.0, -6.0), (8.0, 0.0, -2.5))
+    assert influence.danger_at((8.0, 0.0, 6.0)) == pytest.approx(1.0)
+    assert influence.threat_at((8.0, 0.0, -4.0)) == pytest.approx(1.0)
+    influence.update(dt=influence.half_life_seconds, player_position=player_position, bot_positions=[])
+    assert influence.danger_at((8.0, 0.0, 6.0)) == pytest.approx(0.5)
+    assert influence.threat_at((8.0, 0.0, -4.0)) == pytest.approx(0.5)
+    for _ in range(30):
+        influence.update(dt=influence.half_life_seconds, player_position=player_position, bot_positions=[])
+    assert influence.danger_at((8.0, 0.0, 6.0)) < 1e-6
+
+    influence.record_death((8.7, 0.0, 7.8), amount=5.0)
+    spawns = [(8.7, 0.0, 7.8), (-9.5, 0.0, -3.0), (9.0, 0.0, -7.8)]
+    assert influence.rank_spawn_positions(spawns) == [(9.0, 0.0, -7.8), (-9.5, 0.0, -3.0), (8.7, 0.0, 7.8)]
+    with pytest.raises(ValueError):
+        InfluenceMap(layout=layout, collision_world=world, half_life_seconds=0.0)
+
+
+def test_squad_coordinator_flanks_away_from_exposed_cells():
+    layout = create_default_facility_layout()
+    influence = InfluenceMap(layout=layout)
+    player_position = (0.0, 0.0, 0.0)
+    bot = Bot.create_default(bot_id="flanker", position=(-8.0, 0.0, 0.5))
+    ally = Bot.create_default(bot_id="ally", position=(-9.0, 0.0, 4.0))
+    plain = SquadCoordinator(cover_objects=layout.cover_objects, max_flankers_per_squad=1)
+    preferred = plain.assign(bots=[bot, ally], player_position=player_position)[0].flank_route[0]
+
+    influence.update(dt=0.016, player_position=player_position, bot_positions=[])
+    influence.record_death(preferred, amount=10.0)
+    aware = SquadCoordinator(cover_objects=layout.cover_objects, max_flankers_per_squad=1, influence_map=influence)
+    avoided = aware.assign(bots=[bot, ally], player_position=player_position)[0].flank_route[0]
+    assert avoided != preferred
+    assert influence.exposure_at(avoided) < influence.exposure_at(preferred)
+
+
+def test_hit_probability_matches_sampled_accuracy_cones():
+    rng = Random(4)
+    accuracy = 4.5
+    distance = 8.0
+    target_angle = atan2(0.4, distance)
+    directions = vary_directions_with_accuracy(directions=[(0.0, 0.0, 1.0)] * 20_000, accuracy_degrees=accuracy, rng=rng)
+    sampled = sum(1 for direction in directions if acos(min(1.0, direction[2])) <= target_angle) / len(directions)
+
+    expected = hit_probability(accuracy_degrees=accuracy, distance=distance)
+    assert sampled == pytest.approx(expected, abs=0.02)
+    assert hit_probability(accuracy_degrees=accuracy, distance=20.0) < expected
+    assert hit_probability(accuracy_degrees=0.5, distance=2.0) == 1.0
+    with pytest.raises(ValueError):
+        hit_probability(accuracy_degrees=-1.0, distance=5.0)
+
+
+def test_statistical_combat_fires_far_bots_in_bulk_and_hands_them_back_seamlessly():
+    difficulty = WaveDirector().difficulty_for_wave(4)
+    bots = WaveDirector().spawn_wave(wave_number=4, spawn_positions=[(0.0, 0.0, 10.0)], rng=Random(2))
+    for bot in bots:
+        bot.set_state(BotAIState.ATTACKING)
+    bots[0].set_state(BotAIState.CHASING)
+    fire_system = BotFireSystem(rng_service=RngService(seed=9))
+    combat = StatisticalCombat(fire_system=fire_system, difficulty=difficulty, rng_service=RngService(seed=3))
+    tiers = {bot.bot_id: AILodTier.FAR for bot in bots}
+    tiers[bots[1].bot_id] = AILodTier.NEAR
+    combat.sync_tiers(bots, tiers)
+    assert combat.analytic_count == len(bots) - 1
+    assert len(fire_system) == 1
+
+    player = Player.with_starter_loadout(start_health=10_000, start_money=0)
+    cooldown = bots[2].weapon.cooldown_seconds
+    result = combat.resolve(now=1.0, frame_start=0.0, player_position=(0.0, 0.0, 0.0), player=player)
+    expected_shots = int(1.0 / cooldown) + 1
+    assert [volley.bot_id for volley in result.volleys] == [bot.bot_id for bot in bots[2:]]
+    assert all(volley.shots == expected_shots for volley in result.volleys)
+    assert 0 < result.total_damage == sum(volley.damage for volley in result.volleys)
+    assert player.health == 10_000 - result.applied_damage
+    assert bots[2].weapon.ammo_in_magazine == bots[2].weapon.magazine_size - expected_shots
+    assert combat.last_shots == expected_shots * len(result.volleys)
+
+    replay = StatisticalCombat(fire_system=BotFireSystem(), difficulty=difficulty, rng_service=RngService(seed=3))
+    copies = WaveDirector().spawn_wave(wave_number=4, spawn_positions=[(0.0, 0.0, 10.0)], rng=Random(2))
+    for copy in copies[2:]:
+        copy.set_state(BotAIState.ATTACKING)
+        replay.use_analytic(copy)
+    assert replay.resolve(now=1.0, frame_start=0.0, player_position=(0.0, 0.0, 0.0)).volleys == result.volleys
+
+    # Back in full simulation, the next shot keeps the cooldown the analytic volley left.
+    returning = bots[2]
+    last_fired = returning.weapon.last_fired_at
+    combat.use_full(returning)
+    assert not combat.is_analytic(returning.bot_id)
+    early = fire_system.resolve(now=last_fired + (cooldown * 0.5), target_position=(0.0, 0.0, 0.0))
+    assert returning.bot_id not in {shot.bot_id for shot in early}
+    shots = fire_system.resolve(now=last_fired + cooldown, target_position=(0.0, 0.0, 0.0))
+    assert [shot.fired_at for shot in shots if shot.bot_id == returning.bot_id] == [last_fired + cooldown]
+
+    combat.sync_tiers([returning], {returning.bot_id: AILodTier.FAR})
+    assert combat.is_analytic(returning.bot_id)
+    assert len(fire_system) == 2
+    assert returning.weapon.ammo_in_magazine == returning.weapon.magazine_size - expected_shots - 1
+    with pytest.raises(ValueError):
+        combat.resolve(now=1.0, frame_start=2.0, player_position=(0.0, 0.0, 0.0))
+
+
+def test_statistical_combat_tier_flips_reuse_fire_slots_and_match_full_sim_shot_counts():
+    difficulty = WaveDirector().difficulty_for_wave(2)
+    fire_system = BotFireSystem(rng_service=RngService(seed=1))
+    combat = StatisticalCombat(fire_system=fire_system, difficulty=difficulty, rng_service=RngService(seed=2))
+    bots = [Bot.create_default(bot_id=f"bot-{index}", position=(float(index), 0.0, 20.0)) for index in range(100)]
+    for flip in range(25):
+        tier = AILodTier.FAR if flip % 2 else AILodTier.NEAR
+        combat.sync_tiers(bots, {bot.bot_id: tier for bot in bots})
+    assert len(fire_system) == 100
+    assert len(fire_system.ready_at) == 100
+
+    full_bot = Bot.create_default(bot_id="full", position=(0.0, 0.0, 10.0))
+    analytic_bot = Bot.create_default(bot_id="analytic", position=(0.0, 0.0, 10.0))
+    for bot in (full_bot, analytic_bot):
+        bot.set_state(BotAIState.ATTACKING)
+    combat.use_full(full_bot)
+    combat.use_analytic(analytic_bot)
+
+    def sustained_shots(start: float, seconds: float) -> tuple[int, int]:
+        full_shots = analytic_shots = 0
+        previous = start
+        for frame in range(1, int(seconds * 30) + 1):
+            now = start + (frame / 30.0)
+            shots = fire_system.resolve(now=now, frame_start=previous, target_position=(0.0, 0.0, 0.0))
+            full_shots += sum(1 for shot in shots if shot.bot_id == "full")
+            result = combat.resolve(now=now, frame_start=previous, player_position=(0.0, 0.0, 0.0))
+            analytic_shots += sum(volley.shots for volley in result.volleys)
+            previous = now
+        return full_shots, analytic_shots
+
+    # Neither mode reloads by itself, so both stop at an empty magazine.
+    magazine = full_bot.weapon.magazine_size
+    assert sustained_shots(0.0, 10.0) == (magazine, magazine)
+    assert full_bot.weapon.ammo_in_magazine == analytic_bot.weapon.ammo_in_magazine == 0
+    assert combat.reload("full") == combat.reload("analytic") == magazine
+    full_after_reload, analytic_after_reload = sustained_shots(10.0, 2.0)
+    assert full_after_reload == analytic_after_reload > 0
+
+    # A slot that was queued before going analytic fires one cooldown after the analytic volley.
+    combat.use_analytic(full_bot)
+    combat.resolve(now=12.5, frame_start=12.0, player_position=(0.0, 0.0, 0.0))
+    last_fired = full_bot.weapon.last_fired_at
+    combat.use_full(full_bot)
+    cooldown = full_bot.weapon.cooldown_seconds
+    early = fire_system.resolve(now=last_fired + (cooldown * 0.5), target_position=(0.0, 0.0, 0.0))
+    assert "full" not in {shot.bot_id for shot in early}
+    shots = fire_system.resolve(now=last_fired + cooldown, target_position=(0.0, 0.0, 0.0))
+    assert [shot.fired_at for shot in shots if shot.bot_id == "full"] == [last_fired + cooldown]
+    with pytest.raises(ValueError):
+        combat.reload("missing")
+
+
+def test_wave_difficulty_scales_attack_tokens():
+    director = WaveDirector()
+    assert [director.difficulty_for_wave(wave).attack_tokens for wave in (1, 2, 3, 6, 40)] == [2, 2, 3, 4, 6]
+    assert WaveDirector(base_attack_tokens=1, max_attack_tokens=1).difficulty_for_wave(9).attack_tokens == 1
+    with pytest.raises(ValueError):
+        WaveDirector(base_attack_tokens=3, max_attack_tokens=2)
+
+
+def test_attack_tokens_cap_shooters_and_rotate_fairly_by_distance():
+    bots = [Bot.create_default(bot_id=f"bot-{index}", position=(2.0 * (index + 1), 0.0, 0.0)) for index in range(8)]
+    for bot in bots:
+        bot.set_state(BotAIState.ATTACKING)
+    arbiter = AttackTokenArbiter.for_difficulty(WaveDirector().difficulty_for_wave(3))
+    assert arbiter.token_count == 3
+
+    first = arbiter.update(bots=bots, now=0.0, player_position=(0.0, 0.0, 0.0))
+    assert first.granted == ["bot-0", "bot-1", "bot-2"]
+    assert arbiter.update(bots=bots, now=1.0, player_position=(0.0, 0.0, 0.0)).granted == []
+    rotated = arbiter.update(bots=bots, now=1.5, player_position=(0.0, 0.0, 0.0))
+    assert rotated.revoked == ["bot-0", "bot-1", "bot-2"]
+    assert rotated.granted == ["bot-3", "bot-4", "bot-5"]
+
+    ever_held: set[str] = set()
+    for step in range(16, 200):
+        update = arbiter.update(bots=bots, now=step * 0.1, player_position=(0.0, 0.0, 0.0))
+        assert len(update.holders) == 3
+        ever_held.update(update.holders)
+    assert ever_held == {bot.bot_id for bot in bots}
+
+    holder = next(bot for bot in bots if arbiter.holds(bot.bot_id))
+    holder.apply_damage(500)
+    chaser = next(bot for bot in bots if arbiter.holds(bot.bot_id) and bot is not holder)
+    chaser.set_state(BotAIState.CHASING)
+    update = arbiter.update(bots=bots, now=20.0, player_position=(0.0, 0.0, 0.0))
+    assert set(update.revoked) == {holder.bot_id, chaser.bot_id}
+    assert len(update.granted) == 2 and len(update.holders) == 3
+    assert arbiter.last_candidates == 6
+
+    arbiter.token_count = 1
+    assert len(arbiter.update(bots=bots, now=20.1, player_position=(0.0, 0.0, 0.0)).holders) == 1
+    with pytest.raises(ValueError):
+        AttackTokenArbiter(token_count=0)
+
+
+def test_attack_tokens_only_go_to_bots_with_line_of_fire():
+    layout = create_default_facility_layout()
+    influence = InfluenceMap(layout=layout, collision_world=build_collision_world(layout))
+    player_position = (-8.0, 0.0, 3.0)
+    influence.update(dt=0.016, player_position=player_position, bot_positions=[])
+    hidden = Bot.create_default(bot_id="hidden", position=(8.0, 0.0, 6.0))
+    exposed = Bot.create_default(bot_id="exposed", position=(-8.0, 0.0, -5.0))
+    for bot in (hidden, exposed):
+        bot.set_state(BotAIState.ATTACKING)
+
+    arbiter = AttackTokenArbiter(token_count=2, influence_map=influence)
+    update = arbiter.update(bots=[hidden, exposed], now=0.0, player_position=player_position)
+    assert update.holders == ["exposed"]
+    assert not arbiter.holds("hidden")